@@ -0,0 +1,40 @@
+"""Benchmark the export profiles in defaults.json. A figure with a long random walk is saved with every profile in
+every format and the save time and file size are printed for each.
+
+Usage:
+    python ExportProfileBenchmark.py [num_points] [repeats]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from pyblish import get_defaults, save_figure
+
+
+def benchmark(num_points=300000, repeats=3, formats=('png', 'pdf', 'svg')):
+    fig, ax = plt.subplots(1, 1)
+    ax.plot(np.cumsum(np.random.RandomState(0).randn(num_points)), linewidth=0.5)
+    ax.set_xlabel('step')
+    ax.set_ylabel('position')
+
+    directory = tempfile.mkdtemp()
+    print('{:<10} {:<6} {:>10} {:>12}'.format('profile', 'format', 'seconds', 'bytes'))
+    for profile in sorted(get_defaults()['export_profiles']):
+        for format in formats:
+            file_path = os.path.join(directory, '{}.{}'.format(profile, format))
+            times = []
+            for _ in range(repeats):
+                start = time.time()
+                save_figure(file_path, format, fig=fig, profile=profile)
+                times.append(time.time() - start)
+            print('{:<10} {:<6} {:>10.3f} {:>12d}'.format(profile, format, min(times), os.path.getsize(file_path)))
+    plt.close(fig)
+
+
+if __name__ == '__main__':
+    benchmark(*[int(a) for a in sys.argv[1:3]])
@@ -0,0 +1,151 @@
+#!/usr/bin/python
+"""Batch render figures from a stream of json figure specs (see pyblish.render_figure_spec), one spec per line
+(NDJSON) on stdin. Figures are rendered in parallel by warm worker processes while at most a bounded number of specs
+are held in memory, and one json status line is written to stdout per figure as it finishes.
+
+Usage:
+    python cli.py [--workers N] [--max-pending M] < specs.ndjson > status.ndjson
+
+Each status line has the keys 'line' (input line number), 'id' (the spec's 'id' if given), 'status' ('ok' or
+'error'), 'save_file', 'seconds' (render time in the worker) and 'error'.
+"""
+
+# Import built-ins
+import argparse
+import concurrent.futures
+import concurrent.futures.process
+import json
+import os
+import sys
+import time
+
+# Import externals
+import pyblish
+
+
+def render_line(line_number, line):
+    """Parse and render one NDJSON figure spec line. Errors are returned in the status rather than raised so that one
+    bad spec does not stop the batch.
+    Args:
+        line_number (int): Input line number, starting at 1.
+        line (str): json figure spec.
+    Returns:
+        (dict): Status of the render.
+    """
+    start = time.time()
+    status = {'line': line_number, 'id': None, 'status': 'ok', 'save_file': None, 'seconds': None, 'error': None}
+    try:
+        spec = json.loads(line)
+        status['id'] = spec.get('id')
+        if not(spec.get('save_file')):
+            raise pyblish.InputError("Figure spec has no save_file.")
+        status['save_file'] = pyblish.render_figure_spec(spec)['save_file']
+    except Exception as e:
+        status['status'] = 'error'
+        status['error'] = '{}: {}'.format(type(e).__name__, e)
+    status['seconds'] = time.time() - start
+    return status
+
+
+def render_stream(lines, output, workers=None, max_pending=None):
+    """Render figure specs from an iterable of NDJSON lines and write a status line for each as it finishes. If a
+    worker dies (e.g. it is killed or runs out of memory) the pool is restarted and the specs that were being rendered
+    are rendered again once, as the spec that killed the worker is not known. Specs that are still lost are reported
+    as errors.
+    Args:
+        lines (iterable): NDJSON figure spec lines. Read lazily so the input can be an unbounded stream.
+        output (file-like): Writable text stream for status lines.
+        workers (int): Number of worker processes. Defaults to the number of CPUs.
+        max_pending (int): Maximum number of specs submitted but not yet finished. Defaults to twice the number of
+            workers.
+    Returns:
+        (int): Number of figures that failed to render.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    failed = 0
+    pending = set()
+    pools = [_make_pool(workers)]
+    # Line number, line, pool and whether it is a retry for each pending future
+    records = {}
+
+    def restart_pool(pool):
+        # Only the first future to find a pool broken replaces it
+        if(pool is pools[-1]):
+            pools.append(_make_pool(workers))
+            pool.shutdown(wait=False)
+
+    def submit(line_number, line, retry=False):
+        pool = pools[-1]
+        try:
+            future = pool.submit(render_line, line_number, line)
+        except concurrent.futures.process.BrokenProcessPool:
+            restart_pool(pool)
+            pool = pools[-1]
+            future = pool.submit(render_line, line_number, line)
+        records[future] = (line_number, line, pool, retry)
+        return future
+
+    def write_finished(futures):
+        failures = 0
+        retried = set()
+        for future in futures:
+            line_number, line, pool, retry = records.pop(future)
+            try:
+                status = future.result()
+            except concurrent.futures.process.BrokenProcessPool as e:
+                restart_pool(pool)
+                if not(retry):
+                    retried.add(submit(line_number, line, retry=True))
+                    continue
+                status = {'line': line_number, 'id': _get_spec_id(line), 'status': 'error', 'save_file': None,
+                          'seconds': None, 'error': '{}: {}'.format(type(e).__name__, e)}
+            failures += status['status'] != 'ok'
+            output.write(json.dumps(status) + '\n')
+        output.flush()
+        return failures, retried
+
+    try:
+        for line_number, line in enumerate(lines, 1):
+            if not(line.strip()):
+                continue
+            if(len(pending) >= max_pending):
+                # Block until a worker finishes so that input is not read faster than it is rendered
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                failures, retried = write_finished(done)
+                failed += failures
+                pending |= retried
+            pending.add(submit(line_number, line))
+        while(pending):
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            failures, retried = write_finished(done)
+            failed += failures
+            pending |= retried
+    finally:
+        pools[-1].shutdown()
+    return failed
+
+
+def _make_pool(workers):
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=pyblish.warm_caches)
+
+
+def _get_spec_id(line):
+    try:
+        return json.loads(line).get('id')
+    except (ValueError, AttributeError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render NDJSON pyblish figure specs from stdin.")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes")
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help="maximum number of specs in flight (default: 2 x workers)")
+    args = parser.parse_args(argv)
+    failed = render_stream(sys.stdin, sys.stdout, args.workers, args.max_pending)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,8 +8,21 @@ from matplotlib.ticker import FuncFormatter
 import sys
 import warnings
 import functools
+import copy
+import hashlib
+import os
+import io
+import gzip
+import concurrent.futures
+import importlib
+import collections
+import contextlib
+import threading
+import weakref
 import json
 import math
+import re
+import numpy as np
 
 # Import externals
 from fuzzywuzzy import process
@@ -18,6 +31,18 @@ from utils.parser import *
 from utils.decorator import *
 from utils.availables import *
 from utils.colormap import *
+from utils.decimation import *
+from utils.density import *
+from utils.cache import *
+from utils.clip import *
+from utils.optimize import *
+from utils.patch import *
+from utils.rwlock import *
+from utils.lrucache import *
+from utils.schema import *
+from utils.ticker import *
+from utils.tiled import *
+from utils.stylesheet import *
 
 #ToDo: Bug-checking. Make sure pyblishify works for a range of figures!
 
@@ -26,93 +51,307 @@ class InputError(Exception):
     pass
 
 
+# Counts of property assignments applied and skipped because the object already had the value
+_style_stats = {'applied': 0, 'skipped': 0}
+# Properties read with a getter of another name when checking if an object already has a value (see _has_prop_value),
+# tick parameters stored under another name by matplotlib, properties compared as colors, and the value of properties
+# that have not been set
+_GETTER_PROPS = {'fontname': 'fontfamily'}
+_TICK_GETTER_PROPS = {'direction': 'tickdir', 'length': 'size', 'rotation': 'labelrotation'}
+_COLOR_PROPS = frozenset(['color', 'facecolor', 'edgecolor', 'labelcolor', 'markerfacecolor', 'markeredgecolor'])
+_MISSING = object()
+# Counts of figure draws and of redraw requests suppressed while drawing was deferred (see deferred_draw)
+_draw_stats = {'draws': 0, 'suppressed': 0}
+# Thread pool for export post-processing (created on first use) and its pending futures keyed by the absolute path of
+# the file exported. Futures are discarded once they finish
+_export_pool = None
+_export_futures = {}
+_export_lock = threading.Lock()
+# Matches text containing mathtext ($...$)
+_MATHTEXT_RE = re.compile(r'(.+)?(\$.+\$)(.+)?')
+# Matches the log prefix added to axis labels by set_log_scale (see _add_label_log)
+_LOG_LABEL_RE = re.compile(r'^\$\\mathrm\{log_\{[^$]*\}\}\$ ')
+# Process-wide cache of text extents shared by every figure rendered, keyed by string, font, dpi and renderer
+_text_metrics_cache = register_cache('text_metrics', maxsize=65536)
+# Process-wide cache of parsed mathtext shared by every figure, keyed by expression, font, dpi and mathtext fonts
+_mathtext_cache = register_cache('mathtext', maxsize=4096)
+# Process-wide cache of solved subplot parameters keyed by grid geometry, figure size and text that sets the layout
+_layout_cache = register_cache('layout', maxsize=1024)
+# Lock held exclusively while global rcParams are changed, and shared while figures are styled or rendered with them
+# (see styling_scope)
+_rc_lock = SharedLock()
+# Mathtext fontsets that can be set on each text. Other mathtext fonts are set through the 'custom' fontset, which
+# reads the mathtext rcParams when text is drawn
+_MATH_FONTSETS = ['cm', 'stix', 'stixsans', 'dejavusans', 'dejavuserif']
+_MATH_FONT_RC_KEYS = ['mathtext.rm', 'mathtext.it', 'mathtext.bf', 'mathtext.sf', 'mathtext.tt', 'mathtext.cal']
+# Process-wide cache of the widest legend entry text, keyed by the entry texts, font and dpi
+_legend_layout_cache = register_cache('legend_layout', maxsize=1024)
+# Process-wide cache of style sheets compiled from defaults files, keyed by file path and modification time
+_style_sheet_cache = register_cache('style_sheet', maxsize=16)
+# Metadata saved for each format by deterministic exports - None removes entries matplotlib adds by default
+_DETERMINISTIC_METADATA = {'png': {'Software': None}, 'pdf': {'Creator': None, 'Producer': None, 'CreationDate': None},
+                           'svg': {'Creator': None, 'Date': None}, 'svgz': {'Creator': None, 'Date': None},
+                           'ps': {'Creator': 'pyblish'}, 'eps': {'Creator': 'pyblish'}}
+# Axes methods figure specs may call (see render_figure_spec)
+_SPEC_CALLS = frozenset(['plot', 'scatter', 'errorbar', 'step', 'stairs', 'stem', 'fill_between', 'fill_betweenx',
+                         'bar', 'barh', 'hist', 'hist2d', 'hexbin', 'boxplot', 'violinplot', 'pie', 'imshow',
+                         'pcolormesh', 'contour', 'contourf', 'semilogx', 'semilogy', 'loglog', 'axhline', 'axvline',
+                         'axline', 'axhspan', 'axvspan', 'hlines', 'vlines', 'text', 'annotate', 'legend', 'grid',
+                         'set_title', 'set_xlabel', 'set_ylabel', 'set_xlim', 'set_ylim', 'set_xscale', 'set_yscale',
+                         'set_xticks', 'set_yticks', 'set_xticklabels', 'set_yticklabels', 'set_aspect',
+                         'tick_params', 'invert_xaxis', 'invert_yaxis', 'margins'])
+# Renderer class used for each output format, whose text measurement is cached while pyblish renders. Text in other
+# formats (e.g. pgf) is measured by their own renderers without the cache
+_TEXT_RENDERERS = {'png': ('backend_agg', 'RendererAgg'), 'jpg': ('backend_agg', 'RendererAgg'),
+                   'jpeg': ('backend_agg', 'RendererAgg'), 'tif': ('backend_agg', 'RendererAgg'),
+                   'tiff': ('backend_agg', 'RendererAgg'), 'webp': ('backend_agg', 'RendererAgg'),
+                   'raw': ('backend_agg', 'RendererAgg'), 'rgba': ('backend_agg', 'RendererAgg'),
+                   'pdf': ('backend_pdf', 'RendererPdf'), 'svg': ('backend_svg', 'RendererSVG'),
+                   'svgz': ('backend_svg', 'RendererSVG'), 'ps': ('backend_ps', 'RendererPS'),
+                   'eps': ('backend_ps', 'RendererPS')}
+# Patches routing text measurement and mathtext parsing through the process-wide caches while pyblish renders (see
+# _render_scope), keyed by the class patched, and figures whose draws are counted (see get_draw_stats)
+_render_patches = {}
+_render_patches_lock = threading.Lock()
+_counted_figures = weakref.WeakSet()
+
+
 def pyblishify(fig, num_cols, aspect='square', which_labels='all', which_ticks='all',
                which_spines=('left', 'bottom'),
                which_lines='all', which_markers='all', which_texts='all',
                which_legends='all',
                which_log_scales='all',
+               which_decimations=None,
+               which_densities=None,
                save_file=None,
                **kwargs):
 
-    # Get default parameters from 'defaults.json'
-    defaults_dict = get_defaults('defaults.json')
-    # Set default parameters that = 'master' to appropriate value from master_defaults dict
-    _set_master_defaults(defaults_dict)
-    # Fix default parameters and names to be consistent with matplotlib conventions
-    _fix_defaults(defaults_dict)
-    # Set defaults that are dependent on number of columns requested
-    # defaults_dict = _set_params_defaults(defaults_dict, num_cols)
-    # Override a selection of default rcParams
-    _set_rcparams_defaults(defaults_dict)
-    # Set font
-    set_font(defaults_dict['fontname'])
-    # Set mathtext font
-    set_font(defaults_dict['fontname_mathtext'], mathtext=True)
-
-    # Allow user to pass in any dictionary of properties as kwargs and take passed in values
-    # or default if no value passed
-    parameters_dict = _get_plot_properties(['spine_props', 'label_props', 'major_tick_props', 'minor_tick_props',
-                                            'line_props', 'marker_props', 'text_props',
-                                            'legend_line_props', 'legend_marker_props', 'legend_text_props',
-                                            'legend_props', 'log_scale_props'],
-                                           kwargs, defaults_dict)
-
-    # Convert aspect variable to number
-    aspect = _get_aspect(aspect)
-    # Set figure size
-    fig_width, fig_height = _get_figure_size(num_cols, aspect)
-    set_figure_size(fig, fig_width, fig_height, 2.0)
-
-    # Apply changes to all axis objects in figure
-    for ax in fig.axes:
-        # Set axes spine properties using default spine properties
-        if(which_spines):
-            set_spine_props(ax, which_spines, spine_props=parameters_dict['spine_props'],
-                            hide_other_spines=True, duplicate_ticks=True)
-        # Set axes ticks and ticklabel properties using default tick and ticklabel properties
-        if(which_ticks):
-            set_tick_props(ax, which_ticks, tick_props=parameters_dict['major_tick_props'], tick_type='major')
-            set_tick_props(ax, which_ticks, tick_props=parameters_dict['minor_tick_props'], tick_type='minor')
-        # Set axes label properties using default label properties
-        if(which_labels):
-            set_label_props(ax, which_labels, label_props=parameters_dict['label_props'])
-        # Set line and legend line properties using default line properties
-        if(which_lines):
-            set_line_props(ax, which_lines, line_props=parameters_dict['line_props'])
-            if(ax.legend_):
-                set_line_props(ax, 'all', line_props=parameters_dict['legend_line_props'], legend_lines=True)
-        # Set marker and legend marker properties using default marker properties
-        if(which_markers):
-            set_marker_props(ax, which_markers, marker_props=parameters_dict['marker_props'])
-            if(ax.legend_):
-                set_marker_props(ax, 'all', marker_props=parameters_dict['legend_marker_props'], legend_markers=True)
-        # Set text properties using default text properties
-        if(which_texts):
-            set_text_props(ax, which_texts, text_props=parameters_dict['text_props'])
-        # Set legend text properties using default legend text properties
-        # (Legend text is not related to plot text as with lines and markers)
-        if(ax.legend_):
-            set_text_props(ax, 'all', text_props=parameters_dict['legend_text_props'], legend_texts=True)
-
-        # Set legend properties using default legend properties
-        if(which_legends):
+    # Resolve selectors and validate the style without styling or drawing anything
+    if(kwargs.pop('dry_run', False)):
+        return validate_figure(fig, which_labels, which_ticks, which_spines, which_lines, which_markers, which_texts,
+                               which_legends, which_log_scales, which_decimations, which_densities, **kwargs)
+    # Style for a quick low resolution preview rather than the final render (see save_figure)
+    preview = kwargs.pop('preview', False)
+    # Redraw once after styling rather than after every change, or not at all if the figure is saved here or by the
+    # caller straight after (redraw=False) (see deferred_draw)
+    redraw = kwargs.pop('redraw', not save_file)
+    defer_draw = deferred_draw(fig, draw=redraw) if kwargs.pop('defer_draw', True) else contextlib.nullcontext()
+    # Fonts and dpi are set on the figure rather than in the global rcParams, so figures can be styled concurrently
+    # while no thread changes rcParams (see styling_scope)
+    with _rc_lock.shared(), defer_draw:
+        # Load defaults and override them with any properties passed in as kwargs
+        parameters_dict = _load_style(['spine_props', 'label_props', 'major_tick_props', 'minor_tick_props',
+                                       'line_props', 'marker_props', 'text_props',
+                                       'legend_line_props', 'legend_marker_props', 'legend_text_props',
+                                       'legend_props', 'log_scale_props', 'decimate_props', 'density_props',
+                                       'large_legend_props', 'preview_props'], kwargs)
+        preview_props = parameters_dict['preview_props'] if preview else False
+
+        # Convert aspect variable to number
+        aspect = _get_aspect(aspect)
+        # Set figure size
+        fig_width, fig_height = _get_figure_size(num_cols, aspect)
+        set_figure_size(fig, fig_width, fig_height, 2.0)
+        # Set fonts, mathtext font and output dpi of the figure before any text is styled
+        figure_style = parameters_dict['figure_style']
+        # The mathtext font is set once styling has requested any mathtext fonts (see _change_mathtext)
+        _set_figure_style(fig, figure_style, math_font=False)
+
+        # Mathtext font changes requested by label and text styling - the mathtext font is global so it is decided once
+        # after all axes are styled
+        mathtext_requests = []
+        # Apply changes to all axis objects in figure
+        for ax in fig.axes:
+            # Merge identical entries of large legends selected for styling before legend entries are styled
+            large_legend = bool(which_legends) and _is_large_legend(ax, parameters_dict['large_legend_props']) and \
+                ax.legend_ in _get_plot_objects(which_legends, False, _get_legends(ax), 'legend')
+            if(large_legend):
+                deduplicate_legend(ax)
+            # Set axes spine properties using default spine properties
+            if(which_spines):
+                set_spine_props(ax, which_spines, spine_props=parameters_dict['spine_props'],
+                                hide_other_spines=True, duplicate_ticks=True)
+            # Set axes ticks and ticklabel properties using default tick and ticklabel properties
+            if(which_ticks):
+                set_tick_props(ax, which_ticks, tick_props=parameters_dict['major_tick_props'], tick_type='major')
+                set_tick_props(ax, which_ticks, tick_props=parameters_dict['minor_tick_props'], tick_type='minor')
+            # Set axes label properties using default label properties
+            if(which_labels):
+                set_label_props(ax, which_labels, label_props=parameters_dict['label_props'],
+                                mathtext_requests=mathtext_requests)
+            # Set line and legend line properties using default line properties
+            if(which_lines):
+                set_line_props(ax, which_lines, line_props=parameters_dict['line_props'])
+                if(ax.legend_):
+                    set_line_props(ax, 'all', line_props=parameters_dict['legend_line_props'], legend_lines=True)
+            # Set marker and legend marker properties using default marker properties
+            if(which_markers):
+                set_marker_props(ax, which_markers, marker_props=parameters_dict['marker_props'])
+                if(ax.legend_):
+                    set_marker_props(ax, 'all', marker_props=parameters_dict['legend_marker_props'],
+                                     legend_markers=True)
+            # Set text properties using default text properties
+            if(which_texts):
+                set_text_props(ax, which_texts, text_props=parameters_dict['text_props'],
+                               mathtext_requests=mathtext_requests)
+            # Set legend text properties using default legend text properties
+            # (Legend text is not related to plot text as with lines and markers)
             if(ax.legend_):
-                set_legend_props(ax, which_legends, legend_props=parameters_dict['legend_props'])
-        # Set axes log scale properties
-        if(which_log_scales):
-            set_log_scale(ax, which_log_scales, log_scale_props=parameters_dict['log_scale_props'])
-
-    # Get list of legends to send to savefig as bbox_extra_artists to ensure saved figure has enough space around plot
-    # for legends
-    legends = get_iterable(ax.legend_) + [l for l in ax.artists if isinstance(l, matplotlib.legend.Legend)]
-    if(all([l is None for l in legends])):
-        legends = None
+                set_text_props(ax, 'all', text_props=parameters_dict['legend_text_props'], legend_texts=True)
+
+            # Set legend properties using default legend properties
+            if(which_legends):
+                if(ax.legend_):
+                    legend_props = parameters_dict['legend_props']
+                    if(large_legend):
+                        # Fit as many columns of entries as the axes width allows
+                        legend_props = dict(legend_props, _ncol=get_legend_ncol(
+                            ax, parameters_dict['large_legend_props'], legend_props))
+                    set_legend_props(ax, which_legends, legend_props=legend_props)
+            # Set axes log scale properties
+            if(which_log_scales):
+                set_log_scale(ax, which_log_scales, log_scale_props=parameters_dict['log_scale_props'])
+            # Set how tick labels are formatted once the axis scales (and so the formatters) are set
+            _set_formatter_props(ax, figure_style)
+            # Replace oversized scatter collections with density images once markers are styled, so that the image
+            # takes the styled marker color, and the axis scales are set, as points are binned in scaled coordinates
+            if(which_densities):
+                set_marker_density(ax, which_densities, density_props=parameters_dict['density_props'])
+            # Decimate lines to the output pixel budget once the axis scales are set, as lines are bucketed in scaled
+            # coordinates
+            if(preview_props):
+                _set_preview_decimation(ax, which_decimations, parameters_dict['decimate_props'], preview_props)
+            else:
+                if(getattr(fig, '_pyblish_preview', False)):
+                    # Lines decimated for a preview are restored for the final render
+                    restore_line_data(ax)
+                if(which_decimations):
+                    set_line_decimation(ax, which_decimations, decimate_props=parameters_dict['decimate_props'])
+        _change_mathtext(fig, mathtext_requests, figure_style['fontname_mathtext'])
+        fig._pyblish_preview = bool(preview_props)
+
+        # Solve (or reuse a cached solution of) the subplot layout once all text that affects it is styled
+        tight_layout = kwargs.pop('tight_layout', None)
+        if(tight_layout):
+            set_layout(fig, **(tight_layout if isinstance(tight_layout, dict) else {}))
+
+        # Get list of legends to send to savefig as bbox_extra_artists to ensure saved figure has enough space around
+        # plot for legends
+        legends = get_iterable(ax.legend_) + [l for l in ax.artists if isinstance(l, matplotlib.legend.Legend)]
+        if(all([l is None for l in legends])):
+            legends = None
+    # Saved once the lock is released, as rendering with a mathtext font set through rcParams takes it exclusively
     if(save_file):
-        save_figure(save_file, kwargs.pop('format', 'png'), kwargs.pop('bbox_inches', 'tight'), legends)
+        return save_figure(save_file, kwargs.pop('format', 'png'), kwargs.pop('bbox_inches', 'tight'), legends,
+                           fig=fig, cache=kwargs.pop('render_cache', None), optimize=kwargs.pop('optimize', None),
+                           profile=kwargs.pop('export_profile', None), deterministic=kwargs.pop('deterministic', False),
+                           tile_height=kwargs.pop('tile_height', None), preview=preview_props)
+
+
+@contextlib.contextmanager
+def deferred_draw(fig, draw=True):
+    """Context manager suspending redraws of a figure while it is styled. Stale artists do not request redraws and
+    calls to draw_idle() and resizes of the figure window are held back until the scope exits, when the window is
+    resized (if needed) and the figure is redrawn once. In interactive backends and notebooks this replaces a redraw
+    for every property change with a single draw. Nested scopes for the same figure only redraw when the outermost
+    exits.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object.
+        draw (bool): Request one redraw on exit if a redraw was held back and the figure is shown on an interactive
+            canvas (see _is_interactive_canvas). Non-interactive canvases (e.g. Agg) render the whole figure on a
+            redraw request, so they are never redrawn on exit. Pass False if the figure is saved next, as saving draws
+            the figure anyway.
+    Returns:
+        None
+    """
+    if(getattr(fig, '_pyblish_deferred', False)):
+        yield
+        return
+    _count_draws(fig)
+    canvas = fig.canvas
+    stale_callback = fig.stale_callback
+    pending = {'draw': False}
+
+    def draw_idle(*args, **kwargs):
+        pending['draw'] = True
+        _draw_stats['suppressed'] += 1
+
+    # draw_idle may already be overridden on the canvas instance, in which case that is restored on exit
+    instance_draw_idle = canvas.__dict__.get('draw_idle')
+    fig._pyblish_deferred = True
+    fig._pyblish_resize_pending = False
+    def stale(artist, value):
+        # Stale figures call stale_callback, which pyplot only redraws with in interactive mode
+        if(value and matplotlib.is_interactive()):
+            draw_idle()
+
+    fig.stale_callback = stale if stale_callback else None
+    canvas.draw_idle = draw_idle
+    try:
+        yield
+    finally:
+        fig._pyblish_deferred = False
+        # Forward the resize while redraw requests are still held back
+        if(fig._pyblish_resize_pending):
+            fig.set_size_inches(fig.get_size_inches(), forward=True)
+        fig.stale_callback = stale_callback
+        if(instance_draw_idle is None):
+            del canvas.draw_idle
+        else:
+            canvas.draw_idle = instance_draw_idle
+        if(draw and pending['draw'] and _is_interactive_canvas(canvas)):
+            canvas.draw_idle()
+
+
+@contextlib.contextmanager
+def styling_scope(fig=None, rc=None):
+    """Context manager isolating changes to global matplotlib.rcParams. rcParams are process-wide, so the scope holds
+    the rcParams lock exclusively for its duration and restores every rcParam on exit. pyblish sets fonts, mathtext
+    fonts and dpi on each figure rather than in rcParams, and only renders a figure in a scope when its mathtext font
+    is not one of the fontsets text can be given individually (see _rc_scope), so threads can style and render
+    independent figures concurrently. Use a scope when code changes rcParams itself, e.g. to make and plot figures with
+    a style, as figures read rcParams when they are created:
+
+        with styling_scope(rc={'lines.linewidth': 2}):
+            fig, ax = make_figure(1, 1)
+            ax.plot(x, y)
+        pyblishify(fig, 1, save_file='figure.png')
+
+    Args:
+        fig (matplotlib.figure.Figure): Figure whose rcParams recorded by pyblishify() are applied on entry, if any.
+        rc (dict): Any other rcParams to apply on entry.
+    Returns:
+        None
+    """
+    with _rc_lock.exclusive():
+        with matplotlib.rc_context():
+            matplotlib.rcParams.update(getattr(fig, '_pyblish_rc', None) or {})
+            matplotlib.rcParams.update(rc or {})
+            yield
+
+
+@contextlib.contextmanager
+def _rc_scope(fig=None, rc=None):
+    """Context manager rendering a figure with the rcParams recorded for it by pyblishify() and any others given.
+    rcParams are only changed (in a styling_scope) if they differ, otherwise the rcParams lock is shared so that
+    figures are rendered concurrently.
+    Args:
+        fig (matplotlib.figure.Figure): Figure whose recorded rcParams are applied, if any.
+        rc (dict): Any other rcParams to apply.
+    Returns:
+        None
+    """
+    rc = dict(getattr(fig, '_pyblish_rc', None) or {}, **(rc or {}))
+    with _rc_lock.shared():
+        if(all(values_equal(matplotlib.rcParams[k], v) for k, v in rc.items())):
+            yield
+            return
+    with styling_scope(rc=rc):
+        yield
 
 
 def make_figure(rows, cols, sharex=False, sharey=False, subplot_keywords=None, gridspec_keywords=None,
-                **figure_keywords):
+                pool=None, style=None, style_sheet=False, **figure_keywords):
     """Make figure and axes objects used for plotting.
     Args:
         rows (int): Number of canvases vertically.
@@ -121,28 +360,303 @@ def make_figure(rows, cols, sharex=False, sharey=False, subplot_keywords=None, g
         sharey (bool): Whether to share y axis between multiple canvases.
         subplot_keywords (dict): Keywords used for add_subplot().
         gridspec_keywords (dict): Keywords used for gridspec.GridSpec()
+        pool (FigurePool): Reuse an idle figure from the pool if given (see FigurePool).
+        style (str): Name of the style the figure will be styled with. Only used with a pool.
+        style_sheet (bool|str): Make the figure with the style of the defaults file (True for 'defaults.json', or the
+            path of a defaults file) compiled into rcParams (see get_style_rc), so that it has the style before
+            anything is plotted. Fonts, mathtext font, tick label formatting and dpi are set on the figure as
+            pyblishify() sets them rather than read from rcParams when it is saved, and tick and label properties are
+            applied to the axes. Lines take the line properties in the order they are plotted with the axes property
+            cycle. pyblishify() still enforces the whole style, but skips every property an artist already has, so
+            only artists that differ from the style (e.g. lines plotted with their own color, or lines not drawn from
+            the cycle such as axhline) are changed.
     Returns:
         fig (matplotlib.figure.Figure): Figure object.
         axes (matplotlib.axes._subplots.AxesSubplot): Axes object(s).
     """
-    fig, axes = plt.subplots(rows, cols, sharex, sharey, subplot_keywords, gridspec_keywords, **figure_keywords)
+    if(pool is not None):
+        return pool.acquire(rows, cols, sharex, sharey, subplot_keywords, gridspec_keywords, style,
+                            style_sheet=style_sheet, **figure_keywords)
+    if(style_sheet):
+        rc, style_props = _get_style_sheet('defaults.json' if style_sheet is True else style_sheet)
+        # The figure keeps the screen dpi, as the style dpi is only used for saving
+        with styling_scope(rc={k: v for k, v in rc.items() if k != 'figure.dpi'}):
+            fig, axes = plt.subplots(rows, cols, sharex=sharex, sharey=sharey, squeeze=False,
+                                     subplot_kw=subplot_keywords, gridspec_kw=gridspec_keywords, **figure_keywords)
+            _apply_style_sheet(fig, rc, style_props)
+    else:
+        fig, axes = plt.subplots(rows, cols, sharex=sharex, sharey=sharey, squeeze=False,
+                                 subplot_kw=subplot_keywords, gridspec_kw=gridspec_keywords, **figure_keywords)
     if(len(axes.ravel()) == 1):
         return fig, axes[0][0]
     else:
         return fig, axes
 
 
-def save_figure(file_path, format='png', bbox='tight', extra_artists=None, **kwargs):
+def get_style_rc(file='defaults.json'):
+    """Get the style of a defaults file compiled into rcParams, after 'master' values are resolved. Only properties
+    that rcParams express exactly are included (see utils.stylesheet.compile_style_rc), along with the fonts,
+    mathtext fonts and dpi pyblishify() sets.
+    Args:
+        file (str): Defaults file.
+    Returns:
+        (dict): rcParams.
+    """
+    return dict(_get_style_sheet(file)[0])
+
+
+def save_style_sheet(file_path, file='defaults.json'):
+    """Save the style of a defaults file as a matplotlib style sheet, e.g. to use it with matplotlib.style.use() in code
+    that does not use pyblish (see get_style_rc).
+    Args:
+        file_path (str): Path to save style sheet to (.mplstyle).
+        file (str): Defaults file.
+    Returns:
+        None
+    """
+    write_style_sheet(_get_style_sheet(file)[0], file_path)
+
+
+def plot_line_source(ax, y, x=None, points_per_pixel=2.0, chunk_size=10000000, num_cols=None,
+                     **collection_keywords):
+    """Plot series stored in (memory-mapped) arrays or .npy files as a line collection decimated to the output pixel
+    budget. The data is read in chunks and only the min/max envelope of each pixel bucket is kept, so peak memory is
+    bounded by the chunk size no matter how large the source is. Decimation cannot be undone, so the budget is taken
+    from the width of the figure once pyblishify() has resized it rather than from its current size, and buckets
+    have equal width in x as displayed by the current x scale (set a log scale before plotting).
+    Args:
+        ax (matplotlib.axes): Axis object.
+        y (str|numpy.ndarray|numpy.memmap): y values with shape (n,) or (n, n_series), or path of .npy file.
+        x (str|numpy.ndarray|numpy.memmap): Increasing x values with shape (n,), or path of .npy file. Sample indexes
+            are used if None.
+        points_per_pixel (float): Number of points retained for each horizontal pixel of the figure.
+        chunk_size (int): Number of samples read at a time.
+        num_cols (int): Number of columns the figure will be styled to span with pyblishify(). The widest figure
+            pyblishify() makes is assumed if None.
+        **collection_keywords: Keywords used for matplotlib.collections.LineCollection (e.g. colors, linewidths).
+            Colors default to the axes color cycle.
+    Returns:
+        (matplotlib.collections.LineCollection): Line collection with one line per series.
+    """
+    y = np.load(y, mmap_mode='r') if isinstance(y, str) else y
+    x = np.load(x, mmap_mode='r') if isinstance(x, str) else x
+    if(x is not None and len(x) != len(y)):
+        raise InputError("x and y sources must have the same length: {} != {}.".format(len(x), len(y)))
+    if(x is not None and len(x) > 1 and x[0] > x[-1]):
+        raise InputError("x source must be increasing.")
+    n_buckets = get_decimation_budget(_get_output_pixel_width(ax.get_figure(), num_cols), points_per_pixel) // 2
+    first, last = _get_scale_domain_indexes(ax.xaxis, x, len(y))
+    if(first <= last):
+        x_range = (first, last) if x is None else (x[first], x[last])
+        edges = get_sorted_bucket_edges(x, len(y), n_buckets, ax.xaxis.get_transform(), x_range)
+    else:
+        edges = get_sorted_bucket_edges(x, len(y), n_buckets)  # No sample can be shown with this scale
+    segments = []
+    for idx in minmax_envelope_chunked(y, n_buckets, chunk_size, edges):
+        # Fancy indexing a memory-map only reads the samples kept
+        xs = idx.astype(float) if x is None else np.asarray(x[idx], dtype=float)
+        ys = np.asarray(y[idx] if y.ndim == 1 else y[idx, len(segments)], dtype=float)
+        segments.append(np.column_stack([xs, ys]))
+    if('colors' not in collection_keywords and 'color' not in collection_keywords):
+        cycle_colors = matplotlib.rcParams['axes.prop_cycle'].by_key().get('color', ['k'])
+        collection_keywords['colors'] = map_list(cycle_colors, len(segments))
+    collection = matplotlib.collections.LineCollection(segments, **collection_keywords)
+    ax.add_collection(collection)
+    ax.autoscale_view()
+    return collection
+
+
+def save_figure(file_path, format='png', bbox='tight', extra_artists=None, fig=None, cache=None, optimize=None,
+                profile=None, deterministic=False, tile_height=None, preview=False, **kwargs):
     """Save figure to file.
     Args:
-        file_path (str): Path to save figure to.
+        file_path (str|file-like): Path or writable binary file object (e.g. io.BytesIO) to save figure to.
         format (str): Format to save figure in.
         bbox (str):  Only the bbox specified is saved. 'tight' forces matplotlib to figure out bbox automatically.
         extra_artists (list): A list of extra artists that are considered when calculating the bbox.
+        fig (matplotlib.figure.Figure): Figure to save. The current figure is saved if None.
+        cache (utils.cache.RenderCache): Render cache. If a file with the same render fingerprint is cached it is
+            copied to file_path instead of rendering the figure, otherwise the rendered file is cached.
+        optimize (bool|dict): Re-encode PNG output to reduce its size using 'png_props' from the defaults file if True
+            or the properties given if a dict (see utils.optimize.optimize_png). Optimization runs in the export thread
+            pool so that it does not block styling of the next figure. Only applies to png files saved to a path.
+        profile (str|dict): Name of an export profile in 'export_profiles' of the defaults file, or a profile dict,
+            setting path simplification, Agg path chunking, vector font embedding and dpi for this save only (see
+            get_export_profile_rc). The dpi of the profile is used unless dpi is passed explicitly.
+        deterministic (bool): Make the output bytes depend only on the figure, so identical figures give identical
+            files that can be deduplicated. Timestamps and software versions are removed from the metadata (unless
+            given in a metadata keyword), svg ids are generated from a fixed salt, dates written by the ps backend
+            are fixed to the epoch and svgz files have no time or file name in their gzip header.
+        tile_height (int): Render png or tiff output in bands of this many pixel rows, streaming each band into the
+            file, so that poster-size figures at high dpi do not need an RGBA buffer of the whole image. Pixels match
+            a single-pass render, but the figure is drawn once per band. tiff files are uncompressed, as matplotlib
+            saves them. Optimization (see optimize) reads the whole image. Figures are rendered in a single pass,
+            with a warning, if the installed matplotlib does not support tiled rendering (see
+            utils.tiled.TILED_RENDERING_AVAILABLE).
+        preview (bool|dict): Save a quick preview using 'preview_props' from the defaults file if True or the
+            properties given if a dict. The whole figure is rendered at the preview dpi with the preview export
+            profile, skipping the tight bbox, the render cache, optimization, deterministic metadata and tiling, so
+            the styling and layout are those of the final render. Lines decimated for a preview by pyblishify() are
+            restored when the figure is saved without preview. Properties are:
+                dpi (float): Preview dpi.
+                points_per_pixel (float): Points retained for each horizontal pixel of the preview when lines are
+                    decimated by pyblishify.
+                min_points (int): Lines with fewer points than this are not decimated by pyblishify.
+                export_profile (str|dict): Export profile (see profile).
     Returns:
-        None
+        (concurrent.futures.Future|None): Future resolving to the optimization statistics if the output is being
+            optimized, otherwise None. Saving to the same path again cancels the optimization if it has not started,
+            or waits for it to finish, so that it can not overwrite the newer file.
+    """
+    fig = fig or plt.gcf()
+    if(preview is True):
+        preview = get_defaults()['preview_props']
+    if(getattr(fig, '_pyblish_preview', False) and not(preview)):
+        # Lines decimated for a preview by pyblishify are restored for the final render
+        for ax in fig.axes:
+            if(ax.lines):
+                restore_line_data(ax)
+        fig._pyblish_preview = False
+    if(preview):
+        bbox, cache, optimize, deterministic, tile_height = None, None, None, False, None
+        profile = preview.get('export_profile', profile)
+        kwargs['dpi'] = preview.get('dpi', 72)
+    profile_rc = None
+    if(profile is not None):
+        profile_rc = get_export_profile_rc(profile, format)
+        if('savefig.dpi' in profile_rc):
+            kwargs.setdefault('dpi', profile_rc.pop('savefig.dpi'))
+    # The dpi pyblishify() styled the figure for, unless another dpi is given
+    if(getattr(fig, '_pyblish_dpi', None) is not None):
+        kwargs.setdefault('dpi', fig._pyblish_dpi)
+    if(deterministic):
+        kwargs['metadata'] = dict(_DETERMINISTIC_METADATA.get(format, {}), **(kwargs.get('metadata') or {}))
+        profile_rc = dict(profile_rc or {}, **{'svg.hashsalt': 'pyblish'})
+    if(tile_height is not None):
+        if(format not in ['png', 'tif', 'tiff']):
+            raise InputError("Tiled rendering is only available for png and tiff output, not '{}'.".format(format))
+        if(TILED_RENDERING_AVAILABLE):
+            kwargs.update(backend=TILED_BACKEND, tile_height=tile_height)
+        else:
+            warnings.warn("Tiled rendering is not available with matplotlib {}, so the figure is rendered in a single "
+                          "pass.".format(matplotlib.__version__))
+    if(optimize is True):
+        optimize = get_defaults()['png_props']
+    if not(format == 'png' and isinstance(file_path, str)):
+        optimize = None
+    if(isinstance(file_path, str)):
+        _cancel_export(file_path)
+    fingerprint = None
+    if(cache is not None and isinstance(file_path, str)):
+        with _rc_scope(fig, profile_rc):
+            fingerprint = get_render_fingerprint(fig, format, bbox, optimize=optimize, deterministic=deterministic,
+                                                 **kwargs)
+        if(cache.get(fingerprint, file_path)):
+            return None
+    with _rc_scope(fig, profile_rc), _source_date_epoch(0 if deterministic else None), _render_scope(format, fig):
+        if(deterministic and format == 'svgz'):
+            _save_svgz(fig, file_path, bbox_inches=bbox, bbox_extra_artists=extra_artists, **kwargs)
+        else:
+            fig.savefig(file_path, format=format, bbox_inches=bbox, bbox_extra_artists=extra_artists, **kwargs)
+    if(optimize):
+        return _submit_export(_finish_export, file_path, fingerprint, cache, optimize)
+    _finish_export(file_path, fingerprint, cache, optimize)
+    return None
+
+
+def get_export_profile_rc(profile, format='png', file='defaults.json'):
+    """Get the rcParams an export profile sets when saving a figure in a format.
+    Args:
+        profile (str|dict): Name of a profile in 'export_profiles' of the defaults file, or a profile dict with keys:
+            simplify (bool): Simplify paths by removing vertices that do not change their appearance.
+            simplify_threshold (float): Maximum deviation (in pixels) of vertices removed by path simplification.
+            chunk_size (int): Split paths into chunks of this many vertices when rendering with Agg, so that huge
+                paths do not exceed Agg's cell limit (0 to not split paths).
+            font_embedding (str): 'truetype' embeds (subsetted) TrueType fonts in pdf/ps files, 'type3' converts the
+                glyphs used to Type 3 fonts.
+            svg_fonts (str): 'path' stores svg text as paths, 'none' stores it as text that uses installed fonts.
+            dpi (float|dict): Output dpi, or a dict of dpi for each format with an optional 'default' for others.
+                The dpi is left unchanged if not given (or not given for the format).
+        format (str): Output format.
+        file (str): Defaults file.
+    Returns:
+        (dict): rcParams.
+    """
+    if(isinstance(profile, str)):
+        profiles = get_defaults(file).get('export_profiles', {})
+        if(profile not in profiles):
+            raise InputError("Export profile '{}' not found. Profiles in '{}' are '{}'."
+                             .format(profile, file, "', '".join(sorted(profiles))))
+        profile = profiles[profile]
+    dpi = profile.get('dpi')
+    if(isinstance(dpi, dict)):
+        dpi = dpi.get(format, dpi.get('default'))
+    rc = {} if dpi is None else {'savefig.dpi': dpi}
+    for k, rc_key in [('simplify', 'path.simplify'), ('simplify_threshold', 'path.simplify_threshold'),
+                      ('chunk_size', 'agg.path.chunksize'), ('svg_fonts', 'svg.fonttype')]:
+        if(k in profile):
+            rc[rc_key] = profile[k]
+    if('font_embedding' in profile):
+        font_type = {'type3': 3, 'truetype': 42}.get(profile['font_embedding'])
+        if(font_type is None):
+            raise InputError("Font embedding '{}' not recognised. Use 'type3' or 'truetype'."
+                             .format(profile['font_embedding']))
+        rc['pdf.fonttype'] = rc['ps.fonttype'] = font_type
+    return rc
+
+
+def render_figure_bytes(fig, format='png', bbox='tight', extra_artists=None, **kwargs):
+    """Render figure into memory rather than to a file, e.g. to stream it from a service without disk I/O.
+    Args:
+        fig (matplotlib.figure.Figure): Figure to render.
+        format (str): Format to render figure in.
+        bbox (str):  Only the bbox specified is rendered. 'tight' forces matplotlib to figure out bbox automatically.
+        extra_artists (list): A list of extra artists that are considered when calculating the bbox.
+        **kwargs: Any other keyword arguments passed to savefig.
+    Returns:
+        (bytes): Encoded figure.
+    """
+    buffer = io.BytesIO()
+    save_figure(buffer, format, bbox, extra_artists, fig=fig, **kwargs)
+    return buffer.getvalue()
+
+
+def get_figure_buffer(fig, draw=True, as_array=True):
+    """Get the RGBA pixel buffer of a figure's Agg canvas without copying it. The buffer is rendered at the figure dpi
+    and is only valid until the figure is next drawn at a different size.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object with an Agg-based canvas.
+        draw (bool): Draw the figure first if True, otherwise return the buffer of the last draw.
+        as_array (bool): Return a numpy view with shape (height, width, 4) if True, otherwise a memoryview.
+    Returns:
+        (numpy.ndarray|memoryview): RGBA pixels as uint8.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    if not(isinstance(fig.canvas, FigureCanvasAgg)):
+        raise InputError("Figure canvas '{}' is not Agg-based so has no RGBA buffer. Use an Agg backend or "
+                         "render_figure_bytes() instead.".format(type(fig.canvas).__name__))
+    if(draw):
+        with _rc_scope(fig), _render_scope('png', fig):
+            fig.canvas.draw()
+    buffer = fig.canvas.buffer_rgba()
+    if(as_array):
+        # numpy.asarray wraps the memoryview so the pixels are not copied
+        return np.asarray(buffer)
+    return buffer
+
+
+def wait_for_exports():
+    """Wait for all pending export post-processing (e.g. PNG optimization) to finish. Exports that already finished
+    are not waited for - their results are available from the futures returned by save_figure().
+    Returns:
+        (list): Result of each export that was pending, in the order they were submitted. Exports cancelled because
+            their file was saved again are left out.
     """
-    plt.savefig(file_path, format=format, bbox_inches=bbox, bbox_extra_artists=extra_artists, **kwargs)  # , bbox_extra_artists=(l,)
+    with _export_lock:
+        futures = list(_export_futures.values())
+    concurrent.futures.wait(futures)
+    return [f.result() for f in futures if not(f.cancelled())]
 
 
 # PLOT OBJECT GETTER & SETTER FUNCTIONS ------------------------------------------------------------------------
@@ -291,7 +805,7 @@ def get_label_props(ax, which_axes):
                       defaults['label_props'], ['x', 'y'])
 
 
-def set_label_props(ax, which_labels, label_props):
+def set_label_props(ax, which_labels, label_props, mathtext_requests=None):
     """Set properties for axes labels.
     Args:
         ax (matplotlib.axes): Axis object.
@@ -306,6 +820,8 @@ def set_label_props(ax, which_labels, label_props):
                 fontsize (float): Label font size(s)
                 fontname (str): Label font(s)
                 color (str|tuple): Label color(s) as hex string(s) or RGB tuple(s)
+        mathtext_requests (list): If given, (strings, font) is appended to this list instead of changing the global
+            mathtext font immediately, so that the caller can decide the mathtext font once with _change_mathtext().
     Returns:
         None
     """
@@ -317,7 +833,7 @@ def set_label_props(ax, which_labels, label_props):
             # Get closest matching font or None if font not found
             label_props['fontname'] = _get_system_font(label_props['fontname'])
             # Check if label text contains mathtext and if so change the mathtext font to accommodate
-            _change_mathtext(which_labels, label_props['fontname'])
+            _request_mathtext(which_labels, label_props['fontname'], mathtext_requests)
         # Fix property input to be consistent with matplotlib conventions
         _fix_props(label_props, 'label')
         # Set properties using matplotlib.pyplot.setp
@@ -377,6 +893,67 @@ def set_line_props(ax, which_lines, line_props, legend_lines=False):
         _set_props(which_lines, lines_name, **line_props)
 
 
+def set_line_decimation(ax, which_lines, decimate_props):
+    """Decimate line data to the number of points that can be resolved at the output resolution. The original data is
+    stored on each line so that it can be restored with restore_line_data() and so that repeated calls always decimate
+    from the original rather than already decimated data. Lines are bucketed in the scaled coordinates of the axes
+    (e.g. log10 of the data on a log axis), so set the axis scales before decimating.
+    Args:
+        ax (matplotlib.axes): Axis object.
+        which_lines (int|str|matplotlib.lines.Line2D): Line index(es) or object(s).
+            Given as a specified type OR list of a specified type.
+            'all' can be used to select all lines.
+            Comma-colon separated strings can be used to select lines in plotted order.
+                e.g. '0' = '1st line', '0,1' = '1st, 2nd line', '1:3' = '2nd, 3rd, 4th line'
+        decimate_props (dict): Decimation properties.
+            method (str): 'lttb' (Largest-Triangle-Three-Buckets) or 'minmax' (min/max envelope per bucket).
+            points_per_pixel (float): Number of points retained for each horizontal pixel of the axes.
+            min_points (int): Lines with fewer points than this are left untouched.
+    Returns:
+        None
+    """
+    lines_master, lines_name = _get_master_objs(ax, 'line', matplotlib.lines.Line2D, ax.lines)
+    # Get appropriate line object(s) from input as list
+    which_lines = _get_plot_objects(which_lines, decimate_props, lines_master, lines_name)
+    n_out = get_decimation_budget(_get_axes_pixel_size(ax)[0], decimate_props.get('points_per_pixel', 2.0))
+    # Bounds of the view in scaled coordinates - points outside the view are clipped to it so that they do not stretch
+    # the buckets (log axes map non-positive values far outside the view)
+    view = ax.transScale.transform(ax.viewLim.get_points())
+    for line in which_lines:
+        x, y = getattr(line, '_pyblish_original_data', None) or line.get_data(orig=True)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if(len(x) < max(decimate_props.get('min_points', 0), n_out)):
+            continue
+        if(x.ndim != 1 or np.any(np.diff(x) < 0)):
+            warnings.warn("Line '{}' does not have monotonic x data and therefore has not been decimated."
+                          .format(line.get_label()))
+            continue
+        line._pyblish_original_data = (x, y)
+        scaled = np.nan_to_num(ax.transScale.transform(np.column_stack([x, y])), nan=-np.inf)
+        scaled = np.clip(scaled, view.min(axis=0), view.max(axis=0))
+        keep = decimate_indexes(scaled[:, 0], scaled[:, 1], n_out, decimate_props.get('method', 'lttb'))
+        line.set_data(x[keep], y[keep])
+
+
+def restore_line_data(ax, which_lines='all'):
+    """Restore the original data of lines decimated by set_line_decimation().
+    Args:
+        ax (matplotlib.axes): Axis object.
+        which_lines (int|str|matplotlib.lines.Line2D): Line index(es) or object(s).
+            Given as a specified type OR list of a specified type.
+            'all' can be used to select all lines.
+    Returns:
+        None
+    """
+    lines_master, lines_name = _get_master_objs(ax, 'line', matplotlib.lines.Line2D, ax.lines)
+    for line in _get_plot_objects(which_lines, False, lines_master, lines_name):
+        original_data = getattr(line, '_pyblish_original_data', None)
+        if(original_data):
+            line.set_data(*original_data)
+            del line._pyblish_original_data
+
+
 def get_marker_props(ax, which_markers, legend_markers=False):
     """Get properties of marker collections. The properties are returned in the order specified. If 'all' is given
     instead of an order then the marker collection properties are returned in the default order: '0', '1', '2' etc.
@@ -435,6 +1012,118 @@ def set_marker_props(ax, which_markers, marker_props, legend_markers=False):
         _set_props(which_markers, markers_name, **marker_props)
 
 
+def set_marker_density(ax, which_markers, density_props):
+    """Replace oversized marker collections with a density image binned at the output pixel resolution. The
+    collection itself is kept (with its offsets removed) so that legend handles and marker styling still apply, and the
+    axes limits are fixed to those of the original scatter. Points are binned in the scaled coordinates of the axes
+    (see plot_density()), so set the axis scales first. Use restore_marker_data() to undo.
+    Args:
+        ax (matplotlib.axes): Axis object.
+        which_markers (int|str|matplotlib.collections.PathCollection): Marker collection/set index(es) or object(s).
+            Given as a specified type OR list of a specified type.
+            'all' can be used to select all marker collections.
+            Comma-colon separated strings can be used to select marker collections in plotted order.
+                e.g. '0' = '1st marker col', '0,1' = '1st, 2nd marker col', '1:3' = '2nd, 3rd, 4th marker col'
+        density_props (dict): Density properties.
+            min_points (int): Marker collections with fewer points than this are left untouched.
+            pixels_per_bin (float): Size of each histogram bin in output pixels.
+            norm (str): Color scaling of counts: 'log' or 'linear'.
+            chunk_size (int): Number of points binned at a time.
+    Returns:
+        None
+    """
+    markers_master, markers_name = _get_master_objs(ax, 'marker collection', matplotlib.collections.PathCollection,
+                                                    ax.collections)
+    # Get appropriate marker object(s) from input as list
+    which_markers = _get_plot_objects(which_markers, density_props, markers_master, markers_name)
+    # Fix limits to those of the scatter data so that replacing the markers does not change the axes
+    xlim, ylim = ax.get_xlim(), ax.get_ylim()
+    for wm in which_markers:
+        offsets = wm.get_offsets()
+        if(len(offsets) < density_props.get('min_points', 0)):
+            continue
+        facecolors, edgecolors = wm.get_facecolors(), wm.get_edgecolors()
+        if not(len(facecolors) or len(edgecolors)):
+            continue  # Markers without face or edge colors are not drawn, so neither is their density
+        color = tuple(facecolors[0]) if len(facecolors) else tuple(edgecolors[0])
+        image = plot_density(ax, offsets[:, 0], offsets[:, 1], color, density_props, xlim + ylim)
+        image.set_zorder(wm.get_zorder())
+        wm._pyblish_original_offsets = offsets
+        wm._pyblish_density_image = image
+        wm.set_offsets(np.empty((0, 2)))
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+
+
+def plot_density(ax, x, y, color, density_props, extent=None):
+    """Plot points as a density image binned at the output pixel resolution. Points are binned in the scaled
+    coordinates of the axes, so bins have equal sizes on screen on log axes too, and points outside the domain of a
+    scale (e.g. non-positive values on a log axis) are dropped. Set the axis scales before plotting. Points are read in
+    chunks so memory-mapped arrays larger than RAM can be plotted directly.
+    Args:
+        ax (matplotlib.axes): Axis object.
+        x (numpy.ndarray|numpy.memmap): x values.
+        y (numpy.ndarray|numpy.memmap): y values with the same length as x.
+        color (str|tuple): Color of the densest bin. Empty bins are transparent.
+        density_props (dict): Density properties (see set_marker_density()).
+        extent (tuple): Binned range as (x0, x1, y0, y1) in data coordinates. The data extent is used if None.
+    Returns:
+        (matplotlib.image.AxesImage|matplotlib.collections.QuadMesh): Density image. A QuadMesh is returned if either
+            axis is not linear.
+    """
+    chunk_size = int(density_props.get('chunk_size', 10000000))
+
+    def transform(xy):
+        return _scale_points(ax, xy)
+
+    if(extent is None):
+        extent = get_extent_chunked(x, y, chunk_size, transform)
+    else:
+        (x0, y0), (x1, y1) = transform([extent[0:4:2], extent[1:4:2]])
+        extent = (x0, x1, y0, y1)
+    width, height = _get_axes_pixel_size(ax)
+    pixels_per_bin = float(density_props.get('pixels_per_bin', 1.0))
+    bins = (max(int(width / pixels_per_bin), 1), max(int(height / pixels_per_bin), 1))
+    # Empty bins are masked so that they are left transparent rather than mapped to the lowest color
+    counts = np.ma.masked_equal(histogram2d_chunked(x, y, bins, extent, chunk_size, transform), 0)
+    if(density_props.get('norm', 'log') == 'log'):
+        norm = matplotlib.colors.LogNorm()
+    else:
+        norm = matplotlib.colors.Normalize()
+    color = matplotlib.colors.to_hex(color)
+    cmap = make_colormap([[color, 0.2], [color, 1.0]])
+    # Bin edges in data coordinates
+    x_edges, y_edges = [np.linspace(extent[2 * i], extent[2 * i + 1], bins[i] + 1) for i in range(2)]
+    to_data = ax.transScale.inverted()
+    x_edges = to_data.transform(np.column_stack([x_edges, np.full_like(x_edges, extent[2])]))[:, 0]
+    y_edges = to_data.transform(np.column_stack([np.full_like(y_edges, extent[0]), y_edges]))[:, 1]
+    if(ax.transScale.is_affine):
+        return ax.imshow(counts, origin='lower', extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+                         aspect='auto', interpolation='nearest', cmap=cmap, norm=norm)
+    # Images are resampled linearly in data coordinates, so bins of equal scaled size are drawn as a mesh instead
+    return ax.pcolormesh(x_edges, y_edges, counts, cmap=cmap, norm=norm, shading='flat')
+
+
+def restore_marker_data(ax, which_markers='all'):
+    """Restore marker collections replaced by set_marker_density() and remove their density images.
+    Args:
+        ax (matplotlib.axes): Axis object.
+        which_markers (int|str|matplotlib.collections.PathCollection): Marker collection/set index(es) or object(s).
+            Given as a specified type OR list of a specified type.
+            'all' can be used to select all marker collections.
+    Returns:
+        None
+    """
+    markers_master, markers_name = _get_master_objs(ax, 'marker collection', matplotlib.collections.PathCollection,
+                                                    ax.collections)
+    for wm in _get_plot_objects(which_markers, False, markers_master, markers_name):
+        offsets = getattr(wm, '_pyblish_original_offsets', None)
+        if(offsets is not None):
+            wm.set_offsets(offsets)
+            wm._pyblish_density_image.remove()
+            del wm._pyblish_original_offsets, wm._pyblish_density_image
+
+
 def get_text_props(ax, which_texts, legend_texts=False):
     """Get properties of texts. The properties are returned in the order specified. If 'all' is given instead of an
     order then the text properties are returned in the default order: '0', '1', '2' etc.
@@ -457,7 +1146,7 @@ def get_text_props(ax, which_texts, legend_texts=False):
     return _get_props(which_texts, texts_master, texts_name, defaults['text_props'])
 
 
-def set_text_props(ax, which_texts, text_props, legend_texts=False):
+def set_text_props(ax, which_texts, text_props, legend_texts=False, mathtext_requests=None):
     """Set properties for texts.
     Args:
         ax (matplotlib.axes): Axis object.
@@ -473,6 +1162,8 @@ def set_text_props(ax, which_texts, text_props, legend_texts=False):
                 fontname (str): Text font(s)
         legend_texts (bool): Sets properties for legend texts if True, otherwise sets properties for texts plotted on
             specified axis object.
+        mathtext_requests (list): If given, (strings, font) is appended to this list instead of changing the global
+            mathtext font immediately, so that the caller can decide the mathtext font once with _change_mathtext().
     Returns:
         None
     """
@@ -488,7 +1179,7 @@ def set_text_props(ax, which_texts, text_props, legend_texts=False):
                               "Use set_font('font', mathtext=True) to set the mathtext font within the plot instead.")
             else:
                 # Check if text contains mathtext and if so change the mathtext font to accommodate
-                _change_mathtext(which_texts, text_props['fontname'])
+                _request_mathtext(which_texts, text_props['fontname'], mathtext_requests)
         if('fontsize' in text_props and legend_texts):
             # More than one fontsize is not supported in legend text
             if(len(set(get_iterable(text_props['fontsize']))) > 1):
@@ -549,13 +1240,13 @@ def set_legend_props(ax, which_legends, legend_props):
         None
     """
     # Get master list of all legends in plot including additional legends added via add_artist
-    legends_master = [ax.legend_]
-    legends_master.extend([l for l in ax.artists if isinstance(l, matplotlib.legend.Legend)])
-
-    which_legends = _get_plot_objects(which_legends, legend_props, legends_master, 'legend')
+    which_legends = _get_plot_objects(which_legends, legend_props, _get_legends(ax), 'legend')
 
     if(which_legends):
         _fix_props(legend_props, 'legend')
+        # matplotlib >= 3.6 reads the number of columns from _ncols
+        if('_ncol' in legend_props):
+            legend_props['_ncols'] = legend_props['_ncol']
         # Position updated legend in same location as previous if bbox_to_anchor is not specified
         if('_bbox_to_anchor' not in legend_props):
             legend_props['_bbox_to_anchor'] = [wl.get_bbox_to_anchor() for wl in which_legends]
@@ -563,9 +1254,73 @@ def set_legend_props(ax, which_legends, legend_props):
         else:
             legend_props['_bbox_to_anchor'] = _get_legend_bboxes(ax, legend_props['_bbox_to_anchor'])
         _set_props(which_legends, 'legend', redraw=False, **legend_props)
-        # Update legend artists to reflect changes
-        legend_artists = [wl for wl in which_legends]
-        plt.gca().artists = list(set(plt.gca().artists) | set(legend_artists))
+        # Add any legend that is not drawn by the axes yet so that the changes are shown
+        for wl in which_legends:
+            if(wl is not ax.legend_ and wl not in ax.artists):
+                ax.add_artist(wl)
+
+
+def deduplicate_legend(ax):
+    """Rebuild the axes legend with one entry for each distinct (label, handle style) pair, e.g. so that an ensemble
+    of hundreds of identically styled and labelled series has a single legend entry. The rebuilt legend keeps the
+    location, columns, title, fonts, label colors, spacing, frame and handler map of the original.
+    Args:
+        ax (matplotlib.axes): Axis object.
+    Returns:
+        (int): Number of entries removed.
+    """
+    legend = ax.legend_
+    if(legend is None):
+        return 0
+    entries = collections.OrderedDict()
+    for handle, text in zip(_get_legend_handles(legend), legend.texts):
+        entries.setdefault((text.get_text(), _get_legend_handle_key(handle)), (handle, text))
+    removed = len(legend.texts) - len(entries)
+    if(removed):
+        handles, texts = zip(*entries.values())
+        ax.legend(handles, [t.get_text() for t in texts], **_get_legend_keywords(legend, texts))
+        ax.legend_.set_zorder(legend.get_zorder())
+        ax.legend_.set_visible(legend.get_visible())
+        if(legend.get_draggable()):
+            ax.legend_.set_draggable(True)
+    return removed
+
+
+def get_legend_ncol(ax, large_legend_props, legend_props=None):
+    """Get the number of legend columns that fit in the width available to a legend. The widest entry text is
+    measured once and cached by entry texts, font and dpi, so repeated styling and saving does not measure every
+    entry again.
+    Args:
+        ax (matplotlib.axes): Axis object with a legend.
+        large_legend_props (dict): Large legend properties.
+            max_width_fraction (float): Fraction of the axes width the legend can take.
+            max_ncol (int): Maximum number of columns.
+        legend_props (dict): Legend properties that will be applied (handlelength, handletextpad, columnspacing).
+            The legend's current values are used for any not given.
+    Returns:
+        (int): Number of columns.
+    """
+    legend = ax.legend_
+    legend_props = legend_props or {}
+    texts = legend.texts
+    dpi = ax.figure.dpi
+    font_keys = tuple(sorted(set(_get_font_key(t.get_fontproperties()) for t in texts)))
+    key = (tuple(t.get_text() for t in texts), font_keys, dpi)
+    text_width = _legend_layout_cache.get(key)
+    if(text_width is None):
+        from matplotlib.backends.backend_agg import RendererAgg
+        renderer = RendererAgg(1, 1, dpi)
+        with _render_scope('png'):
+            text_width = max([t.get_window_extent(renderer).width for t in texts] or [0.0])
+        _legend_layout_cache.put(key, text_width)
+    # Handle length and spacings are in units of the legend font size
+    font_size = legend._fontsize * dpi / 72.0
+    spacing = {k: legend_props.get(k, getattr(legend, k)) for k in ['handlelength', 'handletextpad', 'columnspacing']}
+    entry_width = (spacing['handlelength'] + spacing['handletextpad']) * font_size + text_width
+    available = ax.bbox.width * large_legend_props.get('max_width_fraction', 1.0)
+    ncol = int((available + spacing['columnspacing'] * font_size) //
+               (entry_width + spacing['columnspacing'] * font_size))
+    return max(1, min(ncol, large_legend_props.get('max_ncol', ncol), len(texts)))
 
 
 def set_figure_size(fig, fig_width, fig_height, res_inc=1.0):
@@ -581,6 +1336,38 @@ def set_figure_size(fig, fig_width, fig_height, res_inc=1.0):
     _set_figure_size(fig, fig_width * res_inc, fig_height * res_inc)
 
 
+def set_layout(fig, cache=True, pad=1.08, h_pad=None, w_pad=None, rect=None):
+    """Fit subplots to the figure with tight layout. The solved subplot parameters are cached by the layout signature
+    of the figure (grid geometry, figure size and the content and fonts of every text that takes up space around the
+    axes), so figures with the same signature have the solution applied directly instead of being solved again.
+    Figures that differ in anything in the signature are solved as normal.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object.
+        cache (bool): Use the layout cache if True, otherwise always solve the layout.
+        pad (float): Padding between the figure edge and the edges of subplots, as a fraction of the font size.
+        h_pad (float): Padding (height) between edges of adjacent subplots, as a fraction of the font size.
+        w_pad (float): Padding (width) between edges of adjacent subplots, as a fraction of the font size.
+        rect (tuple): (left, bottom, right, top) rectangle in normalized figure coordinates to fit subplots into.
+    Returns:
+        (bool): True if a cached layout was applied, otherwise False.
+    """
+    layout_keywords = {'pad': pad, 'h_pad': h_pad, 'w_pad': w_pad, 'rect': rect}
+    signature = None
+    if(cache):
+        signature = _get_layout_signature(fig, layout_keywords)
+        subplot_params = _layout_cache.get(signature)
+        if(subplot_params is not None):
+            fig.subplots_adjust(**subplot_params)
+            return True
+    # Text is measured by the renderer of the figure canvas, which is Agg for raster backends
+    with _render_scope('png'):
+        fig.tight_layout(**layout_keywords)
+    if(signature is not None):
+        _layout_cache.put(signature, {k: getattr(fig.subplotpars, k)
+                                      for k in ['left', 'bottom', 'right', 'top', 'wspace', 'hspace']})
+    return False
+
+
 def set_log_scale(ax, which_axes, log_scale_props):
     """
     Args:
@@ -591,11 +1378,11 @@ def set_log_scale(ax, which_axes, log_scale_props):
             Comma-colon separated strings can be used to select axes in 'x', 'y' order.
                 e.g. '0' = 'x', '0,1' = 'x, y'
         log_scale_props (dict): Scale properties. Call get_available_scales() or see matplotlib.scale documentation
-            for full properties list. Note, however, that in contrast to matplotlib implementation, keyword args
-            should not have axis name suffix (e.g. 'basex' is just 'base' and which_axes determines the 'base' type).
+            for full properties list. Note that keyword args do not have the axis name suffix older versions of
+            matplotlib used (e.g. 'basex' is just 'base' and which_axes determines the 'base' type).
             scale (str): 'log', 'linear', 'symlog' or 'logit'.
             base (int): Logarithmic base. Only used if scale='log'.
-            nonpos (str): Whether to "mask" or "clip" non positive values if scale='log'
+            nonpositive (str): Whether to "mask" or "clip" non positive values if scale='log'
                 or values near 0 and 1 in scale='logit'.
             subs (list): List of integer spacings for minor ticks.
             linscale (float): Stretching of linear range "linthresh" relative to log range if scale='symlog'.
@@ -603,6 +1390,9 @@ def set_log_scale(ax, which_axes, log_scale_props):
             exponents_precision (int): Precision with which to display exponent ticklabels.
             hide_base (bool): Whether to hide base in label text.
             base_precision (int): Precision with which to display base in label text.
+            max_major_ticks (int): Maximum number of major ticks on a log axis. Decades are skipped to stay in budget.
+            max_minor_ticks (int): Maximum number of minor ticks on a log axis. Subs are thinned, then decades are
+                skipped, to stay in budget so that wide ranges do not make hundreds of ticks.
     Returns:
         None
     """
@@ -616,19 +1406,20 @@ def set_log_scale(ax, which_axes, log_scale_props):
                                          len(which_axes))
     hide_base = map_list(get_iterable(log_scale_props.pop('hide_base', False)), len(which_axes))
     base_precision = map_list(get_iterable(log_scale_props.pop('base_precision', 0)), len(which_axes))
+    max_ticks = [map_list(get_iterable(log_scale_props.pop(k, None)), len(which_axes))
+                 for k in ['max_major_ticks', 'max_minor_ticks']]
 
     # Convert property values into iterables with same length as number of axes
     log_scale_props = {k: map_list(get_iterable(v), len(which_axes)) for k, v in log_scale_props.items()}
     for i, (wa, s, exp, exp_prec, hb, bp) in \
             enumerate(zip(which_axes, scale, exponents, exponents_precision, hide_base, base_precision)):
         axis_name = wa.axis_name
-        scale_dict = {}
-        for k, v in log_scale_props.items():
-            scale_dict[k+axis_name] = v[i]
+        scale_dict = {k: v[i] for k, v in log_scale_props.items()}
         if(axis_name == 'x'):
             ax.set_xscale(wa.get_scale() if s is None else s, **scale_dict)
         elif(axis_name == 'y'):
             ax.set_yscale(wa.get_scale() if s is None else s, **scale_dict)
+        _set_tick_budget(wa, max_ticks[0][i], max_ticks[1][i])
         if(exp):
             try:
                 base = wa._scale.base  # This allows user to set exponent properties without needing to specify the base
@@ -678,6 +1469,179 @@ def get_mathtext():
     return get_font(True)
 
 
+def get_style_stats():
+    """Get number of property assignments applied and skipped since the last reset. Assignments are skipped when the
+    value is the one pyblish last applied to the object, or for properties pyblish has not set yet, when the object
+    already has the value however it was set. Values changed outside pyblish after it applied them are not restored by
+    restyling.
+    Returns:
+        (dict): 'applied' and 'skipped' counts.
+    """
+    return dict(_style_stats)
+
+
+def reset_style_stats():
+    """Reset property assignment counts returned by get_style_stats().
+    Returns:
+        None
+    """
+    for k in _style_stats:
+        _style_stats[k] = 0
+
+
+def get_draw_stats():
+    """Get number of figure draws and of redraw requests suppressed by deferred_draw() since the last reset. Draws are
+    counted once pyblish has drawn, saved or deferred drawing of a figure.
+    Returns:
+        (dict): 'draws' and 'suppressed' counts.
+    """
+    return dict(_draw_stats)
+
+
+def reset_draw_stats():
+    """Reset draw counts returned by get_draw_stats().
+    Returns:
+        None
+    """
+    for k in _draw_stats:
+        _draw_stats[k] = 0
+
+
+# FIGURE SNAPSHOT FUNCTIONS ------------------------------------------------------------------------------------
+
+
+# Properties read for each kind of styled artist, named as the matplotlib getters (get_<property>) they are read with
+_SNAPSHOT_PROPS = {
+    'spine': ['linewidth', 'linestyle', 'edgecolor', 'visible'],
+    'label': ['text', 'fontsize', 'fontname', 'color'],
+    'line': ['linewidth', 'linestyle', 'color', 'marker', 'markersize'],
+    'marker collection': ['linewidths', 'linestyles', 'facecolors', 'edgecolors', 'sizes'],
+    'text': ['text', 'fontsize', 'fontname', 'color'],
+    'legend line': ['linewidth', 'linestyle', 'color'],
+    'legend marker collection': ['linewidths', 'facecolors', 'edgecolors', 'sizes'],
+    'legend text': ['text', 'fontsize', 'fontname', 'color'],
+}
+_SNAPSHOT_TICK_PROPS = ['size', 'width', 'direction', 'pad', 'labelsize', 'labelcolor']
+# Unbound getter methods resolved once per (artist class, property)
+_snapshot_getters = {}
+# Getters read from every artist when fingerprinting a figure, covering data as well as style not in the snapshot
+_FINGERPRINT_GETTERS = ['get_visible', 'get_zorder', 'get_alpha', 'get_xydata', 'get_offsets', 'get_array',
+                        'get_paths', 'get_path', 'get_text', 'get_position', 'get_facecolor', 'get_edgecolor',
+                        'get_xlim', 'get_ylim', 'get_xscale', 'get_yscale', 'get_extent', 'get_ticklocs']
+
+
+def get_figure_props(fig):
+    """Get properties of every styled artist in a figure as a column-oriented snapshot. Artists are collected in a
+    single pass over the axes and each property is read with a getter resolved once per artist class, rather than
+    reloading defaults and calling plt.getp per attribute as the get_*_props functions do.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object.
+    Returns:
+        (dict): Nested dictionary keyed by artist kind (e.g. 'line', 'major tick') then property. Each property is a
+            numpy array if the values are numeric and of equal shape, otherwise a list. Each kind also has 'axes' and
+            'index' columns giving the axes index and position of each artist within its axes.
+    """
+    artists = {k: [] for k in _SNAPSHOT_PROPS}
+    axes_ids = {k: [] for k in _SNAPSHOT_PROPS}
+    ticks = {'major tick': [], 'minor tick': []}
+    for i, ax in enumerate(fig.axes):
+        legend = ax.legend_
+        legend_handles = _get_legend_handles(legend) if legend else []
+        found = {
+            'spine': [ax.spines[k] for k in ['left', 'bottom', 'right', 'top'] if k in ax.spines],
+            'label': [ax.xaxis.label, ax.yaxis.label],
+            'line': ax.lines,
+            'marker collection': [c for c in ax.collections if isinstance(c, matplotlib.collections.PathCollection)],
+            'text': ax.texts,
+            'legend line': [h for h in legend_handles if isinstance(h, matplotlib.lines.Line2D)],
+            'legend marker collection': [h for h in legend_handles
+                                         if isinstance(h, matplotlib.collections.PathCollection)],
+            'legend text': legend.texts if legend else [],
+        }
+        for k, objs in found.items():
+            artists[k].extend(objs)
+            axes_ids[k].extend([i] * len(objs))
+        for axis in [ax.xaxis, ax.yaxis]:
+            ticks['major tick'].append((i, axis.axis_name, _get_tick_props(axis, 'major')))
+            ticks['minor tick'].append((i, axis.axis_name, _get_tick_props(axis, 'minor')))
+
+    snapshot = {}
+    for k, objs in artists.items():
+        columns = {'axes': np.array(axes_ids[k], dtype=int), 'index': _get_index_column(axes_ids[k])}
+        for prop in _SNAPSHOT_PROPS[k]:
+            columns[prop] = _to_column([_get_snapshot_getter(o, prop)(o) for o in objs])
+        snapshot[k] = columns
+    for k, tick_kws in ticks.items():
+        columns = {'axes': np.array([t[0] for t in tick_kws], dtype=int), 'axis': [t[1] for t in tick_kws]}
+        for prop in _SNAPSHOT_TICK_PROPS:
+            columns[prop] = _to_column([t[2].get(prop) for t in tick_kws])
+        snapshot[k] = columns
+    return snapshot
+
+
+def get_render_fingerprint(fig, format='png', bbox='tight', **kwargs):
+    """Get a fingerprint of everything that determines the rendered output of a figure: the data of every artist, the
+    resolved style, the fonts used, rcParams (including dpi), the matplotlib version and the save options.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object.
+        format (str): Format the figure is saved in.
+        bbox (str): bbox_inches the figure is saved with.
+        **kwargs: Any other keyword arguments passed to savefig.
+    Returns:
+        (str): Hex digest identifying the rendered output.
+    """
+    snapshot = get_figure_props(fig)
+    digest = hashlib.sha1()
+    digest.update(figure_props_to_json(snapshot).encode('utf-8'))
+    # Font files that text is actually rendered with, so that installing a different font changes the fingerprint
+    font_names = set(get_iterable(matplotlib.rcParams['font.family']))
+    for k in ['label', 'text', 'legend text']:
+        font_names.update(snapshot[k]['fontname'])
+    # Fonts (including mathtext fonts) are set on each text rather than in rcParams
+    for text in fig.findobj(matplotlib.text.Text):
+        font_names.update(text.get_fontfamily())
+        digest.update(repr(_get_font_key(text.get_fontproperties())).encode('utf-8'))
+    # Tick label formatting is set on each formatter rather than in rcParams
+    for ax in fig.axes:
+        for axis in [ax.xaxis, ax.yaxis]:
+            for formatter in [axis.get_major_formatter(), axis.get_minor_formatter()]:
+                digest.update(repr((type(formatter).__name__, getattr(formatter, '_useMathText', None),
+                                    getattr(formatter.fix_minus, '__name__', None))).encode('utf-8'))
+    for font_name in sorted(font_names):
+        digest.update(fm.findfont(fm.FontProperties(family=[font_name])).encode('utf-8'))
+    digest.update(repr(sorted((k, repr(v)) for k, v in matplotlib.rcParams.items())).encode('utf-8'))
+    digest.update(repr((matplotlib.__version__, format, bbox, sorted((k, repr(v)) for k, v in kwargs.items()),
+                        tuple(fig.get_size_inches()), fig.dpi)).encode('utf-8'))
+    for artist in fig.findobj(include_self=False):
+        digest.update(type(artist).__name__.encode('utf-8'))
+        for getter in _FINGERPRINT_GETTERS:
+            if(hasattr(artist, getter)):
+                digest.update(_get_fingerprint_bytes(getattr(artist, getter)()))
+    return digest.hexdigest()
+
+
+def figure_props_to_json(snapshot):
+    """Serialize a snapshot returned by get_figure_props() to a json string with sorted keys, so that identical
+    snapshots always serialize identically.
+    Args:
+        snapshot (dict): Figure property snapshot.
+    Returns:
+        (str): json string.
+    """
+    return json.dumps(snapshot, sort_keys=True, default=_to_json_value)
+
+
+def get_figure_props_fingerprint(snapshot):
+    """Get a fingerprint that identifies the styling of a figure, for comparing figures without comparing every
+    property.
+    Args:
+        snapshot (dict): Figure property snapshot returned by get_figure_props().
+    Returns:
+        (str): Hex digest of the serialized snapshot.
+    """
+    return hashlib.sha1(figure_props_to_json(snapshot).encode('utf-8')).hexdigest()
+
+
 # MISCELLANEOUS GETTER FUNCTIONS ------------------------------------------------
 
 
@@ -748,6 +1712,99 @@ def _get_figure_size(num_cols, aspect):
     return fig_width, fig_height
 
 
+def _get_output_pixel_width(fig, num_cols=None):
+    """Get an upper bound on the width in pixels of a figure once saved, allowing for pyblishify() resizing it.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object.
+        num_cols (int): Number of columns the figure will span. The widest pyblish figure is assumed if None.
+    Returns:
+        (float): Width in output pixels.
+    """
+    fig_width = _get_figure_size(2 if num_cols is None else num_cols, 1.0)[0] * 2.0  # res_inc used by pyblishify()
+    dpi = max(_get_save_dpi(fig), get_defaults()['dpi'])
+    return max(fig_width, fig.get_figwidth()) * dpi
+
+
+def _get_scale_domain_indexes(axis, x, n):
+    """Get the first and last samples of an increasing series that lie within the domain of the scale of an axis, e.g.
+    positive values for a log scale. Samples are found by binary search so that only a few are read.
+    Args:
+        axis (matplotlib.axis.Axis): Axis whose scale is used.
+        x (numpy.ndarray|numpy.memmap): Increasing values. Sample indexes are used if None.
+        n (int): Number of samples.
+    Returns:
+        (int), (int): Index of first and last sample in the domain. The first is greater than the last if none are.
+    """
+    def get_value(i):
+        return float(i) if x is None else float(x[i])
+
+    def is_outside(i, side):
+        value = get_value(i)
+        limits = axis.limit_range_for_scale(value, value)
+        return limits[0] > value if side == 'below' else limits[1] < value
+
+    def bisect(side):
+        lo, hi = 0, n  # First sample for which is_outside is False (below) or True (above)
+        while(lo < hi):
+            mid = (lo + hi) // 2
+            if(is_outside(mid, side) == (side == 'below')):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    return bisect('below'), bisect('above') - 1
+
+
+def _get_axes_pixel_size(ax):
+    """Get size of axes in pixels of the saved figure, using the savefig dpi rather than the screen dpi.
+    Args:
+        ax (matplotlib.axes): Axis object.
+    Returns:
+        (float), (float): Axes width and height in output pixels.
+    """
+    fig = ax.get_figure()
+    dpi = _get_save_dpi(fig)
+    position = ax.get_position()
+    return position.width * fig.get_figwidth() * dpi, position.height * fig.get_figheight() * dpi
+
+
+def _get_save_dpi(fig):
+    """Get the dpi a figure is saved at: the dpi pyblishify() styled it for, otherwise the savefig dpi.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object.
+    Returns:
+        (float): dpi.
+    """
+    dpi = getattr(fig, '_pyblish_dpi', None)
+    if(dpi is None):
+        dpi = matplotlib.rcParams['savefig.dpi']
+    if not(isinstance(dpi, (int, float))):
+        dpi = fig.dpi  # savefig.dpi can be 'figure'
+    return dpi
+
+
+def _scale_points(ax, xy):
+    """Transform points to the scaled coordinates of an axes (e.g. log10 of the data on a log axis), in which equal
+    distances are equal distances on screen. Values outside the domain of a scale (non-positive values on a log axis or
+    values outside (0, 1) on a logit axis) are set to NaN rather than clipped.
+    Args:
+        ax (matplotlib.axes): Axis object.
+        xy (numpy.ndarray): Points as an (N, 2) array of data coordinates.
+    Returns:
+        (numpy.ndarray): Points as an (N, 2) array of scaled coordinates.
+    """
+    xy = np.asarray(xy, dtype=float)
+    scaled = np.array(ax.transScale.transform(xy), dtype=float)
+    for i, scale in enumerate([ax.get_xscale(), ax.get_yscale()]):
+        if(scale == 'log'):
+            scaled[xy[:, i] <= 0, i] = np.nan
+        elif(scale == 'logit'):
+            scaled[(xy[:, i] <= 0) | (xy[:, i] >= 1), i] = np.nan
+    return scaled
+
+
+@conditional_decorator(sys.version_info.major == 3, 'lru_cache', decorator_args=None, module=functools)
 def _get_system_font(font):
     """Get name of font on system by taking the closest match between font specified and fonts on system.
     Args:
@@ -755,8 +1812,8 @@ def _get_system_font(font):
     Returns:
         (str): Font name as it is defined on system.
     """
-    # Check if font is one of the 3 global fontsets
-    if(font in ['sans', 'stixsans', 'cm']):
+    # Check if font is one of the mathtext fontsets
+    if(font in _MATH_FONTSETS):
         return font
     else:
         fonts = get_available_fonts()
@@ -770,6 +1827,47 @@ def _get_system_font(font):
             return None
 
 
+def _load_style(which_props, user_defined, file='defaults.json'):
+    """Load default plot properties and override the properties requested with user-specified key: value pairs. The
+    fonts, mathtext font, tick label formatting and dpi of the defaults are returned as 'figure_style' to be set on the
+    figure (see _set_figure_style), rather than applied to the global rcParams.
+    Args:
+        which_props (list): List of properties to process.
+        user_defined (dict): User-defined properties to use for overriding.
+        file (str): Defaults file.
+    Returns:
+        plot_props (dict): Dictionary of plotting properties.
+    """
+    # Get default parameters from 'defaults.json' - copied as the cached defaults are modified in place below
+    defaults_dict = copy.deepcopy(get_defaults(file))
+    # Set default parameters that = 'master' to appropriate value from master_defaults dict
+    _set_master_defaults(defaults_dict)
+    # Fix default parameters and names to be consistent with matplotlib conventions
+    _fix_defaults(defaults_dict)
+    # Set defaults that are dependent on number of columns requested
+    # defaults_dict = _set_params_defaults(defaults_dict, num_cols)
+
+    # Allow user to pass in any dictionary of properties as kwargs and take passed in values
+    # or default if no value passed
+    plot_props = _get_plot_properties(which_props, user_defined, defaults_dict)
+    plot_props['figure_style'] = _get_figure_style(defaults_dict)
+    return plot_props
+
+
+def _get_figure_style(defaults_dict):
+    """Get the properties of the defaults that are set for a whole figure.
+    Args:
+        defaults_dict (dict): Dictionary of default plotting parameters.
+    Returns:
+        (dict): Font and mathtext font found on the system (None if not found), whether tick labels use mathtext and
+            the unicode minus sign, and the output dpi.
+    """
+    return {'fontname': _get_system_font(defaults_dict['fontname']),
+            'fontname_mathtext': _get_system_font(defaults_dict['fontname_mathtext']),
+            'use_mathtext': defaults_dict['use_mathtext'], 'use_unicode_minus': defaults_dict['use_unicode_minus'],
+            'dpi': defaults_dict['dpi']}
+
+
 def _get_plot_properties(which_props, user_defined, defaults):
     """Override default plot properties with user-specified key: value pairs.
     Args:
@@ -867,7 +1965,7 @@ def _get_master_objs(ax, objs_name, objs_type, default_master, legend_objs=False
                 objs_master = ax.legend_.texts
             else:
                 # Get appropriate lines or markers from legend handles
-                objs_master = [h for h in ax.legend_.legendHandles if isinstance(h, objs_type)]
+                objs_master = [h for h in _get_legend_handles(ax.legend_) if isinstance(h, objs_type)]
             objs_name = "legend {}".format(objs_name)
         except AttributeError:
             raise AttributeError("Trying to get legend {} properties but no legend was found.".format(objs_name))
@@ -933,6 +2031,16 @@ def _get_legend_bboxes(ax, coords):
     return coords
 
 
+def _get_legend_handles(legend):
+    """Get the handles of a legend. legendHandles was renamed legend_handles in matplotlib 3.7 and removed in 3.9.
+    Args:
+        legend (matplotlib.legend.Legend): Legend object.
+    Returns:
+        (list): Legend handles.
+    """
+    return legend.legend_handles if hasattr(legend, 'legend_handles') else legend.legendHandles
+
+
 def _get_props(objs, objs_master, objs_name, objs_attrs, objs_keys=None, get_ticks=None):
     """Get plotted object properties.
     Args:
@@ -961,6 +2069,38 @@ def _get_props(objs, objs_master, objs_name, objs_attrs, objs_keys=None, get_tic
     return objs_props
 
 
+def _get_snapshot_getter(obj, prop):
+    """Get unbound getter method for an artist property, resolving it only once per artist class.
+    Args:
+        obj: Plot object.
+        prop (str): Property name (e.g. 'linewidth' for get_linewidth).
+    Returns:
+        (function): Getter that takes the object as its only argument.
+    """
+    key = (type(obj), prop)
+    getter = _snapshot_getters.get(key)
+    if(getter is None):
+        try:
+            getter = getattr(type(obj), 'get_' + prop)
+        except AttributeError:
+            raise InputError("'{}' objects have no '{}' property.".format(type(obj).__name__, prop))
+        _snapshot_getters[key] = getter
+    return getter
+
+
+def _get_index_column(axes_ids):
+    """Get position of each artist within its axes from the axes index of each artist.
+    Args:
+        axes_ids (list): Axes index of each artist, grouped by axes.
+    Returns:
+        (numpy.ndarray): Position of each artist within its axes.
+    """
+    index = []
+    for i, a in enumerate(axes_ids):
+        index.append(index[-1] + 1 if i and axes_ids[i - 1] == a else 0)
+    return np.array(index, dtype=int)
+
+
 def _get_tick_props(axes, tick_type):
     """Get tick properties. Uses private variables that may become deprecated.
     Args:
@@ -1047,18 +2187,105 @@ def _set_params_defaults(defaults, num_cols):
     return defaults
 
 
-def _set_rcparams_defaults(defaults_dict):
-    """Set default matplotlib.rcParams that define how the figure is rendered.
+def _get_figure_rc(figure_style):
+    """Get the rcParams that express the figure style of the defaults, for style sheets used without pyblish.
     Args:
-        defaults_dict (dict): Dictionary of default plotting parameters.
+        figure_style (dict): Figure style (see _get_figure_style).
+    Returns:
+        (dict): rcParams.
+    """
+    rc = {'axes.unicode_minus': figure_style['use_unicode_minus'],
+          'axes.formatter.use_mathtext': figure_style['use_mathtext'],
+          'figure.dpi': figure_style['dpi'], 'savefig.dpi': figure_style['dpi']}
+    if(figure_style['fontname']):
+        rc['font.family'] = [figure_style['fontname']]
+    math_font = figure_style['fontname_mathtext']
+    if(math_font in _MATH_FONTSETS):
+        rc['mathtext.fontset'] = math_font
+    elif(math_font):
+        rc['mathtext.fontset'] = 'custom'
+        rc.update({k: math_font for k in _MATH_FONT_RC_KEYS})
+    return rc
+
+
+def _set_figure_style(fig, figure_style, math_font=True):
+    """Set the font and mathtext font of every text in a figure (including tick labels made later) and record the dpi
+    the figure is saved at, leaving the global rcParams unchanged.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object.
+        figure_style (dict): Figure style (see _get_figure_style).
+        math_font (bool): Set the mathtext font if True. Pass False if the caller sets it later with
+            _change_mathtext(), so that the mathtext font of every text is set once.
     Returns:
         None
     """
-    rc_params = matplotlib.rcParams
-    rc_params['axes.unicode_minus'] = defaults_dict['use_unicode_minus']  # use smaller minus sign in plots
-    rc_params['axes.formatter.use_mathtext'] = defaults_dict['use_mathtext']  # use mathtext for scientific notation
-    rc_params['figure.dpi'] = defaults_dict['dpi']
-    rc_params['savefig.dpi'] = defaults_dict['dpi']
+    fig._pyblish_dpi = figure_style['dpi']
+    font = figure_style['fontname']
+    if(font):
+        _set_props(fig.findobj(matplotlib.text.Text), 'text', fontfamily=font)
+        # Tick labels made later copy the properties of the first tick, which may not exist yet
+        for ax in fig.axes:
+            ax.tick_params(which='both', labelfontfamily=font)
+    if(math_font and figure_style['fontname_mathtext']):
+        _set_math_font(fig, figure_style['fontname_mathtext'])
+
+
+def _set_math_font(fig, font):
+    """Set the mathtext font of every text in a figure. Fontsets (see _MATH_FONTSETS) are set on each text, other fonts
+    set each text to the 'custom' fontset and are recorded as the mathtext rcParams the figure is rendered with (see
+    _rc_scope), as the 'custom' fontset reads them when text is drawn.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object.
+        font (str): Mathtext fontset, or name of font on system.
+    Returns:
+        None
+    """
+    fig._pyblish_math_font = font
+    if(font in _MATH_FONTSETS):
+        fig._pyblish_rc = {}
+        fontset = font
+    else:
+        fig._pyblish_rc = {k: font for k in _MATH_FONT_RC_KEYS}
+        fontset = 'custom'
+    _set_props(fig.findobj(matplotlib.text.Text), 'text', math_fontfamily=fontset)
+
+
+def _set_formatter_props(ax, figure_style):
+    """Set whether the tick label formatters of an axes use mathtext for scientific notation and the unicode minus
+    sign, which matplotlib otherwise reads from the global rcParams.
+    Args:
+        ax (matplotlib.axes): Axis object.
+        figure_style (dict): Figure style (see _get_figure_style).
+    Returns:
+        None
+    """
+    fix_minus = _fix_minus_unicode if figure_style['use_unicode_minus'] else _fix_minus_hyphen
+    for axis in [ax.xaxis, ax.yaxis]:
+        for formatter in [axis.get_major_formatter(), axis.get_minor_formatter()]:
+            if(isinstance(formatter, matplotlib.ticker.ScalarFormatter)):
+                formatter.set_useMathText(figure_style['use_mathtext'])
+            # fix_minus is a static method of formatters, so the instance attribute is not bound
+            formatter.fix_minus = fix_minus
+
+
+def _fix_minus_unicode(s):
+    """Replace hyphens in a tick label with the unicode minus sign.
+    Args:
+        s (str): Tick label.
+    Returns:
+        (str): Tick label.
+    """
+    return s.replace('-', '\N{MINUS SIGN}')
+
+
+def _fix_minus_hyphen(s):
+    """Leave hyphens in a tick label as they are.
+    Args:
+        s (str): Tick label.
+    Returns:
+        (str): Tick label.
+    """
+    return s
 
 
 def _set_font(font, mathtext=False):
@@ -1070,10 +2297,10 @@ def _set_font(font, mathtext=False):
     Returns:
         None
     """
-    assert font in get_available_fonts() + ['stixsans', 'cm', 'sans']
+    assert font in get_available_fonts() + _MATH_FONTSETS
     if(mathtext):
-        # Check if font is one of the 3 global fontsets
-        if(font in ['cm', 'sans', 'stixsans']):
+        # Check if font is one of the mathtext fontsets
+        if(font in _MATH_FONTSETS):
             matplotlib.rcParams['mathtext.fontset'] = font
         else:
             matplotlib.rcParams['mathtext.fontset'] = 'custom'
@@ -1096,7 +2323,16 @@ def _set_figure_size(fig, fig_width, fig_height):
     Returns:
         None
     """
-    fig.set_size_inches(fig_width, fig_height, forward=True)  # Force update
+    if(values_equal(list(fig.get_size_inches()), [fig_width, fig_height])):
+        _style_stats['skipped'] += 1
+        return
+    _style_stats['applied'] += 1
+    if(getattr(fig, '_pyblish_deferred', False)):
+        # Resizing the window redraws it, so the resize is forwarded once drawing is no longer deferred
+        fig.set_size_inches(fig_width, fig_height, forward=False)
+        fig._pyblish_resize_pending = True
+    else:
+        fig.set_size_inches(fig_width, fig_height, forward=True)  # Force update
 
 
 def _set_axis_exponent(ax, base, precision, hide_base, base_precision=0):
@@ -1123,6 +2359,28 @@ def _set_axis_exponent(ax, base, precision, hide_base, base_precision=0):
                       .format(ax.axis_name, ax.get_scale()))
 
 
+def _set_tick_budget(ax, max_major_ticks, max_minor_ticks):
+    """Replace the log locators of an axis with locators that keep the same base and subs but stay within a budget of
+    ticks. Axes that are not log scaled are unchanged.
+    Args:
+        ax (matplotlib.axis.(XAxis|YAxis)): Axis object.
+        max_major_ticks (int): Maximum number of major ticks, or None for no budget.
+        max_minor_ticks (int): Maximum number of minor ticks, or None for no budget.
+    Returns:
+        None
+    """
+    for max_ticks, get_locator, set_locator in [(max_major_ticks, ax.get_major_locator, ax.set_major_locator),
+                                                (max_minor_ticks, ax.get_minor_locator, ax.set_minor_locator)]:
+        locator = get_locator()
+        if(max_ticks is None or not(isinstance(locator, matplotlib.ticker.LogLocator))):
+            continue
+        if(isinstance(locator, BudgetLogLocator)):
+            locator.max_ticks = max_ticks
+        else:
+            set_locator(BudgetLogLocator(locator._base, locator._subs, max_ticks=max_ticks,
+                                         numticks=locator.numticks))
+
+
 def _set_props(objs, objs_name, set_ticks=None, redraw=True, **kwargs):
     """Set plotted object properties.
     Args:
@@ -1142,7 +2400,14 @@ def _set_props(objs, objs_name, set_ticks=None, redraw=True, **kwargs):
     kwargs = {k: map_list(get_iterable(v), len(objs)) for k, v in kwargs.items()}
     for i, o in enumerate(objs):
         props_dict = {}
+        changed = []
         for k, v in kwargs.items():
+            # Skip properties the object already has to avoid marking the artist stale
+            if(_is_prop_applied(o, k, v[i], set_ticks, attribute=not(redraw))):
+                _style_stats['skipped'] += 1
+                continue
+            _style_stats['applied'] += 1
+            changed.append(k)
             # If the property can be changed and the canvas redrawn then populate dictionary with property values
             if(redraw):
                 props_dict[k] = v[i]
@@ -1153,21 +2418,575 @@ def _set_props(objs, objs_name, set_ticks=None, redraw=True, **kwargs):
                 except (TypeError, ValueError):
                     raise InputError("Could not set {} properties.".format(objs_name))
         if(props_dict):
-            if(set_ticks):
-                try:
+            try:
+                if(set_ticks):
                     o.set_tick_params(set_ticks, **props_dict)
-                except (TypeError, ValueError):
-                    raise InputError("Could not set {} properties.".format(objs_name))
-            else:
-                try:
+                else:
                     plt.setp(o, **props_dict)
-                except (TypeError, ValueError):
-                    raise InputError("Could not set {} properties.".format(objs_name))
+            except (TypeError, ValueError):
+                raise InputError("Could not set {} properties.".format(objs_name))
+        applied = _get_applied_props(o)
+        for k in changed:
+            applied[(set_ticks, k)] = (kwargs[k][i], _get_prop_value(o, k, set_ticks, attribute=not(redraw)))
+
+
+def _get_applied_props(obj):
+    """Get the record of property values last applied to an object by pyblish, making it on first use.
+    Args:
+        obj: Plot object.
+    Returns:
+        (dict): Value applied and value read back afterwards keyed by (tick type, property name). Tick type is None for
+            properties that are not tick parameters.
+    """
+    applied = getattr(obj, '_pyblish_applied', None)
+    if(applied is None):
+        applied = obj._pyblish_applied = {}
+    return applied
+
+
+def _is_prop_applied(obj, prop, value, tick_type=None, attribute=False):
+    """Check if a property value is already applied to an object. Values pyblish applied before are compared against
+    the object's record of them (see _get_applied_props): the value is unchanged if it equals the value last applied
+    and the object still reads back what it did straight after, so getters that normalise values (e.g. colors to RGBA)
+    are only compared against themselves. Properties pyblish has not set yet are read back and compared with the value
+    so that values already set by a style sheet or the user are not set again.
+    Args:
+        obj: Plot object.
+        prop (str): Property name.
+        value: Property value.
+        tick_type (str): Tick type ('major'|'minor') if the property is a tick parameter set on an axis object.
+        attribute (bool): Property is an attribute of the object (e.g. '_loc' of a legend) rather than a property with
+            a getter.
+    Returns:
+        (bool): True if the object already has value.
+    """
+    record = _get_applied_props(obj).get((tick_type, prop))
+    if(record is None):
+        return _has_prop_value(obj, prop, value, tick_type, attribute)
+    applied_value, read_value = record
+    if not(values_equal(applied_value, value)):
+        return False
+    # Properties without a getter can only be compared with the record
+    return read_value is _MISSING or values_equal(read_value, _get_prop_value(obj, prop, tick_type, attribute))
+
+
+def _get_prop_value(obj, prop, tick_type=None, attribute=False):
+    """Get the current value of an object property.
+    Args:
+        obj: Plot object.
+        prop (str): Property name.
+        tick_type (str): Tick type ('major'|'minor') if the property is a tick parameter set on an axis object.
+        attribute (bool): Property is an attribute of the object rather than a property with a getter.
+    Returns:
+        Property value, or _MISSING if it can not be read.
+    """
+    if(tick_type):
+        return _get_tick_props(obj, tick_type).get(_TICK_GETTER_PROPS.get(prop, prop), _MISSING)
+    elif(attribute):
+        return getattr(obj, prop, _MISSING)
+    elif(isinstance(obj, matplotlib.collections.Collection) and prop in ['color', 'linestyle', 'linestyles']):
+        if(prop == 'color'):
+            # Collection color sets both face and edge colors
+            return [_get_prop_value(obj, k) for k in ['facecolor', 'edgecolor']]
+        # Collection line styles are read back scaled by line width so read the unscaled dash patterns. Uses a private
+        # variable that may become deprecated, in which case the line style can not be read.
+        return getattr(obj, '_us_linestyles', _MISSING)
+    getter = getattr(type(obj), 'get_' + _GETTER_PROPS.get(prop, prop), None)
+    if(getter is None and hasattr(obj, 'get_fontproperties')):
+        # Font properties without a text getter (e.g. math_fontfamily) are read from the font properties
+        font_props = obj.get_fontproperties()
+        getter = getattr(type(font_props), 'get_' + prop, None)
+        obj = font_props
+    if(getter is None):
+        return _MISSING
+    value = getter(obj)
+    # Getters can return internal arrays, which are copied so that the value read stays as it was
+    return np.array(value) if isinstance(value, np.ndarray) else value
+
+
+def _has_prop_value(obj, prop, value, tick_type=None, attribute=False):
+    """Check if an object already has a property value, however the value was set (by pyblish, a style sheet or the
+    user). Properties without a getter are never considered set.
+    Args:
+        obj: Plot object.
+        prop (str): Property name.
+        value: Property value.
+        tick_type (str): Tick type ('major'|'minor') if the property is a tick parameter set on an axis object.
+        attribute (bool): Property is an attribute of the object (e.g. '_loc' of a legend) rather than a property with
+            a getter.
+    Returns:
+        (bool): True if the object's current value equals value.
+    """
+    is_collection = isinstance(obj, matplotlib.collections.Collection) and not(tick_type or attribute)
+    if(is_collection and prop == 'color'):
+        return all(_has_prop_value(obj, k, value) for k in ['facecolor', 'edgecolor'])
+    current = _get_prop_value(obj, prop, tick_type, attribute)
+    if(current is _MISSING):
+        return False
+    if(is_collection and prop in ['linestyle', 'linestyles']):
+        try:
+            value = matplotlib.lines._get_dash_patterns(value)
+        except (AttributeError, ValueError):
+            return False
+    if(prop in _COLOR_PROPS):
+        try:
+            return np.array_equal(matplotlib.colors.to_rgba_array(current), matplotlib.colors.to_rgba_array(value))
+        except (TypeError, ValueError):
+            pass
+    # Font families are stored as lists
+    if(isinstance(current, list) and isinstance(value, str)):
+        value = [value]
+    return values_equal(current, value)
 
 
 # PRIVATE MISCELLANEOUS FUNCTIONS ---------------------------------------
 
 
+def _submit_export(func, *args):
+    """Run export post-processing in the export thread pool, creating the pool on first use.
+    Args:
+        func (function): Function to run.
+        *args: Arguments passed to func, starting with the path of the file exported.
+    Returns:
+        (concurrent.futures.Future): Future for the result of func.
+    """
+    global _export_pool
+    with _export_lock:
+        if(_export_pool is None):
+            _export_pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        future = _export_pool.submit(func, *args)
+        _export_futures[os.path.abspath(args[0])] = future
+    future.add_done_callback(functools.partial(_finish_export_future, args[0]))
+    return future
+
+
+def _cancel_export(file_path):
+    """Cancel export post-processing pending for a file before it is written again, or wait for it to finish if it
+    has started, so that an older export can not overwrite the newer file.
+    Args:
+        file_path (str): Path of file.
+    Returns:
+        None
+    """
+    with _export_lock:
+        future = _export_futures.get(os.path.abspath(file_path))
+    if(future is not None and not(future.cancel())):
+        concurrent.futures.wait([future])
+
+
+def _finish_export_future(file_path, future):
+    """Discard a finished export future and warn if the export failed, as the future may never be waited on.
+    Args:
+        file_path (str): Path of file exported.
+        future (concurrent.futures.Future): Finished future.
+    Returns:
+        None
+    """
+    with _export_lock:
+        key = os.path.abspath(file_path)
+        if(_export_futures.get(key) is future):
+            del _export_futures[key]
+    if(not future.cancelled() and future.exception() is not None):
+        warnings.warn("Export post-processing of '{}' failed: {!r}".format(file_path, future.exception()))
+
+
+@contextlib.contextmanager
+def _render_scope(format, fig=None):
+    """Context manager routing text measurement of the renderer used for a format, and mathtext parsing, through the
+    process-wide caches while pyblish renders, and counting draws of the figure rendered. The renderer and mathtext
+    parser classes are only patched while a render scope is open in any thread.
+    Args:
+        format (str): Output format.
+        fig (matplotlib.figure.Figure): Figure rendered, whose draws are counted (see get_draw_stats), or None.
+    Returns:
+        None
+    """
+    import matplotlib.mathtext
+
+    if(fig is not None):
+        _count_draws(fig)
+    patches = [_get_render_patch(matplotlib.mathtext.MathTextParser, 'parse', _cache_mathtext_parse)]
+    if(format in _TEXT_RENDERERS):
+        module_name, class_name = _TEXT_RENDERERS[format]
+        renderer_class = getattr(importlib.import_module('matplotlib.backends.' + module_name), class_name)
+        patches.append(_get_render_patch(renderer_class, 'get_text_width_height_descent', _cache_text_metrics))
+    with contextlib.ExitStack() as stack:
+        for patch in patches:
+            stack.enter_context(patch)
+        yield
+
+
+def _get_render_patch(owner, name, make_replacement):
+    """Get the patch of a class attribute applied in render scopes, making it on first use (see _render_scope).
+    Args:
+        owner (type): Class to patch.
+        name (str): Name of attribute.
+        make_replacement (function): Called with the class and its original attribute, returning the replacement.
+    Returns:
+        (utils.patch.ScopedPatch): Patch.
+    """
+    with _render_patches_lock:
+        if(owner not in _render_patches):
+            _render_patches[owner] = ScopedPatch(owner, name, functools.partial(make_replacement, owner))
+        return _render_patches[owner]
+
+
+def _cache_text_metrics(renderer_class, measure):
+    """Make a text measurement method that uses the process-wide text extent cache, so that tick labels, axis labels
+    and legend entries repeated across figures are only measured once. Extents are cached unrotated, as that is how
+    renderers measure them, so rotation is not part of the key.
+    Args:
+        renderer_class (type): Renderer class.
+        measure (function): Original get_text_width_height_descent method of the renderer class.
+    Returns:
+        (function): Replacement get_text_width_height_descent method.
+    """
+    class_name = renderer_class.__name__
+
+    @functools.wraps(measure)
+    def get_text_width_height_descent(self, s, prop, ismath):
+        key = (class_name, s, _get_font_key(prop), ismath, getattr(self, 'dpi', None),
+               matplotlib.rcParams['text.usetex'])
+        if(ismath):
+            # Mathtext extents depend on the global mathtext fonts rather than the font properties
+            key += _get_mathtext_rc_key()
+        extent = _text_metrics_cache.get(key)
+        if(extent is None):
+            extent = measure(self, s, prop, ismath)
+            _text_metrics_cache.put(key, extent)
+        return extent
+
+    return get_text_width_height_descent
+
+
+def _cache_mathtext_parse(parser_class, parse):
+    """Make a mathtext parse method that uses the process-wide mathtext cache. Matplotlib only caches parses per parser
+    and every renderer makes its own parser, so without this the same expression is parsed and laid out again for
+    every figure.
+    Args:
+        parser_class (type): Mathtext parser class.
+        parse (function): Original parse method of the parser class.
+    Returns:
+        (function): Replacement parse method.
+    """
+    @functools.wraps(parse)
+    def parse_cached(self, s, dpi=72, prop=None, *args, **kwargs):
+        # Parses depend on the output type, global mathtext fonts and rasterization settings as well as the arguments
+        key = (getattr(self, '_output_type', getattr(self, '_output', None)), s, dpi,
+               _get_font_key(prop) if prop is not None else None,
+               _get_mathtext_rc_key(),
+               matplotlib.rcParams['text.antialiased'], matplotlib.rcParams['text.hinting'], repr(args),
+               repr(sorted(kwargs.items())))
+        result = _mathtext_cache.get(key)
+        if(result is None):
+            result = parse(self, s, dpi, prop, *args, **kwargs)
+            _mathtext_cache.put(key, result)
+        return result
+
+    return parse_cached
+
+
+def _get_mathtext_rc_key():
+    """Get hashable key of the global rcParams that mathtext is laid out with.
+    Returns:
+        (tuple): Mathtext fonts, default font style and fallback font.
+    """
+    return tuple(matplotlib.rcParams.get('mathtext.' + k) for k in ['fontset', 'rm', 'it', 'bf', 'sf', 'tt', 'cal',
+                                                                       'default', 'fallback'])
+
+
+def _get_layout_signature(fig, layout_keywords):
+    """Get hashable signature of everything that determines the tight layout solution of a figure. Text extents are
+    determined by the text and its font, so those are used rather than measuring the text.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object.
+        layout_keywords (dict): Keywords passed to tight_layout().
+    Returns:
+        (tuple): Layout signature.
+    """
+    def text_key(text):
+        return (text.get_text(), text.get_visible(), _get_font_key(text.get_fontproperties()), text.get_rotation(),
+                text.get_ha(), text.get_va())
+
+    def tick_key(ticks):
+        if not(ticks):
+            return None
+        tick = ticks[0]
+        return (tick.get_tick_padding(), tick.get_pad(), tick.tick1line.get_visible(), tick.tick2line.get_visible(),
+                tick.label1.get_visible(), tick.label2.get_visible())
+
+    axes_keys = []
+    for ax in fig.axes:
+        subplotspec = ax.get_subplotspec() if hasattr(ax, 'get_subplotspec') else None
+        axis_keys = []
+        for axis in [ax.xaxis, ax.yaxis]:
+            axis_keys.append((tuple(text_key(t) for t in axis.get_ticklabels(which='both')),
+                              tick_key(axis.get_major_ticks()), tick_key(axis.get_minor_ticks()),
+                              text_key(axis.label), axis.labelpad, axis.get_label_position(),
+                              axis.get_ticks_position(), text_key(axis.get_offset_text())))
+        spines_key = tuple((name, spine.get_visible(), repr(spine.get_position())) for name, spine in ax.spines.items())
+        titles_key = tuple(ax.get_title(loc) for loc in ['left', 'center', 'right']) + (text_key(ax.title),)
+        texts_key = tuple(text_key(t) + (t.get_position(), t.get_clip_on()) for t in ax.texts)
+        legend_key = None
+        if(ax.legend_):
+            # Legend anchor in axes coordinates so that it does not change when the layout moves the axes
+            anchor = ax.legend_.get_bbox_to_anchor().transformed(ax.transAxes.inverted())
+            legend_key = (ax.legend_._loc, tuple(np.round(anchor.bounds, 6)),
+                          tuple(text_key(t) for t in ax.legend_.get_texts()))
+        grid_key = tuple(ax.get_position().bounds)
+        if(subplotspec):
+            gridspec = subplotspec.get_gridspec()
+            grid_key = (subplotspec.get_geometry(), tuple(gridspec.get_width_ratios() or []),
+                        tuple(gridspec.get_height_ratios() or []))
+        axes_keys.append((grid_key,
+                          ax.get_visible(), tuple(axis_keys), spines_key, titles_key, texts_key, legend_key))
+    return (tuple(fig.get_size_inches()), fig.dpi, repr(sorted(layout_keywords.items())), tuple(axes_keys))
+
+
+def _save_svgz(fig, file_path, **kwargs):
+    """Save figure as gzip-compressed svg whose gzip header has no modification time or file name, which matplotlib
+    sets to the time and path of the save.
+    Args:
+        fig (matplotlib.figure.Figure): Figure to save.
+        file_path (str|file-like): Path or writable binary file object to save figure to.
+        **kwargs: Any other keyword arguments passed to savefig.
+    Returns:
+        None
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='svg', **kwargs)
+    with (open(file_path, 'wb') if isinstance(file_path, (str, os.PathLike)) else
+          contextlib.nullcontext(file_path)) as fp:
+        with gzip.GzipFile(filename='', mode='wb', fileobj=fp, mtime=0) as gzip_file:
+            gzip_file.write(buffer.getvalue())
+
+
+@contextlib.contextmanager
+def _source_date_epoch(epoch):
+    """Context manager setting the SOURCE_DATE_EPOCH environment variable, which matplotlib backends use as the
+    creation date of saved files instead of the current time. Called with the rcParams lock held.
+    Args:
+        epoch (int): Seconds since the epoch, or None to leave the environment unchanged.
+    Returns:
+        None
+    """
+    if(epoch is None):
+        yield
+        return
+    previous = os.environ.get('SOURCE_DATE_EPOCH')
+    os.environ['SOURCE_DATE_EPOCH'] = str(epoch)
+    try:
+        yield
+    finally:
+        if(previous is None):
+            del os.environ['SOURCE_DATE_EPOCH']
+        else:
+            os.environ['SOURCE_DATE_EPOCH'] = previous
+
+
+def _is_interactive_canvas(canvas):
+    """Check if a canvas shows its figure, so that a redraw request updates the display rather than rendering a figure
+    nobody sees. GUI and widget canvases require an interactive framework, and pyplot figures are shown on any canvas
+    in interactive mode.
+    Args:
+        canvas (matplotlib.backend_bases.FigureCanvasBase): Figure canvas.
+    Returns:
+        (bool): True if the canvas is interactive.
+    """
+    if(getattr(type(canvas), 'required_interactive_framework', None) is not None):
+        return True
+    return matplotlib.is_interactive() and getattr(canvas, 'manager', None) is not None
+
+
+def _count_draws(fig):
+    """Count draws of a figure in the draw statistics (see get_draw_stats). The figure's draw_event is connected once.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object.
+    Returns:
+        None
+    """
+    if(fig in _counted_figures):
+        return
+    _counted_figures.add(fig)
+
+    def count_draw(event):
+        _draw_stats['draws'] += 1
+
+    fig.canvas.mpl_connect('draw_event', count_draw)
+
+
+def _get_legends(ax):
+    """Get the axes legend followed by any additional legends added via add_artist.
+    Args:
+        ax (matplotlib.axes): Axis object.
+    Returns:
+        (list): Legend objects.
+    """
+    return [ax.legend_] + [l for l in ax.artists if isinstance(l, matplotlib.legend.Legend)]
+
+
+def _get_legend_keywords(legend, texts):
+    """Get the keywords that make a legend like an existing one.
+    Args:
+        legend (matplotlib.legend.Legend): Legend object.
+        texts (list): Texts of the entries the new legend has, whose colors are kept.
+    Returns:
+        (dict): Keywords for matplotlib.axes.Axes.legend().
+    """
+    frame = legend.get_frame()
+    title = legend.get_title()
+    # matplotlib < 3.6 stores the number of columns as _ncol
+    ncols = getattr(legend, '_ncols', getattr(legend, '_ncol', 1))
+    legend_keywords = {'loc': legend._loc, 'ncol': ncols, 'prop': legend.prop.copy(),
+                       'labelcolor': [t.get_color() for t in texts], 'markerscale': legend.markerscale,
+                       'numpoints': legend.numpoints, 'scatterpoints': legend.scatterpoints,
+                       'borderpad': legend.borderpad, 'labelspacing': legend.labelspacing,
+                       'handlelength': legend.handlelength, 'handleheight': legend.handleheight,
+                       'handletextpad': legend.handletextpad, 'borderaxespad': legend.borderaxespad,
+                       'columnspacing': legend.columnspacing, 'mode': legend._mode, 'shadow': legend.shadow,
+                       'frameon': legend.get_frame_on(),
+                       'fancybox': isinstance(frame.get_boxstyle(), matplotlib.patches.BoxStyle.Round),
+                       'facecolor': frame.get_facecolor(), 'edgecolor': frame.get_edgecolor(),
+                       'framealpha': frame.get_alpha(), 'handler_map': legend._custom_handler_map,
+                       'alignment': getattr(legend, '_alignment', 'center')}
+    if(title.get_text()):
+        legend_keywords.update(title=title.get_text(), title_fontproperties=title.get_fontproperties().copy())
+    if(legend._bbox_to_anchor is not None):
+        legend_keywords['bbox_to_anchor'] = legend.get_bbox_to_anchor()
+    return legend_keywords
+
+
+def _is_large_legend(ax, large_legend_props):
+    """Check if the axes legend has enough entries to be treated as a large legend.
+    Args:
+        ax (matplotlib.axes): Axis object.
+        large_legend_props (dict): Large legend properties.
+    Returns:
+        (bool): True if the legend has at least min_entries entries.
+    """
+    min_entries = large_legend_props.get('min_entries')
+    return bool(ax.legend_ and min_entries is not None and len(ax.legend_.texts) >= min_entries)
+
+
+def _get_style_sheet(file):
+    """Get the style of a defaults file compiled into rcParams, compiling it only when the file has changed.
+    Args:
+        file (str): Defaults file.
+    Returns:
+        (dict), (dict): rcParams, and the property groups of the style with 'master' values resolved.
+    """
+    key = (os.path.abspath(file), os.path.getmtime(file))
+    style_sheet = _style_sheet_cache.get(key)
+    if(style_sheet is None):
+        style = copy.deepcopy(get_defaults(file))
+        _set_master_defaults(style)
+        _fix_defaults(style)
+        try:
+            rc = compile_style_rc(style)
+        except ValueError as e:
+            raise InputError("Style in '{}' can not be used as a style sheet. {}".format(file, e))
+        # Fonts, mathtext fonts and dpi as pyblishify sets them
+        style['figure_style'] = _get_figure_style(style)
+        rc.update(_get_figure_rc(style['figure_style']))
+        style_sheet = (rc, style)
+        _style_sheet_cache.put(key, style_sheet)
+    return style_sheet
+
+
+def _apply_style_sheet(fig, rc, style):
+    """Apply the figure style (fonts, mathtext font, tick label formatting and dpi) and the tick and label properties
+    of a style sheet to a new figure (see make_figure).
+    Args:
+        fig (matplotlib.figure.Figure): Figure made with the rcParams of the style sheet.
+        rc (dict): rcParams of the style sheet.
+        style (dict): Property groups of the style sheet.
+    Returns:
+        None
+    """
+    fig._pyblish_style_rc = rc
+    _set_figure_style(fig, style['figure_style'])
+    label_props = dict(style['label_props'])
+    if('fontname' in label_props):
+        label_props['fontname'] = _get_system_font(label_props['fontname'])
+    for ax in fig.axes:
+        # Ticks made after the figure read the tick parameters of their axis rather than rcParams
+        _set_props([ax.xaxis, ax.yaxis], 'ticks', set_ticks='major', **style['major_tick_props'])
+        _set_props([ax.xaxis, ax.yaxis], 'ticks', set_ticks='minor', **style['minor_tick_props'])
+        _set_props([ax.xaxis.label, ax.yaxis.label], 'label', **label_props)
+        _set_formatter_props(ax, style['figure_style'])
+
+
+def _set_preview_decimation(ax, which_lines, decimate_props, preview_props):
+    """Decimate lines to the resolution of a preview. Every line is decimated if no lines are selected, in which case
+    lines that can not be decimated are skipped without warning. Lines are decimated from their original data, which
+    is restored for the final render.
+    Args:
+        ax (matplotlib.axes): Axis object.
+        which_lines (int|str|matplotlib.lines.Line2D): Line index(es) or object(s) to decimate. All lines if None.
+        decimate_props (dict): Decimation properties.
+        preview_props (dict): Preview properties.
+    Returns:
+        None
+    """
+    dpi = _get_save_dpi(ax.get_figure())
+    # The decimation budget is counted in pixels at the savefig dpi, so points per preview pixel are scaled to it
+    points_per_pixel = preview_props.get('points_per_pixel', 1.0) * preview_props.get('dpi', 72) / float(dpi)
+    decimate_props = dict(decimate_props, points_per_pixel=points_per_pixel,
+                          min_points=preview_props.get('min_points', decimate_props.get('min_points', 0)))
+    with warnings.catch_warnings():
+        if(which_lines is None):
+            warnings.simplefilter('ignore')
+        set_line_decimation(ax, 'all' if which_lines is None else which_lines, decimate_props=decimate_props)
+
+
+def _get_legend_handle_key(handle):
+    """Get hashable key of everything that affects how a legend handle is drawn.
+    Args:
+        handle (matplotlib.artist.Artist): Legend handle.
+    Returns:
+        (tuple): Handle key.
+    """
+    key = [type(handle).__name__]
+    for prop in ['color', 'linestyle', 'linewidth', 'marker', 'markersize', 'markerfacecolor', 'markeredgecolor',
+                 'facecolor', 'edgecolor', 'sizes', 'alpha', 'hatch']:
+        getter = getattr(handle, 'get_' + prop, None)
+        if(getter is not None):
+            value = getter()
+            key.append(repr(np.asarray(value).tolist()) if isinstance(value, (np.ndarray, list, tuple)) else
+                       repr(value))
+    return tuple(key)
+
+
+def _get_font_key(prop):
+    """Get hashable key identifying every font property that affects text extents.
+    Args:
+        prop (matplotlib.font_manager.FontProperties): Font properties.
+    Returns:
+        (tuple): Font properties key.
+    """
+    math_family = prop.get_math_fontfamily() if hasattr(prop, 'get_math_fontfamily') else None
+    return (tuple(prop.get_family()), prop.get_style(), prop.get_variant(), prop.get_weight(), prop.get_stretch(),
+            prop.get_size_in_points(), prop.get_file(), math_family)
+
+
+def _finish_export(file_path, fingerprint, cache, optimize):
+    """Post-process a saved figure file and store it in the render cache.
+    Args:
+        file_path (str): Path of saved figure.
+        fingerprint (str): Render fingerprint used as the cache key, or None if not caching.
+        cache (utils.cache.RenderCache): Render cache.
+        optimize (dict): PNG optimization properties, or None to skip optimization.
+    Returns:
+        (dict|None): PNG optimization statistics.
+    """
+    stats = None
+    if(optimize):
+        stats = optimize_png(file_path, **optimize)
+    if(fingerprint):
+        cache.put(fingerprint, file_path)
+    return stats
+
+
 def _fix_defaults(defaults):
 
     _fix_props(defaults['spine_props'], 'spine')
@@ -1222,6 +3041,58 @@ def _fix_props(props, prop_name):
                 props[k] = props.pop(n)
 
 
+def _to_column(values):
+    """Convert property values into a numpy array if they are numeric and of equal shape, otherwise leave as a list.
+    Args:
+        values (list): Property value for each artist.
+    Returns:
+        (numpy.ndarray|list): Property column.
+    """
+    try:
+        column = np.array(values)
+    except ValueError:
+        return list(values)
+    if(column.dtype.kind in 'biufc'):
+        return column
+    return list(values)
+
+
+def _get_fingerprint_bytes(value):
+    """Convert a property value into bytes for fingerprinting. Arrays are hashed by their raw data rather than repr,
+    which truncates large arrays.
+    Args:
+        value: Property value.
+    Returns:
+        (bytes): Byte representation of value.
+    """
+    if(isinstance(value, np.ndarray)):
+        if(np.ma.isMaskedArray(value)):
+            value = value.filled(np.nan) if value.dtype.kind == 'f' else value.filled()
+        if(value.dtype.kind == 'O'):
+            return _get_fingerprint_bytes(value.tolist())
+        return repr((value.dtype.str, value.shape)).encode('utf-8') + np.ascontiguousarray(value).tobytes()
+    if(isinstance(value, (list, tuple))):
+        return b'(' + b','.join(_get_fingerprint_bytes(v) for v in value) + b')'
+    if(hasattr(value, 'vertices')):
+        # matplotlib.path.Path
+        return _get_fingerprint_bytes(value.vertices) + _get_fingerprint_bytes(value.codes)
+    return repr(value).encode('utf-8')
+
+
+def _to_json_value(value):
+    """Convert values that are not json serializable (numpy arrays and scalars, paths etc.) into serializable values.
+    Args:
+        value: Value to convert.
+    Returns:
+        Serializable value.
+    """
+    if(isinstance(value, (np.ndarray, np.generic))):
+        return value.tolist()
+    if(isinstance(value, tuple)):
+        return list(value)
+    return str(value)
+
+
 def _write_defaults(defaults, file='defaults.json'):
     """Write default pyblish plot parameters to json file.
     Args:
@@ -1248,17 +3119,56 @@ def _add_to_parameter(list_in, addition):
         ValueError("Could not add {} to each element of list {}".format(addition, list_in))
 
 
-def _change_mathtext(texts, font):
-    if(texts):
-        for text in texts:
-            t = text.get_text()
-            if(re.match('(.+)?(\$.+\$)(.+)?', t)):
-                if not(font == get_mathtext()):
-                    warnings.warn("Text '{}' contains mathtext that can not have font changed individually. "
-                                  "Therefore the mathtext in the entire plot has been changed to {}."
-                                  "If this is not the desired outcome then either set the mathtext back to the default"
-                                  "or remove the mathtext and re-run.".format(t, font))
-                    _set_font(font, mathtext=True)
+def _request_mathtext(texts, font, mathtext_requests=None):
+    """Change the mathtext font for texts containing mathtext, or record the request if a request list is given. The
+    strings of the texts are recorded when the request is made, without the log prefix added to axis labels by
+    set_log_scale, so the log prefix does not change the mathtext font whether it is added before or after.
+    Args:
+        texts (list): Text objects.
+        font (str): Font the texts are being set to.
+        mathtext_requests (list): List to append (strings, font) to instead of changing the mathtext font.
+    Returns:
+        None
+    """
+    # The log prefix is mathtext added by pyblish, so restyling a log scaled axis does not change the mathtext font
+    request = ([_LOG_LABEL_RE.sub('', t.get_text()) for t in texts], font)
+    if(mathtext_requests is None):
+        if(texts):
+            _change_mathtext(texts[0].get_figure(root=True), [request])
+    else:
+        mathtext_requests.append(request)
+
+
+def _change_mathtext(fig, requests, default_font=None):
+    """Change the mathtext font of a figure once for a set of (strings, font) requests. The mathtext font is set for
+    the whole figure, so the font of the last request whose strings contain mathtext is used, matching the result of
+    applying the requests one at a time.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object.
+        requests (list): (strings, font) tuples in the order they were made.
+        default_font (str): Mathtext font set if no request contains mathtext, or None to leave the mathtext font
+            unchanged.
+    Returns:
+        None
+    """
+    mathtext_font = None
+    mathtext_string = None
+    for strings, font in requests:
+        # Font is None if it was not found on the system, in which case the mathtext font is left unchanged
+        if not(strings and font):
+            continue
+        for t in strings:
+            if(_MATHTEXT_RE.match(t)):
+                mathtext_font, mathtext_string = font, t
+                break
+    current_font = default_font or getattr(fig, '_pyblish_math_font', get_mathtext())
+    if(mathtext_font and not(mathtext_font == current_font)):
+        warnings.warn("Text '{}' contains mathtext that can not have font changed individually. "
+                      "Therefore the mathtext in the entire plot has been changed to {}."
+                      "If this is not the desired outcome then either set the mathtext back to the default"
+                      "or remove the mathtext and re-run.".format(mathtext_string, mathtext_font))
+    if(mathtext_font or default_font):
+        _set_math_font(fig, mathtext_font or default_font)
 
 
 def _add_label_log(ax, base, hide_base, base_precision):
@@ -1315,6 +3225,665 @@ def _bbox_to_coords(ax, bbox):
     return (coords[0][0], coords[0][1],  coords[1][0]-coords[0][0], coords[1][1]-coords[0][1])
 
 
+# FIGURE POOL -----------------------------------------------------------------------------------------------------
+
+
+class FigurePool(object):
+    """Pool of figures made by make_figure() that are reused instead of being built from scratch. Figures are pooled
+    by signature (make_figure arguments and a style name), so a reused figure keeps the styling applied to it last
+    time and restyling it with the same style skips every unchanged property (see get_style_stats). When a figure is
+    released its data artists, containers, inset axes, legends, texts, titles, label text, limits, axis inversion,
+    scales, locators, formatters, aspect, axis visibility and property cycle are reset. Figures whose structure was
+    changed while in use (e.g. axes added by a colorbar or twinx, or axes removed) are closed rather than pooled, so
+    that no state leaks between uses, e.g.
+
+        pool = FigurePool()
+        fig, ax = make_figure(1, 1, pool=pool, style='paper')
+        ax.plot(x, y)
+        pyblishify(fig, 1, save_file='figure.png')
+        pool.release(fig)
+
+    Args:
+        max_figures (int): Maximum number of idle figures kept for each signature. Extra released figures are closed.
+    """
+
+    def __init__(self, max_figures=8):
+        self.max_figures = max_figures
+        self.stats = {'created': 0, 'reused': 0, 'released': 0, 'discarded': 0}
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, rows, cols, sharex=False, sharey=False, subplot_keywords=None, gridspec_keywords=None,
+                style=None, style_sheet=False, **figure_keywords):
+        """Get an idle figure with the signature given, or make one if there are none. Arguments are as for
+        make_figure().
+        Args:
+            style (str): Name of the style the figure is styled with, so figures styled differently are not mixed.
+            style_sheet (bool|str): Defaults file the figure is made with (see make_figure).
+        Returns:
+            fig (matplotlib.figure.Figure): Figure object.
+            axes (matplotlib.axes._subplots.AxesSubplot): Axes object(s).
+        """
+        key = repr((rows, cols, sharex, sharey, sorted((subplot_keywords or {}).items()),
+                    sorted((gridspec_keywords or {}).items()), sorted(figure_keywords.items()), style, style_sheet))
+        with self._lock:
+            idle = self._idle.get(key)
+            if(idle):
+                self.stats['reused'] += 1
+                fig, axes = idle.pop()
+                fig._pyblish_pool_key = key
+                return fig, axes
+            self.stats['created'] += 1
+        fig, axes = make_figure(rows, cols, sharex, sharey, subplot_keywords, gridspec_keywords,
+                                style_sheet=style_sheet, **figure_keywords)
+        fig._pyblish_pool_key = key
+        # Axes structure and scales the figure must have to be reused
+        fig._pyblish_pool_axes = [(ax, ax.get_xscale(), ax.get_yscale()) for ax in fig.axes]
+        fig._pyblish_pool_returned = axes
+        return fig, axes
+
+    def release(self, fig):
+        """Reset a figure acquired from the pool and return it to the pool. The figure must not be used after it is
+        released.
+        Args:
+            fig (matplotlib.figure.Figure): Figure acquired from this pool.
+        Returns:
+            (bool): True if the figure was pooled, False if it was closed.
+        """
+        key = getattr(fig, '_pyblish_pool_key', None)
+        if(key is None):
+            raise InputError("Figure was not acquired from a FigurePool or has already been released.")
+        fig._pyblish_pool_key = None
+        pooled = [ax for ax, _, _ in fig._pyblish_pool_axes]
+        reusable = len(fig.axes) == len(pooled) and all(a is b for a, b in zip(fig.axes, pooled))
+        if(reusable):
+            try:
+                _reset_figure(fig)
+            except Exception:
+                reusable = False
+        with self._lock:
+            self.stats['released'] += 1
+            idle = self._idle.setdefault(key, [])
+            if(reusable and len(idle) < self.max_figures):
+                idle.append((fig, fig._pyblish_pool_returned))
+                return True
+            self.stats['discarded'] += 1
+        plt.close(fig)
+        return False
+
+    def clear(self):
+        """Close every idle figure.
+        Returns:
+            None
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for figures in idle.values():
+            for fig, _ in figures:
+                plt.close(fig)
+
+    def get_stats(self):
+        """Get pool statistics.
+        Returns:
+            (dict): Number of figures created, reused, released and discarded, and the number idle.
+        """
+        with self._lock:
+            return dict(self.stats, idle=sum(len(v) for v in self._idle.values()))
+
+
+def _reset_figure(fig):
+    """Remove everything plotted on a pooled figure and reset axes state that is not part of the figure style.
+    Args:
+        fig (matplotlib.figure.Figure): Figure object made by FigurePool.acquire().
+    Returns:
+        None
+    """
+    for artist in list(fig.texts) + list(fig.legends) + list(fig.images) + list(fig.patches) + list(fig.lines):
+        artist.remove()
+    if(getattr(fig, '_suptitle', None) is not None):
+        fig._suptitle = None
+    # State recorded by pyblishify() for the last plot: its rcParams, math font, output dpi and preview decimation
+    for attr in ['_pyblish_rc', '_pyblish_math_font', '_pyblish_dpi', '_pyblish_preview']:
+        if(attr in vars(fig)):
+            delattr(fig, attr)
+    for ax, xscale, yscale in fig._pyblish_pool_axes:
+        if(ax.legend_):
+            ax.legend_.remove()
+        # Containers (e.g. of bars or errorbars) remove their artists with them, and insets are not figure axes
+        for container in list(ax.containers):
+            container.remove()
+        for child in list(ax.child_axes):
+            child.remove()
+        for artist in (list(ax.lines) + list(ax.collections) + list(ax.patches) + list(ax.images) + list(ax.texts) +
+                       list(ax.tables) + list(ax.artists)):
+            artist.remove()
+        for loc in ['left', 'center', 'right']:
+            ax.set_title('', loc=loc)
+        ax.set_xlabel('')
+        ax.set_ylabel('')
+        # Setting the scale also restores the scale's default locators and formatters
+        ax.set_xscale(xscale)
+        ax.set_yscale(yscale)
+        ax.set_aspect('auto')
+        ax.xaxis.set_inverted(False)
+        ax.yaxis.set_inverted(False)
+        ax.set_axis_on()
+        # Restore the property cycle of the style sheet the figure was made with, if any
+        ax.set_prop_cycle(getattr(fig, '_pyblish_style_rc', {}).get('axes.prop_cycle'))
+        ax.relim()
+        ax.autoscale(True)
+        ax.set_visible(True)
+
+
+# SMALL MULTIPLES -------------------------------------------------------------------------------------------------
+
+
+class SmallMultiples(object):
+    """Grid of small multiple panels drawn into one axes. Every panel shares the same x and y limits and each series
+    is drawn in every panel by a single collection, and panel frames, ticks and tick labels are generated in bulk
+    (ticks are one marker collection with offsets), so a 20 x 20 grid is a few artists rather than 400 axes each with
+    their own ticks. Styling from the defaults file is applied once to the whole grid by pyblishify(), e.g.
+
+        grid = SmallMultiples(20, 20)
+        for i in range(400):
+            grid.plot(i, x, y[i], series=0, label='data')
+        grid.draw()
+        grid.pyblishify(2, save_file='grid.png')
+
+    Args:
+        rows (int): Number of panels vertically.
+        cols (int): Number of panels horizontally.
+        gap (float): Gap between panels as a fraction of the panel size.
+        **figure_keywords: Keywords passed to make_figure().
+    """
+
+    def __init__(self, rows, cols, gap=0.25, **figure_keywords):
+        self.rows = rows
+        self.cols = cols
+        self.gap = gap
+        self.fig, self.ax = make_figure(1, 1, **figure_keywords)
+        self.xlim = None
+        self.ylim = None
+        self.series = {'line': {}, 'marker': {}}
+        self.titles = {}
+        self.collections = {'line': {}, 'marker': {}}
+        self.frame = None
+        self.ticks = {}
+        self.tick_labels = {'x': [], 'y': []}
+        self.title_texts = []
+
+    def plot(self, panel, x, y, series=0, label=None):
+        """Add a line to a panel. Lines of the same series are drawn by one LineCollection across all panels.
+        Args:
+            panel (int|tuple): Panel index in row-major order or (row, col).
+            x (array_like): x values.
+            y (array_like): y values.
+            series (int): Series index, which sets the line style cycled from line_props.
+            label (str): Legend label of the series.
+        Returns:
+            None
+        """
+        self._add('line', panel, x, y, series, label)
+
+    def scatter(self, panel, x, y, series=0, label=None):
+        """Add markers to a panel. Markers of the same series are drawn by one PathCollection across all panels.
+        Args:
+            panel (int|tuple): Panel index in row-major order or (row, col).
+            x (array_like): x values.
+            y (array_like): y values.
+            series (int): Series index, which sets the marker style cycled from marker_props.
+            label (str): Legend label of the series.
+        Returns:
+            None
+        """
+        self._add('marker', panel, x, y, series, label)
+
+    def set_title(self, panel, title):
+        """Set the title of a panel.
+        Args:
+            panel (int|tuple): Panel index in row-major order or (row, col).
+            title (str): Title text.
+        Returns:
+            None
+        """
+        self.titles[self._get_panel(panel)] = title
+
+    def draw(self, xlim=None, ylim=None, num_ticks=4):
+        """Make the collections, frames, ticks and labels of every panel. Call once all data has been added.
+        Args:
+            xlim (tuple): Shared x limits of every panel, outside which data is clipped. Defaults to the range of all
+                data.
+            ylim (tuple): Shared y limits of every panel, outside which data is clipped. Defaults to the range of all
+                data.
+            num_ticks (int): Maximum number of ticks along each panel edge.
+        Returns:
+            fig (matplotlib.figure.Figure): Figure object.
+            ax (matplotlib.axes.Axes): Axes object all panels are drawn in.
+        """
+        ax = self.ax
+        self.xlim = xlim or self._get_data_range(1)
+        self.ylim = ylim or self._get_data_range(2)
+        cycle_colors = matplotlib.rcParams['axes.prop_cycle'].by_key().get('color', ['k'])
+        for kind, series in self.series.items():
+            for k, (data, label) in sorted(series.items()):
+                color = cycle_colors[k % len(cycle_colors)]
+                # Data is clipped to the limits, as every panel is drawn in the same axes
+                if(kind == 'line'):
+                    segments = [np.column_stack(self._to_grid(p, *clipped.T)) for p, x, y in data
+                                for clipped in clip_polyline(x, y, self.xlim, self.ylim)]
+                    collection = matplotlib.collections.LineCollection(segments, colors=color, label=label)
+                    ax.add_collection(collection, autolim=False)
+                else:
+                    xy = np.concatenate([np.column_stack(self._to_grid(p, *self._clip_points(x, y)))
+                                         for p, x, y in data])
+                    collection = ax.scatter(xy[:, 0], xy[:, 1], c=[color], label=label)
+                self.collections[kind][k] = collection
+
+        # Frame and ticks along the left and bottom edge of every panel
+        origins = np.array([self._to_grid(p, self.xlim[0], self.ylim[0]) for p in range(self.rows * self.cols)])
+        self.frame = matplotlib.collections.LineCollection(
+            [[(x0, y0 + 1), (x0, y0), (x0 + 1, y0)] for x0, y0 in origins], colors='k')
+        ax.add_collection(self.frame, autolim=False)
+        for axis_name, lim in [('x', self.xlim), ('y', self.ylim)]:
+            locs = [l for l in matplotlib.ticker.MaxNLocator(num_ticks).tick_values(*lim) if lim[0] <= l <= lim[1]]
+            frac = [(l - lim[0]) / float(lim[1] - lim[0]) for l in locs]
+            if(axis_name == 'x'):
+                offsets = [(x0 + f, y0) for x0, y0 in origins for f in frac]
+                outer = [p for p in range(self.rows * self.cols) if p // self.cols == self.rows - 1]
+            else:
+                offsets = [(x0, y0 + f) for x0, y0 in origins for f in frac]
+                outer = [p for p in range(self.rows * self.cols) if p % self.cols == 0]
+            self.ticks[axis_name] = ax.scatter(*zip(*offsets), marker='|' if axis_name == 'x' else '_',
+                                               color='k', linewidths=1.0)
+            for p in outer:
+                for l, f in zip(locs, frac):
+                    x0, y0 = origins[p]
+                    position = (x0 + f, y0) if axis_name == 'x' else (x0, y0 + f)
+                    self.tick_labels[axis_name].append(ax.text(position[0], position[1], '{:g}'.format(l),
+                                                               ha='center' if axis_name == 'x' else 'right',
+                                                               va='top' if axis_name == 'x' else 'center'))
+        for p, title in sorted(self.titles.items()):
+            x0, y0 = origins[p]
+            self.title_texts.append(ax.text(x0 + 0.5, y0 + 1, title, ha='center', va='bottom'))
+
+        # The axes itself only shows the shared axis labels
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+        ax.tick_params(which='both', bottom=False, left=False, labelbottom=False, labelleft=False)
+        ax.set_xlim(-self.gap / 2.0, self.cols * (1 + self.gap) - self.gap / 2.0)
+        ax.set_ylim(-self.gap / 2.0, self.rows * (1 + self.gap) - self.gap / 2.0)
+        if(any(label for series in self.series.values() for _, label in series.values())):
+            ax.legend()
+        return self.fig, ax
+
+    def pyblishify(self, num_cols, aspect='square', save_file=None, **kwargs):
+        """Style every panel at once with the properties from the defaults file (overridden by any passed as kwargs,
+        as for pyblishify()) and optionally save the figure.
+        Args:
+            num_cols (int): Number of columns the figure spans in the publication.
+            aspect (str|float): Figure aspect ratio (see pyblishify).
+            save_file (str): File to save the figure to if given.
+        Returns:
+            (concurrent.futures.Future|None): As returned by save_figure(), or None if not saved.
+        """
+        with _rc_lock.shared():
+            props = _load_style(['spine_props', 'label_props', 'major_tick_props', 'line_props', 'marker_props',
+                                 'text_props', 'legend_props', 'legend_text_props'], kwargs)
+            set_figure_size(self.fig, *_get_figure_size(num_cols, _get_aspect(aspect)), res_inc=2.0)
+            _set_figure_style(self.fig, props['figure_style'])
+            # Series take the properties of their series index, cycled as for lines and markers of an axes
+            for kind, prop_name in [('line', 'line_props'), ('marker', 'marker_props')]:
+                series = sorted(self.collections[kind])
+                if not(series):
+                    continue
+                series_props = {k: [get_iterable(v)[i % len(get_iterable(v))] for i in series]
+                                for k, v in props[prop_name].items()}
+                collections = [self.collections[kind][i] for i in series]
+                if(kind == 'line'):
+                    # LineCollections are not axes lines, so are set as set_line_props() sets lines
+                    _fix_props(series_props, 'line')
+                    _set_props(collections, 'line', **series_props)
+                else:
+                    set_marker_props(self.ax, collections, marker_props=series_props)
+            spine_props = {k: get_iterable(v)[0] for k, v in props['spine_props'].items()}
+            _fix_props(spine_props, 'spine')
+            _set_props([self.frame], 'spine', linewidth=spine_props.get('linewidth'),
+                       linestyle=spine_props.get('linestyle'), color=spine_props.get('edgecolor'))
+            # Tick properties given as a list are set for the x and y axes in turn
+            tick_props = dict(props['major_tick_props'])
+            _fix_props(tick_props, 'ticks')
+            tick_props = {k: map_list(list(get_iterable(v)), 2) for k, v in tick_props.items()}
+            for i, (axis_name, collection) in enumerate(sorted(self.ticks.items())):
+                axis_props = {k: v[i] for k, v in tick_props.items()}
+                direction = axis_props.get('direction', 'out')
+                marker = {'out': {'x': 3, 'y': 0}, 'in': {'x': 2, 'y': 1},
+                          'inout': {'x': '|', 'y': '_'}}[direction][axis_name]
+                marker = matplotlib.markers.MarkerStyle(marker)
+                _set_props([collection], 'ticks', paths=[[marker.get_path().transformed(marker.get_transform())]],
+                           sizes=[[axis_props.get('size', 4.0) ** 2]], linewidth=axis_props.get('width', 1.0),
+                           facecolor='none', edgecolor=spine_props.get('edgecolor'))
+                # Tick labels are offset by the tick length (if outside the panel) and pad, in points
+                pad = axis_props.get('pad', 4.0) + (axis_props.get('size', 4.0) if direction != 'in' else 0)
+                transform = matplotlib.transforms.offset_copy(self.ax.transData, self.fig,
+                                                              x=-pad if axis_name == 'y' else 0,
+                                                              y=-pad if axis_name == 'x' else 0, units='points')
+                if(self.tick_labels[axis_name]):
+                    _set_props(self.tick_labels[axis_name], 'ticks', transform=transform)
+                    set_text_props(self.ax, self.tick_labels[axis_name],
+                                   text_props={'fontsize': axis_props.get('labelsize'),
+                                               'color': axis_props.get('labelcolor')})
+            set_label_props(self.ax, 'all', label_props=props['label_props'])
+            if(self.title_texts):
+                set_text_props(self.ax, self.title_texts, text_props=props['text_props'])
+            if(self.ax.legend_):
+                set_text_props(self.ax, 'all', text_props=props['legend_text_props'], legend_texts=True)
+        if(save_file):
+            return save_figure(save_file, kwargs.pop('format', 'png'), kwargs.pop('bbox_inches', 'tight'),
+                               fig=self.fig, profile=kwargs.pop('export_profile', None))
+
+    def _add(self, kind, panel, x, y, series, label):
+        data, series_label = self.series[kind].setdefault(series, ([], None))
+        data.append((self._get_panel(panel), np.asarray(x, dtype=float), np.asarray(y, dtype=float)))
+        if(label is not None):
+            self.series[kind][series] = (data, label)
+
+    def _get_panel(self, panel):
+        if(isinstance(panel, tuple)):
+            panel = panel[0] * self.cols + panel[1]
+        if not(0 <= panel < self.rows * self.cols):
+            raise InputError("Panel {} is outside the {} x {} grid.".format(panel, self.rows, self.cols))
+        return panel
+
+    def _get_data_range(self, index):
+        values = [d[index][np.isfinite(d[index])] for series in self.series.values() for data, _ in series.values()
+                  for d in data]
+        values = [v for v in values if len(v)]
+        if not(values):
+            return (0.0, 1.0)
+        lo = min(v.min() for v in values)
+        hi = max(v.max() for v in values)
+        return (lo, hi) if hi > lo else (lo - 0.5, hi + 0.5)
+
+    def _clip_points(self, x, y):
+        """Remove points outside the shared limits of the panels."""
+        (x0, x1), (y0, y1) = sorted(self.xlim), sorted(self.ylim)
+        inside = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+        return x[inside], y[inside]
+
+    def _to_grid(self, panel, x, y):
+        """Map data values of a panel into the shared coordinates of the grid, where each panel is a unit square."""
+        row, col = divmod(panel, self.cols)
+        gx = col * (1 + self.gap) + (np.asarray(x, dtype=float) - self.xlim[0]) / float(self.xlim[1] - self.xlim[0])
+        gy = ((self.rows - 1 - row) * (1 + self.gap) +
+              (np.asarray(y, dtype=float) - self.ylim[0]) / float(self.ylim[1] - self.ylim[0]))
+        return gx, gy
+
+
+# VALIDATION FUNCTIONS ---------------------------------------------------------------------------------------------
+
+
+def validate_style(file='defaults.json', raise_errors=False, **kwargs):
+    """Check a style (defaults file plus any property overrides passed to pyblishify) before anything is rendered.
+    Every property is checked against the schema in utils.schema (which resolves colors and marker symbols), 'master'
+    values are resolved and fonts are resolved to fonts installed on the system, and every error is reported at once
+    rather than the first raising part way through styling.
+    Args:
+        file (str): Defaults file.
+        raise_errors (bool): Raise an InputError listing every error if True, otherwise return the errors.
+        **kwargs: Property overrides as passed to pyblishify (e.g. line_props={'linewidth': 2}).
+    Returns:
+        (list): Error messages. Empty if the style is valid.
+    """
+    defaults = copy.deepcopy(get_defaults(file))
+    errors = []
+    masters = defaults.get('master_defaults', {})
+    # Check property overrides refer to groups and properties that exist, as unknown ones are silently ignored
+    for group, props in kwargs.items():
+        if not(group.endswith('_props')):
+            continue
+        if not(isinstance(defaults.get(group), dict)):
+            errors.append("Unknown property group '{}'.".format(group))
+        elif not(isinstance(props, dict)):
+            errors.append("Properties of '{}' must be a dict, not {!r}.".format(group, props))
+        else:
+            errors.extend("Unknown property '{}' in '{}'. Accepted properties are '{}'."
+                          .format(k, group, "', '".join(sorted(defaults[group])))
+                          for k in props if k not in defaults[group])
+    # Check 'master' values have a master default to take, as nothing else can be resolved without them
+    master_errors = ["'{}' is set to 'master' but there is no master default for '{}'.".format(k, kk)
+                     for k, v in defaults.items() for kk, vv in (v.items() if isinstance(v, dict) else [(k, v)])
+                     if vv == 'master' and kk not in masters]
+    if(master_errors):
+        return _report_errors(errors + master_errors, raise_errors)
+
+    _set_master_defaults(defaults)
+    groups = [g for g in defaults if g in STYLE_SCHEMA]
+    style = _get_plot_properties(groups, {k: v for k, v in kwargs.items() if isinstance(v, dict)}, defaults)
+    style.update({k: defaults[k] for k in PARAMETER_SCHEMA if k in defaults})
+    for k, kind in PARAMETER_SCHEMA.items():
+        if(k in style and kind != 'font' and not(check_value(kind, style[k]))):
+            errors.append("Invalid value {!r} for '{}'. Expected {}.".format(style[k], k, kind))
+    for group in groups:
+        errors.extend(check_props(group, style[group]))
+    for name, profile in defaults.get('export_profiles', {}).items():
+        # Errors name the profile, e.g. "... in 'export_profiles.print'"
+        group = 'export_profiles.{}'.format(name)
+        errors.extend(check_props(group, profile, {group: PROFILE_SCHEMA}))
+
+    # Resolve fonts (colors are resolved by the schema check)
+    fonts = [(k, style[k]) for k in ['fontname', 'fontname_mathtext'] if k in style]
+    fonts.extend(('{}.fontname'.format(g), style[g]['fontname']) for g in groups if 'fontname' in style[g])
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for name, font in fonts:
+            for f in get_iterable(font):
+                if not(isinstance(f, str)) or _get_system_font(f) is None:
+                    errors.append("Font {!r} for '{}' not found. Use get_available_fonts() to see fonts installed on "
+                                  "this system.".format(f, name))
+    return _report_errors(errors, raise_errors)
+
+
+def validate_figure(fig, which_labels='all', which_ticks='all', which_spines=('left', 'bottom'), which_lines='all',
+                    which_markers='all', which_texts='all', which_legends='all', which_log_scales='all',
+                    which_decimations=None, which_densities=None, raise_errors=False, file='defaults.json', **kwargs):
+    """Dry run of pyblishify(). The style is validated (see validate_style) and every selector is resolved against
+    the objects of every axes in the figure, but nothing is styled or drawn. Arguments are as for pyblishify().
+    Args:
+        fig (matplotlib.figure.Figure): Figure object.
+        raise_errors (bool): Raise an InputError listing every error if True, otherwise return the errors.
+        file (str): Defaults file.
+    Returns:
+        (list): Error messages. Empty if pyblishify() would be able to select every object.
+    """
+    errors = validate_style(file, **kwargs)
+    Line2D, PathCollection = matplotlib.lines.Line2D, matplotlib.collections.PathCollection
+    axes_keys, spine_keys = ['x', 'y'], ['left', 'bottom', 'right', 'top']
+    for i, ax in enumerate(fig.axes):
+        axis_objs = {'x': ax.xaxis, 'y': ax.yaxis}
+        legends = [ax.legend_] + [l for l in ax.artists if isinstance(l, matplotlib.legend.Legend)]
+        # (selector, master objects getter, name, master object keys) in the order pyblishify selects them
+        selections = [(which_decimations, lambda: _get_master_objs(ax, 'line', Line2D, ax.lines), None),
+                      (which_spines, lambda: (ax.spines, 'spine'), spine_keys),
+                      (which_ticks, lambda: (axis_objs, 'tick'), axes_keys),
+                      (which_labels, lambda: ({'x': ax.xaxis.label, 'y': ax.yaxis.label}, 'label'), axes_keys),
+                      (which_lines, lambda: _get_master_objs(ax, 'line', Line2D, ax.lines), None),
+                      (which_markers, lambda: _get_master_objs(ax, 'marker collection', PathCollection,
+                                                               ax.collections), None),
+                      (which_densities, lambda: _get_master_objs(ax, 'marker collection', PathCollection,
+                                                                 ax.collections), None),
+                      (which_texts, lambda: _get_master_objs(ax, 'text', matplotlib.text.Text, ax.texts), None),
+                      (ax.legend_ and which_legends, lambda: (legends, 'legend'), None),
+                      (which_log_scales, lambda: (axis_objs, 'axis'), axes_keys)]
+        if(ax.legend_):
+            selections.extend([(which_lines and 'all', lambda: _get_master_objs(ax, 'line', Line2D, None, True),
+                                None),
+                               (which_markers and 'all', lambda: _get_master_objs(ax, 'marker collection',
+                                                                                  PathCollection, None, True), None),
+                               ('all', lambda: _get_master_objs(ax, 'text', matplotlib.text.Text, None, True),
+                                None)])
+        for which_objs, get_master, keys in selections:
+            if not(which_objs):
+                continue
+            try:
+                objs_master, objs_name = get_master()
+                _get_plot_objects(which_objs, True, objs_master, objs_name, keys)
+            except (InputError, AttributeError, IndexError) as e:
+                errors.append("Axes {} selection {!r}: {}".format(i, which_objs, e))
+    return _report_errors(errors, raise_errors)
+
+
+def _report_errors(errors, raise_errors):
+    if(errors and raise_errors):
+        raise InputError("{} error(s) found:\n    {}".format(len(errors), "\n    ".join(errors)))
+    return errors
+
+
+# FIGURE SPEC FUNCTIONS --------------------------------------------------------------------------------------------
+
+
+def render_figure_spec(spec, output_root=None, data_root=None):
+    """Make, plot, style and save a figure described by a json-compatible figure spec. Errors in the spec raise
+    InputError.
+    Args:
+        spec (dict): Figure spec.
+            rows (int): Number of canvases vertically. Defaults to 1.
+            cols (int): Number of canvases horizontally. Defaults to 1.
+            make_figure (dict): Any other keyword arguments for make_figure().
+            plots (list): Axes method calls, each a dict with keys:
+                ax (int): Index of axes in fig.axes. Defaults to 0.
+                call (str): Name of an axes plotting or labelling method in _SPEC_CALLS, e.g. 'plot', 'scatter',
+                    'set_xlabel', 'legend'.
+                args (list): Positional arguments.
+                kwargs (dict): Keyword arguments.
+                Data can be given inline as lists or, anywhere in args or kwargs, as a reference to a file that is
+                loaded when the figure is rendered:
+                    {"npy": "data.npy"}: .npy file, memory-mapped read-only unless "mmap": false is given.
+                    {"memmap": "data.bin", "dtype": "float64", "shape": [1000], "offset": 0}: Raw binary file.
+            pyblishify (dict): Keyword arguments for pyblishify(), including num_cols. Figure is not styled if None.
+            save_file (str): Path to save figure to. The figure is rendered to bytes and returned if None.
+            format (str): Format to save figure in. Defaults to 'png'.
+            bbox_inches (str): bbox_inches to save figure with. Defaults to 'tight'.
+            export_profile (str|dict): Export profile to save figure with (see save_figure).
+            deterministic (bool): Save byte-identical output for identical figures (see save_figure).
+            tile_height (int): Render png or tiff output in bands of this many pixel rows (see save_figure).
+            preview (bool): Style and save a quick low resolution preview rather than the final render (see
+                save_figure).
+        output_root (str): Directory save_file must be inside. Relative save_file paths are relative to it. Any path
+            can be saved to if None.
+        data_root (str): Directory data files must be inside. Relative data file paths are relative to it. Any file
+            can be read if None.
+    Returns:
+        (dict): 'save_file' with the path saved to, or 'bytes' with the rendered figure if save_file was None.
+    """
+    try:
+        fig, _ = make_figure(spec.get('rows', 1), spec.get('cols', 1), **spec.get('make_figure', {}))
+    except (TypeError, ValueError) as e:
+        raise InputError("Figure spec make_figure failed: {}".format(e))
+    try:
+        for plot in spec.get('plots', []):
+            call = plot.get('call', '')
+            if(call not in _SPEC_CALLS):
+                raise InputError("Figure spec call '{}' is not allowed. Use one of '{}'."
+                                 .format(call, "', '".join(sorted(_SPEC_CALLS))))
+            try:
+                method = getattr(fig.axes[plot.get('ax', 0)], call)
+            except (IndexError, TypeError):
+                raise InputError("Figure spec axes index {} exceeds number of axes {}."
+                                 .format(plot.get('ax', 0), len(fig.axes)))
+            args = _load_spec_data(plot.get('args', []), data_root)
+            kwargs = _load_spec_data(plot.get('kwargs', {}), data_root)
+            try:
+                method(*args, **kwargs)
+            except (AttributeError, TypeError, ValueError) as e:
+                raise InputError("Figure spec call '{}' failed: {}".format(call, e))
+
+        save_kwargs = {'format': spec.get('format', 'png'), 'bbox': spec.get('bbox_inches', 'tight'), 'fig': fig,
+                       'profile': spec.get('export_profile'), 'deterministic': spec.get('deterministic', False),
+                       'tile_height': spec.get('tile_height'), 'preview': spec.get('preview', False)}
+        if(spec.get('pyblishify') is not None):
+            # The figure is saved straight after, so is not redrawn after styling
+            pyblishify_kwargs = dict(spec['pyblishify'], preview=save_kwargs['preview'], redraw=False)
+            pyblishify(fig, pyblishify_kwargs.pop('num_cols', 1), **pyblishify_kwargs)
+        if(spec.get('save_file')):
+            save_file = _get_spec_path(spec['save_file'], output_root, 'save_file')
+            save_figure(save_file, **save_kwargs)
+            return {'save_file': save_file}
+        else:
+            return {'bytes': render_figure_bytes(**save_kwargs)}
+    finally:
+        plt.close(fig)
+
+
+def _load_spec_data(value, data_root=None):
+    """Replace data file references in figure spec arguments with the loaded arrays, recursively.
+    Args:
+        value: Figure spec argument(s).
+        data_root (str): Directory data files must be inside, or None to allow any file.
+    Returns:
+        Argument(s) with any {"npy": ...} or {"memmap": ...} references replaced by numpy arrays.
+    """
+    if(isinstance(value, dict)):
+        try:
+            if('npy' in value):
+                return np.load(_get_spec_path(value['npy'], data_root, 'data file'),
+                               mmap_mode='r' if value.get('mmap', True) else None)
+            elif('memmap' in value):
+                shape = value.get('shape')
+                return np.memmap(_get_spec_path(value['memmap'], data_root, 'data file'),
+                                 dtype=value.get('dtype', 'float64'), mode='r', offset=value.get('offset', 0),
+                                 shape=tuple(get_iterable(shape)) if shape else None)
+        except (IOError, OSError, TypeError, ValueError) as e:
+            raise InputError("Figure spec data file could not be loaded: {}".format(e))
+        return {k: _load_spec_data(v, data_root) for k, v in value.items()}
+    elif(isinstance(value, list)):
+        return [_load_spec_data(v, data_root) for v in value]
+    return value
+
+
+def _get_spec_path(path, root, name):
+    """Resolve a file path in a figure spec, checking that it is inside a root directory. Symbolic links are resolved
+    before checking, so links can not point outside the root.
+    Args:
+        path (str): File path. Relative paths are relative to root.
+        root (str): Directory the path must be inside, or None to allow any path.
+        name (str): Name of path in error messages.
+    Returns:
+        (str): Resolved path.
+    """
+    if not(isinstance(path, str)):
+        raise InputError("Figure spec {} must be a string, not '{}'.".format(name, type(path).__name__))
+    if(root is None):
+        return path
+    root = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if(os.path.commonpath([root, resolved]) != root):
+        raise InputError("Figure spec {} '{}' is outside '{}'.".format(name, path, root))
+    return resolved
+
+
+def warm_caches(file='defaults.json'):
+    """Load defaults, index system fonts and render a throwaway figure so that one-off start-up costs (font scanning,
+    font file loading, mathtext set-up) are paid before the first real figure. Used by long-lived render processes.
+    Args:
+        file (str): File where defaults are stored in json format.
+    Returns:
+        None
+    """
+    get_defaults(file)
+    get_available_fonts()
+    fig, ax = make_figure(1, 1)
+    try:
+        ax.plot([1, 10], [1, 10], label='warm')
+        ax.scatter([1, 10], [1, 10], label='warm')
+        ax.set_xlabel('$x$')
+        ax.text(2, 2, 'warm')
+        ax.legend()
+        pyblishify(fig, 1, which_legends=None)
+        render_figure_bytes(fig)
+    finally:
+        plt.close(fig)
+
+
 # PRINT FUNCTIONS --------------------------------------------------------------------------------------------------
 
 
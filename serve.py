@@ -0,0 +1,165 @@
+#!/usr/bin/python
+"""Long-lived local render daemon. Worker processes import matplotlib, load defaults, index fonts and render a warm-up
+figure once at start-up, so every request is served with warm caches.
+
+Usage:
+    python serve.py [--port 8765 | --socket /tmp/pyblish.sock] [--workers N] [--output-root DIR] [--data-root DIR]
+
+POST a json figure spec (see pyblish.render_figure_spec) to /render. If the spec has a save_file the figure is saved
+there and a json status is returned, otherwise the rendered image is returned in the response body. Files are only
+saved inside the output root and data files only read from inside the data root (both the working directory by
+default). Invalid specs return 400 and render failures 500.
+"""
+
+# Import built-ins
+import argparse
+import concurrent.futures
+import concurrent.futures.process
+import http.server
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+
+# Import externals
+import pyblish
+
+# Content types of rendered formats returned in response bodies
+_CONTENT_TYPES = {'png': 'image/png', 'pdf': 'application/pdf', 'svg': 'image/svg+xml', 'eps': 'application/postscript',
+                  'ps': 'application/postscript', 'jpg': 'image/jpeg', 'jpeg': 'image/jpeg', 'tif': 'image/tiff',
+                  'tiff': 'image/tiff'}
+
+
+class RenderHandler(http.server.BaseHTTPRequestHandler):
+    """Handle render requests by passing figure specs to the server worker pool."""
+
+    def do_POST(self):
+        if(self.path != '/render'):
+            self._send_json(404, {'status': 'error', 'error': "Unknown path '{}'. Use /render.".format(self.path)})
+            return
+        start = time.time()
+        try:
+            try:
+                spec = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8'))
+            except ValueError as e:
+                # Invalid Content-Length, utf-8 or json
+                raise pyblish.InputError(str(e))
+            if not(isinstance(spec, dict)):
+                raise pyblish.InputError("Figure spec must be a json object.")
+            result = self._render(spec)
+        except pyblish.InputError as e:
+            self._send_json(400, {'status': 'error', 'error': '{}: {}'.format(type(e).__name__, e)})
+            return
+        except Exception as e:
+            self._send_json(500, {'status': 'error', 'error': '{}: {}'.format(type(e).__name__, e)})
+            return
+        if('bytes' in result):
+            self.send_response(200)
+            self.send_header('Content-Type', _CONTENT_TYPES.get(spec.get('format', 'png'), 'application/octet-stream'))
+            self.send_header('Content-Length', str(len(result['bytes'])))
+            self.send_header('X-Render-Seconds', '{:.4f}'.format(time.time() - start))
+            self.end_headers()
+            self.wfile.write(result['bytes'])
+        else:
+            self._send_json(200, {'status': 'ok', 'save_file': result['save_file'], 'seconds': time.time() - start})
+
+    def do_GET(self):
+        if(self.path == '/health'):
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'status': 'error', 'error': "Unknown path '{}'. Use /health.".format(self.path)})
+
+    def _render(self, spec):
+        pool = self.server.pool
+        try:
+            return pool.submit(pyblish.render_figure_spec, spec, self.server.output_root,
+                               self.server.data_root).result()
+        except concurrent.futures.process.BrokenProcessPool:
+            # A worker died (e.g. it was killed or ran out of memory) and the pool can not be used again. The first
+            # request to find the pool broken replaces it, and this request fails rather than being retried in case
+            # it killed the worker
+            with self.server.pool_lock:
+                if(self.server.pool is pool):
+                    self.server.pool = _make_pool(self.server.workers)
+                    pool.shutdown(wait=False)
+            raise
+
+    def address_string(self):
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if self.client_address else self.server.server_address
+
+    def _send_json(self, code, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(port=8765, socket_path=None, workers=None, output_root=None, data_root=None):
+    """Make render server with a pool of warmed worker processes.
+    Args:
+        port (int): localhost port to listen on. Ignored if socket_path is given.
+        socket_path (str): Path of Unix socket to listen on instead of a localhost port.
+        workers (int): Number of worker processes. Defaults to the number of CPUs.
+        output_root (str): Directory figures can be saved in. Defaults to the working directory.
+        data_root (str): Directory data files can be read from. Defaults to the working directory.
+    Returns:
+        (socketserver.BaseServer): Server with a 'pool' attribute holding the worker pool.
+    """
+    if(socket_path):
+        if(os.path.exists(socket_path)):
+            os.remove(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, RenderHandler)
+    else:
+        server = ThreadingHTTPServer(('127.0.0.1', port), RenderHandler)
+    server.output_root = os.path.abspath(output_root or os.getcwd())
+    server.data_root = os.path.abspath(data_root or os.getcwd())
+    server.workers = workers or os.cpu_count() or 1
+    server.pool = _make_pool(server.workers)
+    server.pool_lock = threading.Lock()
+    # Keep every worker busy briefly so that all of them are started and warmed before the first request
+    list(server.pool.map(time.sleep, [0.1] * server.workers))
+    return server
+
+
+def _make_pool(workers):
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=pyblish.warm_caches)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve pyblish figure renders from warm worker processes.")
+    parser.add_argument('--port', type=int, default=8765, help="localhost port to listen on")
+    parser.add_argument('--socket', default=None, help="Unix socket path to listen on instead of a port")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes")
+    parser.add_argument('--output-root', default=None,
+                        help="directory figures can be saved in (default: working directory)")
+    parser.add_argument('--data-root', default=None,
+                        help="directory data files can be read from (default: working directory)")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.port, args.socket, args.workers, args.output_root, args.data_root)
+    sys.stderr.write("pyblish render server listening on {}\n"
+                     .format(args.socket or 'http://127.0.0.1:{}'.format(args.port)))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
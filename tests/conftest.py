@@ -0,0 +1,18 @@
+import os
+import sys
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def isolated_figures(monkeypatch):
+    # Defaults are read from defaults.json relative to the working directory
+    monkeypatch.chdir(ROOT)
+    with matplotlib.rc_context():
+        yield
+    plt.close('all')
@@ -0,0 +1,26 @@
+import os
+import matplotlib.pyplot as plt
+import pyblish
+from utils.cache import RenderCache
+
+
+def make_plot(color):
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1], color=color)
+    return fig
+
+
+def test_cached_file_is_not_changed_by_later_saves_to_output(tmp_path):
+    cache = RenderCache(str(tmp_path / 'cache'))
+    output = str(tmp_path / 'figure.png')
+    pyblish.save_figure(output, fig=make_plot('red'), cache=cache)
+    red = open(output, 'rb').read()
+    pyblish.save_figure(output, fig=make_plot('blue'), cache=cache)
+    blue = open(output, 'rb').read()
+    assert red != blue
+    assert cache.get_stats()['stores'] == 2
+    # Red is served from the cache and must not have been overwritten by the blue render
+    pyblish.save_figure(output, fig=make_plot('red'), cache=cache)
+    assert cache.get_stats()['hits'] == 1
+    assert open(output, 'rb').read() == red
+    assert os.stat(output).st_nlink == 1
@@ -0,0 +1,20 @@
+import pytest
+from utils.lrucache import register_cache, get_cache_stats, clear_caches
+import pyblish
+
+
+def test_caches_are_registered_by_name():
+    cache = register_cache('test_registry', maxsize=2)
+    assert register_cache('test_registry') is cache
+    cache.put('a', 1)
+    cache.get('a')
+    cache.get('b')
+    stats = get_cache_stats()
+    assert {'text_metrics', 'test_registry'} <= set(stats)
+    assert stats['test_registry']['hits'] == 1 and stats['test_registry']['misses'] == 1
+    clear_caches('test_registry')
+    assert get_cache_stats('test_registry')['size'] == 0
+    with pytest.raises(ValueError):
+        get_cache_stats('unknown')
+    with pytest.raises(ValueError):
+        clear_caches('unknown')
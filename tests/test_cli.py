@@ -0,0 +1,30 @@
+import io
+import json
+import multiprocessing
+import os
+import signal
+import cli
+
+
+def make_line(tmp_path, i):
+    return json.dumps({'id': i, 'save_file': str(tmp_path / '{}.png'.format(i)),
+                       'plots': [{'call': 'plot', 'args': [[1, 2, 3], [1, 4, 9]]}]})
+
+
+def test_render_stream_recovers_from_killed_worker(tmp_path):
+    def lines():
+        yield make_line(tmp_path, 0)
+        yield make_line(tmp_path, 1)
+        # Kill the workers while specs are pending - they are rendered again by a new pool
+        for process in multiprocessing.active_children():
+            os.kill(process.pid, signal.SIGKILL)
+        yield make_line(tmp_path, 2)
+        yield 'not json'
+
+    output = io.StringIO()
+    failed = cli.render_stream(lines(), output, workers=1)
+    statuses = {s['line']: s for s in map(json.loads, output.getvalue().splitlines())}
+    assert failed == 1
+    assert sorted(statuses) == [1, 2, 3, 4]
+    assert [statuses[i]['status'] for i in [1, 2, 3]] == ['ok', 'ok', 'ok']
+    assert all((tmp_path / '{}.png'.format(i)).exists() for i in range(3))
@@ -0,0 +1,88 @@
+import numpy as np
+import pyblish
+from utils.decimation import *
+
+
+def make_line_plot(x):
+    fig, ax = pyblish.make_figure(1, 1)
+    ax.plot(x, np.sin(np.log10(x) * 20), label='a')
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+    ax.text(2, 0, 'note')
+    return fig, ax
+
+
+def test_lttb_keeps_end_points_and_budget():
+    x = np.linspace(0, 1, 100000)
+    y = np.random.default_rng(0).normal(size=len(x))
+    xd, yd = lttb(x, y, 500)
+    assert len(xd) <= 500
+    assert (xd[0], xd[-1]) == (x[0], x[-1])
+    assert np.all(np.isin(yd, y))
+
+
+def test_decimation_buckets_log_x_in_scaled_coordinates(tmp_path):
+    # Linearly sampled data on a log axis - index buckets would merge the lowest decades into a single point
+    x = np.linspace(1, 1e6, 1000000)
+    fig, ax = make_line_plot(x)
+    pyblish.pyblishify(fig, 1, which_markers=None, which_decimations='all', which_log_scales='x')
+    line_x = ax.lines[0].get_xdata()
+    assert ax.get_xscale() == 'log'
+    assert len(line_x) < 10000
+    # Every point in the first two decades is wider than a bucket and so is kept
+    assert np.count_nonzero(line_x < 100) == 99
+    pyblish.restore_line_data(ax)
+    assert len(ax.lines[0].get_xdata()) == len(x)
+
+
+def test_minmax_envelope_chunked_keeps_end_points():
+    y = np.column_stack([np.sin(np.linspace(0, 20, 100001)), np.linspace(1, 0, 100001)])
+    y[-1, 0] = np.nan
+    for keep in minmax_envelope_chunked(y, 100, chunk_size=7919):
+        assert (keep[0], keep[-1]) == (0, len(y) - 1)
+        assert len(keep) <= 202
+
+
+def test_final_save_after_preview_restores_line_data(tmp_path):
+    x = np.linspace(1, 100, 200000)
+    fig, ax = make_line_plot(x)
+    pyblish.pyblishify(fig, 1, which_markers=None, which_log_scales=None, preview=True)
+    assert len(ax.lines[0].get_xdata()) < len(x)
+    pyblish.save_figure(str(tmp_path / 'figure.png'), fig=fig, bbox=None)
+    assert len(ax.lines[0].get_xdata()) == len(x)
+    assert not fig._pyblish_preview
+
+
+def test_plot_line_source_reads_npy_within_pixel_budget(tmp_path):
+    file_path = str(tmp_path / 'y.npy')
+    y = np.column_stack([np.sin(np.linspace(0, 50, 1000000)), np.linspace(0, 1, 1000000)])
+    np.save(file_path, y)
+    fig, ax = pyblish.make_figure(1, 1)
+    collection = pyblish.plot_line_source(ax, file_path, chunk_size=65536)
+    segments = collection.get_segments()
+    assert len(segments) == 2
+    width = pyblish._get_output_pixel_width(fig)
+    for i, segment in enumerate(segments):
+        assert len(segment) <= 2 * width + 2
+        assert (segment[0, 0], segment[-1, 0]) == (0, len(y) - 1)
+        assert np.isclose(segment[:, 1].max(), y[:, i].max()) and np.isclose(segment[:, 1].min(), y[:, i].min())
+
+
+def test_plot_line_source_budget_allows_for_pyblishify_resize():
+    y = np.sin(np.linspace(0, 2000, 1000000))
+    fig, ax = pyblish.make_figure(1, 1)
+    segment = pyblish.plot_line_source(ax, y, num_cols=1).get_segments()[0]
+    pyblish.set_figure_size(fig, *pyblish._get_figure_size(1, 1.0), res_inc=2.0)
+    # The envelope has two points for each bucket of the final axes width
+    assert len(segment) >= 2 * pyblish._get_axes_pixel_size(ax)[0]
+
+
+def test_plot_line_source_buckets_by_log_x():
+    x = np.linspace(1, 1000, 1000000)
+    y = np.sin(np.log10(x) * 50)
+    fig, ax = pyblish.make_figure(1, 1)
+    ax.set_xscale('log')
+    segment = pyblish.plot_line_source(ax, y, x=x, num_cols=1).get_segments()[0]
+    # Each decade gets the same share of points, rather than the last decade getting 90%
+    counts = np.histogram(np.log10(segment[:, 0]), bins=3, range=(0, 3))[0]
+    assert counts.min() > 0.9 * counts.max()
@@ -0,0 +1,55 @@
+import warnings
+import numpy as np
+import matplotlib
+import pyblish
+
+
+def make_scatter_plot(x, y):
+    fig, ax = pyblish.make_figure(1, 1)
+    ax.scatter(x, y, label='a')
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+    ax.text(2, 2, 'note')
+    return fig, ax
+
+
+def test_density_bins_log_axes_in_scaled_coordinates(tmp_path):
+    rng = np.random.default_rng(0)
+    x = 10 ** rng.uniform(0, 4, 20000)
+    y = 10 ** rng.uniform(0, 4, 20000)
+    # Non-positive values can not be shown on log axes and must not stretch the binned extent
+    x[:100] = 0
+    y[100:200] = -1
+    fig, ax = make_scatter_plot(x, y)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        pyblish.pyblishify(fig, 1, which_lines=None, which_densities='all', density_props={'min_points': 1000},
+                           save_file=str(tmp_path / 'figure.png'))
+    mesh = ax.collections[0]._pyblish_density_image
+    assert isinstance(mesh, matplotlib.collections.QuadMesh)
+    counts = mesh.get_array()
+    assert counts.sum() == 19800
+    # Bins have equal widths in log10 of the data
+    widths = np.diff(np.log10(mesh.get_coordinates()[0, :, 0]))
+    assert np.allclose(widths, widths[0])
+    pyblish.restore_marker_data(ax)
+    assert len(ax.collections[0].get_offsets()) == 20000
+
+
+def test_density_linear_axes_uses_image():
+    rng = np.random.default_rng(0)
+    fig, ax = make_scatter_plot(rng.normal(size=5000), rng.normal(size=5000))
+    pyblish.pyblishify(fig, 1, which_lines=None, which_log_scales=None, which_densities='all',
+                       density_props={'min_points': 1000})
+    image = ax.collections[0]._pyblish_density_image
+    assert isinstance(image, matplotlib.image.AxesImage)
+    assert image.get_array().sum() == 5000
+
+
+def test_density_skips_markers_without_colors():
+    fig, ax = pyblish.make_figure(1, 1)
+    rng = np.random.default_rng(0)
+    scatter = ax.scatter(rng.uniform(size=2000), rng.uniform(size=2000), facecolors='none', edgecolors='none')
+    pyblish.set_marker_density(ax, 'all', {'min_points': 1000})
+    assert len(scatter.get_offsets()) == 2000
+    assert not hasattr(scatter, '_pyblish_density_image')
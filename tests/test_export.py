@@ -0,0 +1,126 @@
+import gzip
+import json
+import os
+import concurrent.futures
+import warnings
+import numpy as np
+import matplotlib.pyplot as plt
+import pytest
+from PIL import Image
+import pyblish
+from utils.optimize import optimize_png
+
+
+def make_plot():
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1], color='red')
+    return fig
+
+
+def test_optimized_png_has_identical_pixels(tmp_path):
+    output = str(tmp_path / 'figure.png')
+    fig = make_plot()
+    fig.savefig(output)
+    before = np.asarray(Image.open(output).convert('RGBA'))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        pyblish.save_figure(output, fig=fig, bbox=None, optimize=True).result()
+    assert np.array_equal(np.asarray(Image.open(output).convert('RGBA')), before)
+
+
+def test_finished_exports_are_discarded(tmp_path):
+    futures = [pyblish.save_figure(str(tmp_path / '{}.png'.format(i)), fig=make_plot(), optimize=True)
+               for i in range(3)]
+    assert len(pyblish.wait_for_exports()) <= 3
+    assert all(f.done() for f in futures)
+    assert not pyblish._export_futures
+
+
+def test_failed_export_warns(tmp_path):
+    future = concurrent.futures.Future()
+    pyblish._export_futures[os.path.abspath('figure.png')] = future
+    future.set_exception(OSError('disk full'))
+    with pytest.warns(UserWarning, match="'figure.png' failed: OSError"):
+        pyblish._finish_export_future('figure.png', future)
+    assert future not in pyblish._export_futures.values()
+
+
+def test_optimizing_same_path_concurrently_uses_separate_temporary_files(tmp_path):
+    output = str(tmp_path / 'figure.png')
+    make_plot().savefig(output)
+    before = np.asarray(Image.open(output).convert('RGBA'))
+    with concurrent.futures.ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda _: optimize_png(output), range(8)))
+    assert np.array_equal(np.asarray(Image.open(output).convert('RGBA')), before)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['figure.png']
+
+
+def test_saving_same_path_again_supersedes_pending_export(tmp_path):
+    output = str(tmp_path / 'figure.png')
+    first = pyblish.save_figure(output, fig=make_plot(), bbox=None, optimize=True)
+    fig = make_plot()
+    fig.axes[0].plot([0, 1], [1, 0], color='blue')
+    second = pyblish.save_figure(output, fig=fig, bbox=None, optimize=True)
+    # The first export was cancelled or had finished before the second save, so the file is the second figure
+    assert first.cancelled() or first.done()
+    second.result()
+    pixels = np.asarray(Image.open(output).convert('RGB'))
+    assert ((pixels[..., 2] > 200) & (pixels[..., 0] < 50)).any()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['figure.png']
+
+
+def test_invalid_export_profile_error_names_profile(tmp_path):
+    defaults = pyblish.get_defaults()
+    defaults = dict(defaults, export_profiles=dict(defaults['export_profiles'], broken={'dpi': 'high'}))
+    file_path = str(tmp_path / 'defaults.json')
+    with open(file_path, 'w') as fp:
+        json.dump(defaults, fp)
+    errors = pyblish.validate_style(file_path)
+    assert any("'export_profiles.broken'" in e for e in errors)
+    assert not any('export_profiles.print' in e for e in errors)
+
+
+def test_deterministic_svgz_has_fixed_gzip_header(tmp_path):
+    outputs = []
+    for name in ['a.svgz', 'b.svgz']:
+        pyblish.save_figure(str(tmp_path / name), 'svgz', fig=make_plot(), deterministic=True)
+        outputs.append((tmp_path / name).read_bytes())
+    assert outputs[0] == outputs[1]
+    assert outputs[0][4:8] == b'\x00\x00\x00\x00'
+    assert b'<dc:date>' not in gzip.decompress(outputs[0])
+
+
+def test_render_figure_bytes_matches_saved_file(tmp_path):
+    output = str(tmp_path / 'figure.png')
+    fig = make_plot()
+    pyblish.save_figure(output, fig=fig, bbox=None)
+    assert pyblish.render_figure_bytes(fig, bbox=None) == open(output, 'rb').read()
+    buffer = pyblish.get_figure_buffer(fig)
+    width, height = fig.canvas.get_width_height()
+    assert buffer.shape == (height, width, 4)
+    assert np.shares_memory(buffer, pyblish.get_figure_buffer(fig, draw=False))
+
+
+def make_polar_plot():
+    fig = plt.figure()
+    ax = fig.add_subplot(projection='polar')
+    theta = np.linspace(0, 2 * np.pi, 200)
+    ax.plot(theta, 1 + np.sin(5 * theta))
+    ax.bar(theta[::20], 1, width=0.2, hatch='//', alpha=0.5)
+    ax.set_title(r'$\frac{a}{b}$ title')
+    return fig
+
+
+def read_pixels(file_path):
+    with Image.open(file_path) as image:
+        return np.asarray(image.convert('RGBA'))
+
+
+@pytest.mark.parametrize('format', ['png', 'tiff'])
+@pytest.mark.parametrize('bbox', [None, 'tight'])
+def test_tiled_output_matches_single_pass_render(tmp_path, format, bbox):
+    fig = make_polar_plot()
+    full, tiled = [str(tmp_path / '{}.{}'.format(k, format)) for k in ['full', 'tiled']]
+    pyblish.save_figure(full, format, bbox=bbox, fig=fig)
+    pyblish.save_figure(tiled, format, bbox=bbox, fig=fig, tile_height=37)
+    assert np.array_equal(read_pixels(full), read_pixels(tiled))
@@ -0,0 +1,15 @@
+import pyblish
+from utils.lrucache import get_cache_stats, clear_caches
+from test_pyblishify import make_plot
+
+
+def test_layout_is_reused_for_identical_figures():
+    clear_caches('layout')
+    fig_1, _ = make_plot()
+    fig_2, _ = make_plot()
+    assert not(pyblish.set_layout(fig_1))
+    assert pyblish.set_layout(fig_2)
+    assert fig_2.subplotpars.left == fig_1.subplotpars.left
+    assert get_cache_stats('layout')['hits'] == 1
+    fig_2.axes[0].set_xlabel('a much longer x label')
+    assert not(pyblish.set_layout(fig_2))
@@ -0,0 +1,39 @@
+import numpy as np
+import matplotlib.colors
+import pyblish
+from test_mathtext import FONT_PROPS
+
+
+def make_ensemble(n=60, **legend_keywords):
+    fig, ax = pyblish.make_figure(1, 1)
+    x = np.linspace(1, 10, 20)
+    for i in range(n):
+        ax.plot(x, x + i, color='k', label='ensemble')
+    ax.plot(x, x, color='r', label='mean')
+    ax.legend(**legend_keywords)
+    return fig, ax
+
+
+def test_deduplicated_legend_keeps_legend_keywords():
+    fig, ax = make_ensemble(title='runs', fontsize=7, title_fontsize=9, markerscale=2, frameon=False, shadow=True,
+                            labelcolor='b', loc='upper left')
+    assert pyblish.deduplicate_legend(ax) == 59
+    legend = ax.legend_
+    assert [t.get_text() for t in legend.texts] == ['ensemble', 'mean']
+    assert legend.get_title().get_text() == 'runs' and legend.get_title().get_fontsize() == 9
+    assert legend.texts[0].get_fontsize() == 7
+    assert legend.markerscale == 2 and not legend.get_frame_on() and legend.shadow
+    assert matplotlib.colors.same_color(legend.texts[1].get_color(), 'b')
+    assert legend._loc == 2
+
+
+def test_large_legend_is_not_deduplicated_when_legends_are_not_styled():
+    fig, ax = make_ensemble()
+    pyblish.pyblishify(fig, 1, which_legends=None, which_markers=None, which_texts=None, **FONT_PROPS)
+    assert len(ax.legend_.texts) == 61
+
+
+def test_legend_columns_are_set_for_matplotlib_legends():
+    fig, ax = make_ensemble(n=2)
+    pyblish.set_legend_props(ax, 'all', legend_props={'ncol': 3})
+    assert ax.legend_._ncols == 3
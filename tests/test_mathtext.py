@@ -0,0 +1,37 @@
+import warnings
+import matplotlib
+import pyblish
+from test_pyblishify import make_plot
+
+FONT_PROPS = {'label_props': {'fontname': 'DejaVu Sans'}, 'text_props': {'fontname': 'DejaVu Sans'},
+              'legend_text_props': {'fontname': 'DejaVu Sans'}}
+
+
+def test_log_label_prefix_does_not_change_mathtext_font():
+    fig, ax = make_plot()
+    with warnings.catch_warnings():
+        warnings.filterwarnings('error', message='.*contains mathtext')
+        pyblish.pyblishify(fig, 1, **FONT_PROPS)
+    assert ax.get_xlabel().startswith('$\\mathrm{log_{10}}$')
+    assert ax.xaxis.label.get_fontproperties().get_math_fontfamily() == 'stixsans'
+    assert fig._pyblish_rc == {}
+
+
+def test_mathtext_in_label_changes_mathtext_font():
+    fig, ax = make_plot()
+    ax.set_xlabel('$x$')
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        pyblish.pyblishify(fig, 1, which_log_scales=None, **FONT_PROPS)
+    assert any('contains mathtext' in str(w.message) for w in caught)
+    assert ax.xaxis.label.get_fontproperties().get_math_fontfamily() == 'custom'
+    assert fig._pyblish_rc['mathtext.rm'] == 'DejaVu Sans'
+    assert matplotlib.rcParams['mathtext.rm'] != 'DejaVu Sans'
+
+
+def test_mathtext_cache_key_includes_default_and_fallback():
+    with matplotlib.rc_context({'mathtext.default': 'it'}):
+        italic = pyblish._get_mathtext_rc_key()
+    with matplotlib.rc_context({'mathtext.fallback': 'stix'}):
+        stix = pyblish._get_mathtext_rc_key()
+    assert len({italic, stix, pyblish._get_mathtext_rc_key()}) == 3
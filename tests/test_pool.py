@@ -0,0 +1,53 @@
+import numpy as np
+import pyblish
+
+
+def reuse(plot):
+    pool = pyblish.FigurePool()
+    fig, ax = pyblish.make_figure(1, 1, pool=pool)
+    plot(ax)
+    assert pool.release(fig)
+    reused, reused_ax = pyblish.make_figure(1, 1, pool=pool)
+    assert reused is fig and reused_ax is ax
+    return ax
+
+
+def test_reuse_after_bar_plot_removes_containers():
+    ax = reuse(lambda ax: ax.bar([1, 2, 3], [3, 1, 2]))
+    assert ax.containers == [] and len(ax.patches) == 0
+    ax.bar([1, 2], [1, 2])
+    assert len(ax.containers) == 1
+
+
+def test_reuse_after_inset_removes_inset_axes():
+    ax = reuse(lambda ax: ax.inset_axes([0.5, 0.5, 0.4, 0.4]).plot([1, 2], [1, 2]))
+    assert ax.child_axes == []
+
+
+def test_reuse_after_inverted_axis_plot_resets_axes():
+    def plot(ax):
+        ax.plot(np.arange(5), np.arange(5))
+        ax.invert_xaxis()
+        ax.invert_yaxis()
+        ax.set_axis_off()
+
+    ax = reuse(plot)
+    ax.plot([0, 1], [0, 1])
+    assert not ax.xaxis_inverted() and not ax.yaxis_inverted()
+    assert ax.axison
+    assert ax.get_xlim()[0] < ax.get_xlim()[1]
+
+
+def test_reuse_after_pyblishify_removes_figure_state():
+    from test_mathtext import FONT_PROPS
+
+    def plot(ax):
+        ax.plot(np.arange(5000), np.sin(np.arange(5000)), label='a')
+        ax.set_xlabel('x')
+        ax.set_ylabel('y')
+        pyblish.pyblishify(ax.get_figure(), 1, preview=True, which_markers=None, which_texts=None, **FONT_PROPS)
+
+    ax = reuse(plot)
+    fig = ax.get_figure()
+    for attr in ['_pyblish_rc', '_pyblish_preview', '_pyblish_math_font', '_pyblish_dpi']:
+        assert not hasattr(fig, attr)
@@ -0,0 +1,95 @@
+import json
+import numpy as np
+import matplotlib
+import pyblish
+
+
+def make_plot():
+    fig, ax = pyblish.make_figure(1, 1)
+    x = np.linspace(1, 100, 50)
+    ax.plot(x, x ** 2, label='a')
+    ax.plot(x, x, label='b')
+    ax.scatter(x, x, label='c')
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+    ax.text(2, 2, 'note')
+    ax.legend()
+    return fig, ax
+
+
+def test_make_figure_returns_single_axes():
+    fig, ax = pyblish.make_figure(1, 1)
+    assert isinstance(ax, matplotlib.axes.Axes)
+    fig, axes = pyblish.make_figure(2, 3)
+    assert axes.shape == (2, 3)
+
+
+def test_pyblishify_applies_defaults(tmp_path):
+    fig, ax = make_plot()
+    pyblish.pyblishify(fig, 1, save_file=str(tmp_path / 'figure.png'))
+    assert (tmp_path / 'figure.png').stat().st_size > 0
+    assert [l.get_color() for l in ax.lines] == ['red', 'green']
+    assert [l.get_linewidth() for l in ax.lines] == [1.5, 1.5]
+    assert ax.xaxis.label.get_fontsize() == 20.0
+    assert ax.get_xscale() == 'log' and ax.get_yscale() == 'log'
+    assert ax.get_xlabel().startswith('$\\mathrm{log_{10}}$')
+
+
+def test_restyling_skips_every_property(tmp_path):
+    fig, ax = make_plot()
+    pyblish.pyblishify(fig, 1, save_file=str(tmp_path / 'first.png'))
+    pyblish.reset_style_stats()
+    pyblish.pyblishify(fig, 1, save_file=str(tmp_path / 'second.png'))
+    stats = pyblish.get_style_stats()
+    assert stats['applied'] == 0
+    assert stats['skipped'] > 0
+
+
+def test_restyling_compares_against_applied_record():
+    fig, ax = make_plot()
+    text = ax.text(0, 0, 'a')
+    pyblish._set_props([text], 'text', fontsize='large')
+    # The font size reads back as points so only the record shows 'large' was applied
+    assert text.get_fontsize() != 'large'
+    pyblish.reset_style_stats()
+    pyblish._set_props([text], 'text', fontsize='large')
+    assert pyblish.get_style_stats() == {'applied': 0, 'skipped': 1}
+    # Values changed since they were applied are applied again
+    text.set_fontsize(30)
+    pyblish._set_props([text], 'text', fontsize='large')
+    assert pyblish.get_style_stats() == {'applied': 1, 'skipped': 1}
+    assert text.get_fontsize() != 30
+
+
+def test_figure_props_snapshot_identifies_styling():
+    snapshots = []
+    for _ in range(2):
+        fig, ax = make_plot()
+        snapshots.append(pyblish.get_figure_props(fig))
+    lines = snapshots[0]['line']
+    assert list(lines['axes']) == [0, 0] and list(lines['index']) == [0, 1]
+    assert isinstance(lines['linewidth'], np.ndarray)
+    assert np.array_equal(lines['color'], [l.get_color() for l in ax.lines])
+    assert list(snapshots[0]['label']['text']) == ['x', 'y']
+    assert json.loads(pyblish.figure_props_to_json(snapshots[0]))['text']['text'] == ['note']
+    fingerprints = [pyblish.get_figure_props_fingerprint(s) for s in snapshots]
+    assert fingerprints[0] == fingerprints[1]
+    ax.lines[0].set_linewidth(5)
+    assert pyblish.get_figure_props_fingerprint(pyblish.get_figure_props(fig)) != fingerprints[0]
+
+
+def test_log_axis_ticks_stay_in_budget(tmp_path):
+    fig, ax = pyblish.make_figure(1, 1)
+    ax.plot([1e-30, 1e30], [1, 2])
+    ax.set_xscale('log')
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+    pyblish.pyblishify(fig, 1, which_log_scales=['x'], which_markers=None, which_texts=None, which_legends=None,
+                       save_file=str(tmp_path / 'figure.png'))
+    vmin, vmax = ax.get_xlim()
+    major = ax.xaxis.get_major_locator().tick_values(vmin, vmax)
+    minor = ax.xaxis.get_minor_locator().tick_values(vmin, vmax)
+    assert len(major) <= 15
+    assert len(minor) <= 60
+    assert len(ax.xaxis.get_minor_ticks()) <= 60
+
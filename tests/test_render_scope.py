@@ -0,0 +1,68 @@
+import matplotlib.mathtext
+import matplotlib.figure
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import RendererAgg
+import pyblish
+from utils.patch import ScopedPatch
+
+
+def make_plot():
+    fig, ax = plt.subplots()
+    ax.plot([1, 2], [1, 2])
+    ax.set_xlabel('$x^2$')
+    return fig
+
+
+def test_render_patches_are_removed_after_save(tmp_path):
+    parse = matplotlib.mathtext.MathTextParser.parse
+    draw = matplotlib.figure.Figure.draw
+    pyblish.reset_draw_stats()
+    pyblish.clear_caches('text_metrics')
+    pyblish.save_figure(str(tmp_path / 'figure.png'), bbox=None, fig=make_plot())
+    assert not hasattr(RendererAgg.get_text_width_height_descent, '__wrapped__')
+    assert matplotlib.mathtext.MathTextParser.parse is parse
+    assert matplotlib.figure.Figure.draw is draw
+    assert pyblish.get_cache_stats('text_metrics')['misses'] > 0
+    assert pyblish.get_draw_stats()['draws'] == 1
+
+
+def test_unknown_formats_are_not_measured_with_agg():
+    with pyblish._render_scope('pgf'):
+        assert not hasattr(RendererAgg.get_text_width_height_descent, '__wrapped__')
+    with pyblish._render_scope('png'):
+        assert hasattr(RendererAgg.get_text_width_height_descent, '__wrapped__')
+
+
+def test_scoped_patch_restores_inherited_attribute():
+    class Base(object):
+        def f(self):
+            return 'base'
+
+    class Child(Base):
+        pass
+
+    patch = ScopedPatch(Child, 'f', lambda f: lambda self: 'patched ' + f(self))
+    with patch:
+        with patch:
+            assert Child().f() == 'patched base'
+        assert patch.is_applied()
+    assert not patch.is_applied()
+    assert 'f' not in Child.__dict__ and Child().f() == 'base'
+
+
+def test_deferred_draw_does_not_redraw_non_interactive_canvas():
+    fig = make_plot()
+    ax = fig.axes[0]
+    fig.canvas.draw()
+    pyblish.reset_draw_stats()
+    with pyblish.deferred_draw(fig):
+        for i in range(10):
+            ax.lines[0].set_linewidth(i + 1)
+            fig.canvas.draw_idle()
+        with pyblish.deferred_draw(fig):
+            fig.canvas.draw_idle()
+    stats = pyblish.get_draw_stats()
+    assert stats['suppressed'] == 11
+    # Agg renders the whole figure on a redraw request, which nobody would see
+    assert stats['draws'] == 0
+    assert 'draw_idle' not in fig.canvas.__dict__
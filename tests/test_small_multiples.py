@@ -0,0 +1,50 @@
+import numpy as np
+import pyblish
+from utils.clip import clip_polyline
+
+
+def test_clip_polyline_ends_segments_on_the_edge():
+    polylines = clip_polyline([0, 1, 2, 3, 4], [0, 1, 5, 1, 0], (0, 4), (0, 2))
+    assert len(polylines) == 2
+    np.testing.assert_allclose(polylines[0], [[0, 0], [1, 1], [1.25, 2]])
+    np.testing.assert_allclose(polylines[1], [[2.75, 2], [3, 1], [4, 0]])
+
+
+def test_data_is_clipped_to_each_panel():
+    grid = pyblish.SmallMultiples(2, 2)
+    x = np.linspace(-10, 10, 101)
+    for panel in range(4):
+        grid.plot(panel, x, x ** 2)
+        grid.scatter(panel, x, x, series=1)
+    grid.draw(xlim=(-2, 2), ylim=(0, 1))
+    origins = [(col * 1.25, (1 - row) * 1.25) for row, col in map(lambda p: divmod(p, 2), range(4))]
+    segments = grid.collections['line'][0].get_segments()
+    assert len(segments) == 4
+    for segment in segments:
+        assert any(np.all((segment >= (x0 - 1e-9, y0 - 1e-9)) & (segment <= (x0 + 1 + 1e-9, y0 + 1 + 1e-9)))
+                   for x0, y0 in origins)
+    offsets = grid.collections['marker'][1].get_offsets()
+    assert len(offsets) == 4 * 6
+
+
+def test_empty_series_use_default_range():
+    grid = pyblish.SmallMultiples(1, 2)
+    grid.plot(0, [], [])
+    grid.scatter(1, [], [], series=1)
+    grid.draw()
+    assert grid.xlim == (0.0, 1.0) and grid.ylim == (0.0, 1.0)
+
+
+def test_pyblishify_styles_series_with_the_property_helpers():
+    grid = pyblish.SmallMultiples(1, 2)
+    for panel in range(2):
+        grid.plot(panel, [0, 1], [0, 1])
+        grid.scatter(panel, [0, 1], [1, 0], series=1)
+    grid.draw()
+    grid.pyblishify(1, label_props={'fontname': 'DejaVu Sans'}, text_props={'fontname': 'DejaVu Sans'},
+                    line_props={'linewidth': 3}, marker_props={'symbols': 's', 'sizes': 20})
+    assert list(grid.collections['line'][0].get_linewidth()) == [3]
+    assert list(grid.collections['marker'][1].get_sizes()) == [20]
+    square = pyblish.matplotlib.markers.MarkerStyle('s')
+    np.testing.assert_allclose(grid.collections['marker'][1].get_paths()[0].vertices,
+                               square.get_path().transformed(square.get_transform()).vertices)
@@ -0,0 +1,79 @@
+import json
+import os
+import signal
+import threading
+import urllib.error
+import urllib.request
+import pytest
+import pyblish
+import serve
+from test_mathtext import FONT_PROPS
+
+
+def make_spec(**kwargs):
+    return dict({'plots': [{'call': 'plot', 'args': [[1, 2, 3], [1, 4, 9]]}], 'format': 'png'}, **kwargs)
+
+
+def test_spec_call_must_be_allowed():
+    with pytest.raises(pyblish.InputError, match='not allowed'):
+        pyblish.render_figure_spec(make_spec(plots=[{'call': 'remove'}]))
+    with pytest.raises(pyblish.InputError, match="call 'plot' failed"):
+        pyblish.render_figure_spec(make_spec(plots=[{'call': 'plot', 'args': [[1, 2]],
+                                                     'kwargs': {'not_a_property': 1}}]))
+
+
+def test_spec_paths_must_be_inside_roots(tmp_path):
+    root = tmp_path / 'out'
+    root.mkdir()
+    result = pyblish.render_figure_spec(make_spec(save_file='figure.png'), output_root=str(root))
+    assert result['save_file'] == os.path.join(os.path.realpath(str(root)), 'figure.png')
+    assert (root / 'figure.png').exists()
+    for save_file in ['../figure.png', str(tmp_path / 'figure.png')]:
+        with pytest.raises(pyblish.InputError, match='outside'):
+            pyblish.render_figure_spec(make_spec(save_file=save_file), output_root=str(root))
+    os.symlink(str(tmp_path), str(root / 'link'))
+    with pytest.raises(pyblish.InputError, match='outside'):
+        pyblish.render_figure_spec(make_spec(save_file='link/figure.png'), output_root=str(root))
+    assert not (tmp_path / 'figure.png').exists()
+    spec = make_spec(plots=[{'call': 'plot', 'args': [{'npy': str(tmp_path / 'data.npy')}]}])
+    with pytest.raises(pyblish.InputError, match='outside'):
+        pyblish.render_figure_spec(spec, data_root=str(root))
+
+
+def test_spec_figure_is_drawn_once(tmp_path):
+    pyblishify_kwargs = dict(FONT_PROPS, num_cols=1, which_markers=None, which_texts=None, which_legends=None)
+    spec = make_spec(save_file=str(tmp_path / 'figure.png'), bbox_inches=None, pyblishify=pyblishify_kwargs)
+    pyblish.reset_draw_stats()
+    pyblish.render_figure_spec(spec)
+    assert pyblish.get_draw_stats()['draws'] == 1
+
+
+def post(server, spec):
+    request = urllib.request.Request('http://127.0.0.1:{}/render'.format(server.server_address[1]),
+                                     data=json.dumps(spec).encode('utf-8'), method='POST')
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_server_status_codes_and_pool_recovery(tmp_path):
+    server = serve.make_server(port=0, workers=1, output_root=str(tmp_path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert post(server, make_spec()) == 200
+        assert post(server, make_spec(plots=[{'call': 'figure'}])) == 400
+        assert post(server, make_spec(save_file='/etc/figure.png')) == 400
+        # Kill the worker - the request fails with a server error and the pool is replaced
+        broken_pool = server.pool
+        for process in list(broken_pool._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+        assert post(server, make_spec()) == 500
+        assert server.pool is not broken_pool
+        assert post(server, make_spec()) == 200
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.pool.shutdown()
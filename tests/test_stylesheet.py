@@ -0,0 +1,42 @@
+import numpy as np
+import matplotlib.colors
+import pyblish
+from test_mathtext import FONT_PROPS
+
+
+def styled_line_plot(style_sheet, num_lines):
+    fig, ax = pyblish.make_figure(1, 1, style_sheet=style_sheet)
+    x = np.linspace(1, 10, 50)
+    for i in range(num_lines):
+        ax.plot(x, x + i)
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+    pyblish.reset_style_stats()
+    pyblish.pyblishify(fig, 1, which_markers=None, which_texts=None, which_log_scales=None, **FONT_PROPS)
+    return ax, pyblish.get_style_stats()
+
+
+def test_style_sheet_figure_still_enforces_style_on_overrides():
+    fig, ax = pyblish.make_figure(1, 1, style_sheet=True)
+    ax.plot([1, 2], [1, 2], color='k', lw=5)
+    ax.axhline(1)
+    ax.set_xlabel('x', fontsize=30, color='r')
+    ax.set_ylabel('y')
+    ax.tick_params(labelsize=25, width=4)
+    pyblish.pyblishify(fig, 1, which_markers=None, which_texts=None, which_log_scales=None, **FONT_PROPS)
+    assert [l.get_linewidth() for l in ax.lines] == [1.5, 1.5]
+    assert [matplotlib.colors.to_hex(l.get_color()) for l in ax.lines] == ['#ff0000', '#008000']
+    assert ax.xaxis.label.get_fontsize() == 20.0
+    assert matplotlib.colors.same_color(ax.xaxis.label.get_color(), 'orange')
+    tick = ax.xaxis.get_major_ticks()[0]
+    assert tick.label1.get_fontsize() == 14.0
+    assert tick.tick1line.get_markeredgewidth() == 1.5
+
+
+def test_style_sheet_figure_only_applies_properties_that_differ():
+    ax, stats = styled_line_plot(True, 200)
+    assert stats['applied'] == 5
+    assert ax.lines[0].get_color() == 'red'
+    ax, stats = styled_line_plot(False, 200)
+    # Every line takes the style's color when the figure was not made with the style sheet
+    assert stats['applied'] > 200
@@ -0,0 +1,52 @@
+import threading
+import matplotlib
+from PIL import Image
+import pytest
+import pyblish
+from utils.rwlock import SharedLock
+from test_pyblishify import make_plot
+from test_mathtext import FONT_PROPS
+
+
+def test_pyblishify_sets_fonts_and_dpi_on_figure_not_rcparams(tmp_path):
+    rc = dict(matplotlib.rcParams)
+    fig, ax = make_plot()
+    file_path = str(tmp_path / 'figure.png')
+    pyblish.pyblishify(fig, 1, save_file=file_path, bbox_inches=None, **FONT_PROPS)
+    assert dict(matplotlib.rcParams) == rc
+    assert ax.xaxis.label.get_fontfamily() == ['DejaVu Sans']
+    assert ax.xaxis.get_major_ticks()[0].label1.get_fontproperties().get_math_fontfamily() == 'stixsans'
+    assert ax.xaxis.get_major_formatter().fix_minus('-1') == '-1'
+    dpi = pyblish.get_defaults()['dpi']
+    with Image.open(file_path) as image:
+        assert all(abs(size - v * dpi) <= 1 for size, v in zip(image.size, fig.get_size_inches()))
+
+
+def test_shared_lock_is_shared_until_exclusive_access_is_requested():
+    lock = SharedLock()
+    both_shared = threading.Barrier(2, timeout=5)
+    events = []
+
+    def hold_shared():
+        with lock.shared():
+            both_shared.wait()
+
+    def hold_exclusive():
+        with lock.exclusive():
+            events.append('exclusive')
+
+    threads = [threading.Thread(target=hold_shared) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    with lock.shared():
+        writer = threading.Thread(target=hold_exclusive)
+        writer.start()
+        writer.join(0.2)
+        assert events == []
+    writer.join(5)
+    assert events == ['exclusive']
+    with pytest.raises(RuntimeError):
+        with lock.shared():
+            lock.acquire_exclusive()
@@ -0,0 +1,19 @@
+import pytest
+import pyblish
+from test_pyblishify import make_plot
+
+
+def selection_errors(errors):
+    # Fonts in the defaults file may not be installed, which is reported too
+    return [e for e in errors if e.startswith('Axes')]
+
+
+def test_dry_run_reports_selection_errors_without_styling():
+    fig, ax = make_plot()
+    colors = [l.get_color() for l in ax.lines]
+    assert selection_errors(pyblish.pyblishify(fig, 1, dry_run=True)) == []
+    errors = selection_errors(pyblish.pyblishify(fig, 1, which_lines=[5], dry_run=True))
+    assert len(errors) == 1 and errors[0].startswith('Axes 0 selection [5]')
+    assert [l.get_color() for l in ax.lines] == colors
+    with pytest.raises(pyblish.InputError, match='selection'):
+        pyblish.validate_figure(fig, which_lines=[5], raise_errors=True)
@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import threading
+
+
+class RenderCache(object):
+    """Content-addressed cache of rendered figure files stored in a local directory. Files are stored under their
+    fingerprint and the least recently used files are evicted once the total size exceeds max_bytes. Cached files are
+    copied to output paths rather than linked, so that later writes to an output path can not change the cache.
+    Args:
+        directory (str): Cache directory. Created if it does not exist.
+        max_bytes (int): Maximum total size of cached files in bytes.
+    """
+
+    def __init__(self, directory, max_bytes=1024**3):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        if not(os.path.isdir(directory)):
+            os.makedirs(directory)
+
+    def get(self, key, file_path):
+        """Write cached file to file_path if a file with the fingerprint given is cached.
+        Args:
+            key (str): Fingerprint of rendered file.
+            file_path (str): Output path.
+        Returns:
+            (bool): True if the output was written from the cache.
+        """
+        cache_path = self._get_path(key)
+        try:
+            # Update modification time as it is used to find least recently used files
+            os.utime(cache_path, None)
+            self._write(cache_path, file_path)
+        except (IOError, OSError):
+            with self._lock:
+                self.stats['misses'] += 1
+            return False
+        with self._lock:
+            self.stats['hits'] += 1
+        return True
+
+    def put(self, key, file_path):
+        """Store a rendered file in the cache under its fingerprint and evict files if the cache is too large.
+        Args:
+            key (str): Fingerprint of rendered file.
+            file_path (str): Path of rendered file.
+        Returns:
+            None
+        """
+        # Copy to a temporary file first so that other processes never see a partially written cache file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(file_path, tmp_path)
+            os.rename(tmp_path, self._get_path(key))
+        except (IOError, OSError):
+            if(os.path.exists(tmp_path)):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            self.stats['stores'] += 1
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used files until the total cache size is within max_bytes.
+        Returns:
+            None
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if(name.startswith('.tmp')):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue  # Removed by another process
+            entries.append((st.st_mtime, st.st_size, name))
+        total = sum(e[1] for e in entries)
+        for mtime, size, name in sorted(entries):
+            if(total <= self.max_bytes):
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.stats['evictions'] += 1
+
+    def get_stats(self):
+        """Get cache statistics.
+        Returns:
+            (dict): Counts of hits, misses, stores and evictions and the hit rate.
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / float(lookups) if lookups else 0.0
+        return stats
+
+    def _get_path(self, key):
+        return os.path.join(self.directory, key)
+
+    def _write(self, cache_path, file_path):
+        # Remove the output first so that it is replaced rather than truncated, which would write through any other
+        # links to it
+        if(os.path.lexists(file_path)):
+            os.remove(file_path)
+        shutil.copyfile(cache_path, file_path)
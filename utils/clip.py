@@ -0,0 +1,41 @@
+import numpy as np
+
+
+def clip_polyline(x, y, xlim, ylim):
+    """Clip a polyline to a rectangle. Each segment is clipped with the Liang-Barsky algorithm, so segments crossing the
+    edge of the rectangle end on the edge rather than being dropped, and the polyline is split where it leaves the
+    rectangle or where points are not finite.
+    Args:
+        x (numpy.ndarray): x values.
+        y (numpy.ndarray): y values with the same length as x.
+        xlim (tuple): Lower and upper x bound of the rectangle.
+        ylim (tuple): Lower and upper y bound of the rectangle.
+    Returns:
+        (list): Clipped polylines as (N, 2) arrays of at least 2 points.
+    """
+    xy = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+    if(len(xy) < 2):
+        return []
+    start = xy[:-1]
+    delta = np.diff(xy, axis=0)
+    t0 = np.zeros(len(delta))
+    t1 = np.ones(len(delta))
+    keep = np.all(np.isfinite(xy[:-1]) & np.isfinite(xy[1:]), axis=1)
+    for axis, (lo, hi) in enumerate([sorted(xlim), sorted(ylim)]):
+        # Each bound in turn as p * t <= q, where t is the position along the segment
+        for p, q in [(-delta[:, axis], start[:, axis] - lo), (delta[:, axis], hi - start[:, axis])]:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = q / p
+            t0 = np.where(p < 0, np.maximum(t0, t), t0)
+            t1 = np.where(p > 0, np.minimum(t1, t), t1)
+            # Segments parallel to the bound are entirely outside if their start is
+            keep &= ~((p == 0) & (q < 0))
+    keep &= t0 <= t1
+    clipped_start = start + t0[:, None] * delta
+    clipped_end = start + t1[:, None] * delta
+    # A kept segment continues the previous polyline if the previous segment was kept and neither was clipped between
+    continued = np.zeros(len(delta), dtype=bool)
+    continued[1:] = keep[:-1] & keep[1:] & (t1[:-1] == 1) & (t0[1:] == 0)
+    kept = np.flatnonzero(keep)
+    runs = np.split(kept, np.flatnonzero(~continued[kept])[1:])
+    return [np.vstack([clipped_start[run[0]], clipped_end[run]]) for run in runs if len(run)]
@@ -1,4 +1,5 @@
-import collections
+import collections.abc
+import numpy as np
 
 
 def get_iterable(arg):
@@ -9,7 +10,7 @@ def get_iterable(arg):
     Returns:
         Object as an iterable.
     """
-    if isinstance(arg, collections.Iterable) and not isinstance(arg, str):
+    if isinstance(arg, collections.abc.Iterable) and not isinstance(arg, str):
         return arg
     else:
         return [arg]
@@ -43,3 +44,34 @@ def convert_rgba(color):
     else:
         return color
 
+
+
+def values_equal(a, b):
+    """Compare two property values, including numpy arrays, paths and bboxes which do not support == directly.
+    Args:
+        a: First value.
+        b: Second value.
+    Returns:
+        (bool): True if values are equal.
+    """
+    if(a is b):
+        return True
+    if(isinstance(a, (list, tuple)) and isinstance(b, (list, tuple))):
+        return len(a) == len(b) and all(values_equal(ai, bi) for ai, bi in zip(a, b))
+    # Compare matplotlib paths and bboxes by their vertices and points
+    for attrs in [('vertices', 'codes'), ('get_points',)]:
+        if(all(hasattr(a, at) and hasattr(b, at) for at in attrs)):
+            return all(_arrays_equal(*[getattr(v, at)() if callable(getattr(v, at)) else getattr(v, at)
+                                       for v in (a, b)]) for at in attrs)
+    try:
+        return bool(a == b)
+    except ValueError:
+        # Element-wise comparison of arrays is ambiguous as a bool
+        return _arrays_equal(a, b)
+
+
+def _arrays_equal(a, b):
+    try:
+        return np.array_equal(np.asarray(a), np.asarray(b))
+    except (TypeError, ValueError):
+        return False
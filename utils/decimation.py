@@ -0,0 +1,251 @@
+import math
+import numpy as np
+
+
+def lttb(x, y, n_out):
+    """Downsample a series with the Largest-Triangle-Three-Buckets algorithm. The first and last points are always
+    kept and each intermediate bucket contributes the point that forms the largest triangle with its neighbours, so
+    visual peaks and troughs survive the decimation.
+    Args:
+        x (numpy.ndarray): Monotonic x values.
+        y (numpy.ndarray): y values with the same length as x.
+        n_out (int): Number of points to return (including the first and last point).
+    Returns:
+        (numpy.ndarray), (numpy.ndarray): Decimated x values, decimated y values.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = lttb_indexes(x, y, n_out)
+    return x[keep], y[keep]
+
+
+def lttb_indexes(x, y, n_out):
+    """Get indexes of the points kept by Largest-Triangle-Three-Buckets (see lttb). Buckets have equal widths in x,
+    so x should be in the coordinates the series is displayed in (e.g. log10 of x on a log axis). Buckets with no
+    points are dropped, so fewer than n_out points can be kept.
+    Args:
+        x (numpy.ndarray): Monotonic x values.
+        y (numpy.ndarray): y values with the same length as x.
+        n_out (int): Maximum number of points to keep (including the first and last point).
+    Returns:
+        (numpy.ndarray): Sorted indexes of the points kept.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n_in = len(x)
+    if(n_out >= n_in or n_out < 3):
+        return np.arange(n_in)
+
+    # Bucket edges for the n_in - 2 interior points split into n_out - 2 buckets
+    edges = get_bucket_edges(x, 1, n_in - 1, n_out - 2)
+    n_buckets = len(edges) - 1
+    # Mean of each bucket is used as the third triangle vertex for the preceding bucket
+    sums_x = np.add.reduceat(x[1:-1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:-1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    keep = np.empty(n_buckets + 2, dtype=int)
+    keep[0] = 0
+    keep[-1] = n_in - 1
+    a = 0
+    for i in range(n_buckets):
+        start, stop = edges[i], edges[i + 1]
+        # Twice the triangle area for every candidate in the bucket - the factor of two does not affect the argmax
+        area = np.abs((x[a] - avg_x[i + 1]) * (y[start:stop] - y[a]) -
+                      (x[a] - x[start:stop]) * (avg_y[i + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def minmax_envelope(x, y, n_buckets):
+    """Downsample a series by keeping the minimum and maximum y value of each bucket in the order they occur. Every
+    extremum of the original series is retained so the rendered envelope is identical at the bucket resolution.
+    Args:
+        x (numpy.ndarray): Monotonic x values.
+        y (numpy.ndarray): y values with the same length as x.
+        n_buckets (int): Number of buckets. At most 2 * n_buckets points are returned.
+    Returns:
+        (numpy.ndarray), (numpy.ndarray): Decimated x values, decimated y values.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = minmax_indexes(x, y, n_buckets)
+    return x[keep], y[keep]
+
+
+def minmax_indexes(x, y, n_buckets):
+    """Get indexes of the points kept by the min/max envelope (see minmax_envelope). Buckets have equal widths in x,
+    so x should be in the coordinates the series is displayed in. The first and last points are always kept.
+    Args:
+        x (numpy.ndarray): Monotonic x values.
+        y (numpy.ndarray): y values with the same length as x.
+        n_buckets (int): Maximum number of buckets.
+    Returns:
+        (numpy.ndarray): Sorted indexes of the points kept.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n_in = len(x)
+    if(2 * n_buckets >= n_in or n_buckets < 1):
+        return np.arange(n_in)
+
+    edges = get_bucket_edges(x, 0, n_in, n_buckets)
+    starts = edges[:-1]
+    bucket = np.repeat(np.arange(len(starts)), np.diff(edges))
+    keep = [[0, n_in - 1]]
+    for reduce_func in [np.minimum, np.maximum]:
+        # First index in each bucket whose value equals the bucket extremum
+        extreme = reduce_func.reduceat(y, starts)
+        candidates = np.flatnonzero(y == extreme[bucket])
+        _, first = np.unique(bucket[candidates], return_index=True)
+        keep.append(candidates[first])
+    return np.unique(np.concatenate(keep))
+
+
+def get_bucket_edges(x, start, stop, n_buckets):
+    """Split the points from index start to stop into buckets of equal width in x.
+    Args:
+        x (numpy.ndarray): Monotonic x values.
+        start (int): Index of first point.
+        stop (int): Index after the last point.
+        n_buckets (int): Number of buckets.
+    Returns:
+        (numpy.ndarray): Index of the first point of each bucket followed by stop. Buckets with no points are
+            dropped.
+    """
+    bounds = np.linspace(x[start], x[stop - 1], n_buckets + 1)[1:-1]
+    edges = np.searchsorted(x[start:stop], bounds, side='left') + start
+    return np.unique(np.concatenate([[start], edges, [stop]]))
+
+
+def get_decimation_budget(width_pixels, points_per_pixel):
+    """Get number of points a line needs to keep to be visually indistinguishable at the output resolution.
+    Args:
+        width_pixels (float): Width of the axes in output pixels.
+        points_per_pixel (float): Points retained for each horizontal pixel.
+    Returns:
+        (int): Number of points to decimate to.
+    """
+    return max(int(math.ceil(width_pixels * points_per_pixel)), 3)
+
+
+def decimate(x, y, n_out, method='lttb'):
+    """Decimate a series using the method specified.
+    Args:
+        x (numpy.ndarray): Monotonic x values.
+        y (numpy.ndarray): y values with the same length as x.
+        n_out (int): Number of points to return.
+        method (str): 'lttb' or 'minmax'.
+    Returns:
+        (numpy.ndarray), (numpy.ndarray): Decimated x values, decimated y values.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = decimate_indexes(x, y, n_out, method)
+    return x[keep], y[keep]
+
+
+def decimate_indexes(x, y, n_out, method='lttb'):
+    """Get indexes of the points kept by decimating a series using the method specified (see decimate).
+    Args:
+        x (numpy.ndarray): Monotonic x values in display coordinates.
+        y (numpy.ndarray): y values in display coordinates with the same length as x.
+        n_out (int): Maximum number of points to keep.
+        method (str): 'lttb' or 'minmax'.
+    Returns:
+        (numpy.ndarray): Sorted indexes of the points kept.
+    """
+    if(method == 'lttb'):
+        return lttb_indexes(x, y, n_out)
+    elif(method == 'minmax'):
+        return minmax_indexes(x, y, n_out // 2)
+    else:
+        raise ValueError("Decimation method '{}' not recognised. Use 'lttb' or 'minmax'.".format(method))
+
+
+def get_sorted_bucket_edges(x, n, n_buckets, transform=None, x_range=None):
+    """Split an increasing series into buckets of equal width in x, or in the coordinates x is displayed in. Bucket
+    bounds are found by binary search, so only a few samples of x are read and x can be a memory-mapped array larger
+    than RAM.
+    Args:
+        x (numpy.ndarray|numpy.memmap): Increasing x values with shape (n,). Sample indexes are used if None.
+        n (int): Number of samples.
+        n_buckets (int): Number of buckets.
+        transform (matplotlib.transforms.Transform): Monotonic transform from x to the coordinates buckets have equal
+            width in (e.g. the scale transform of a log axis). x is used as is if None.
+        x_range (tuple): First and last x values spanned by the buckets. Samples outside join the first or last
+            bucket. The first and last values of x are used if None.
+    Returns:
+        (numpy.ndarray): Index of the first sample of each non-empty bucket followed by n (see
+            minmax_envelope_chunked).
+    """
+    if(x_range is None):
+        x_range = (0, n - 1) if x is None else (x[0], x[-1])
+    bounds = np.asarray(x_range, dtype=float).reshape(-1, 1)
+    if(transform is not None):
+        bounds = transform.transform(bounds)
+    bounds = np.linspace(bounds[0, 0], bounds[-1, 0], max(int(n_buckets), 1) + 1)[1:-1].reshape(-1, 1)
+    if(transform is not None):
+        bounds = transform.inverted().transform(bounds)
+    bounds = bounds.ravel()
+    if(x is None):
+        inner = np.clip(np.ceil(bounds), 0, n)
+    else:
+        inner = np.searchsorted(x, bounds, side='left')
+    return np.unique(np.concatenate([[0], inner, [n]]).astype(np.int64))
+
+
+def minmax_envelope_chunked(y, n_buckets, chunk_size=10000000, edges=None):
+    """Get indexes of the minimum and maximum of each bucket of a series reading it in chunks, so that memory-mapped
+    arrays larger than RAM can be decimated with only one chunk resident at a time. NaNs are ignored.
+    Args:
+        y (numpy.ndarray|numpy.memmap): Values with shape (n,) or (n, n_series).
+        n_buckets (int): Number of equally sized index buckets. Ignored if edges are given.
+        chunk_size (int): Number of samples read per chunk.
+        edges (numpy.ndarray): Index of the first sample of each bucket followed by n, e.g. for buckets of equal x
+            width (see get_sorted_bucket_edges).
+    Returns:
+        (list): Sorted indexes to keep for each series (one array per column of y). The first and last samples are
+            always kept so that the decimated series spans the whole x range.
+    """
+    n_in = y.shape[0]
+    n_series = 1 if y.ndim == 1 else y.shape[1]
+    if(edges is None):
+        n_buckets = max(min(int(n_buckets), n_in), 1)
+        edges = np.linspace(0, n_in, n_buckets + 1).astype(np.int64)
+    # Empty buckets would make reduceat return a sample of the next bucket
+    edges = np.unique(edges)
+    n_buckets = len(edges) - 1
+    # Running extremum values and indexes of each bucket - buckets can span more than one chunk
+    extremes = {}
+    for name, fill in [('min', np.inf), ('max', -np.inf)]:
+        extremes[name] = (np.full((n_buckets, n_series), fill), np.full((n_buckets, n_series), -1, dtype=np.int64))
+
+    for start in range(0, n_in, chunk_size):
+        stop = min(start + chunk_size, n_in)
+        yc = np.asarray(y[start:stop], dtype=float).reshape(stop - start, n_series)
+        # Buckets overlapping this chunk and the local start index of each within the chunk
+        b0 = np.searchsorted(edges, start, side='right') - 1
+        b1 = np.searchsorted(edges, stop, side='left')
+        buckets = np.arange(b0, b1)
+        local_starts = np.maximum(edges[b0:b1], start) - start
+        labels = np.repeat(np.arange(len(buckets)), np.diff(np.append(local_starts, stop - start)))
+        for name, reduce_func, better in [('min', np.fmin, np.less), ('max', np.fmax, np.greater)]:
+            values, indexes = extremes[name]
+            chunk_values = reduce_func.reduceat(yc, local_starts, axis=0)
+            for j in range(n_series):
+                # First sample in each bucket equal to the bucket extremum (all-NaN buckets have no match)
+                candidates = np.flatnonzero(yc[:, j] == chunk_values[labels, j])
+                found, first = np.unique(labels[candidates], return_index=True)
+                update = better(chunk_values[found, j], values[buckets[found], j])
+                values[buckets[found[update]], j] = chunk_values[found[update], j]
+                indexes[buckets[found[update]], j] = candidates[first[update]] + start
+
+    keep = []
+    for j in range(n_series):
+        idx = np.concatenate([[0, n_in - 1], extremes['min'][1][:, j], extremes['max'][1][:, j]])
+        keep.append(np.unique(idx[(idx >= 0) & (idx < n_in)]))
+    return keep
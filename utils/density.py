@@ -0,0 +1,75 @@
+import numpy as np
+
+
+def histogram2d_chunked(x, y, bins, extent, chunk_size=10000000, transform=None):
+    """Bin points into a 2D histogram reading the input in chunks, so that memory-mapped arrays larger than RAM can be
+    binned with only one chunk resident at a time.
+    Args:
+        x (numpy.ndarray|numpy.memmap): x values.
+        y (numpy.ndarray|numpy.memmap): y values with the same length as x.
+        bins (tuple): Number of bins in x and y: (nx, ny).
+        extent (tuple): Binned range as (x0, x1, y0, y1) in transformed coordinates. Points outside the range are
+            dropped.
+        chunk_size (int): Number of points read per chunk.
+        transform (function): Function mapping an (N, 2) array of points to the coordinates they are binned in. Points
+            transformed to non-finite values are dropped. Points are binned as they are if None.
+    Returns:
+        counts (numpy.ndarray): Histogram with shape (ny, nx), ready to be displayed with origin='lower'.
+    """
+    nx, ny = int(bins[0]), int(bins[1])
+    x0, x1, y0, y1 = [float(e) for e in extent]
+    if(nx < 1 or ny < 1 or not np.all(np.isfinite([x0, x1, y0, y1])) or x1 <= x0 or y1 <= y0):
+        raise ValueError("Histogram bins must be >= 1 and extent must have non-zero width and height.")
+    counts = np.zeros(nx * ny, dtype=np.int64)
+    for start in range(0, len(x), chunk_size):
+        xc, yc = _read_chunk(x, y, start, chunk_size, transform)
+        finite = np.isfinite(xc) & np.isfinite(yc)
+        xc, yc = xc[finite], yc[finite]
+        # Convert positions directly to flat bin indexes rather than calling numpy.histogram2d, which sorts
+        ix = np.floor((xc - x0) * (nx / (x1 - x0))).astype(np.int64)
+        iy = np.floor((yc - y0) * (ny / (y1 - y0))).astype(np.int64)
+        # Include points lying exactly on the upper edge in the last bin
+        ix[xc == x1] = nx - 1
+        iy[yc == y1] = ny - 1
+        inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+        counts += np.bincount(iy[inside] * nx + ix[inside], minlength=nx * ny)
+    return counts.reshape(ny, nx)
+
+
+def get_extent_chunked(x, y, chunk_size=10000000, transform=None):
+    """Get finite data extent of points reading the input in chunks.
+    Args:
+        x (numpy.ndarray|numpy.memmap): x values.
+        y (numpy.ndarray|numpy.memmap): y values with the same length as x.
+        chunk_size (int): Number of points read per chunk.
+        transform (function): Function mapping an (N, 2) array of points to the coordinates the extent is found in
+            (see histogram2d_chunked()).
+    Returns:
+        (tuple): Data extent as (x0, x1, y0, y1).
+    """
+    extent = [np.inf, -np.inf, np.inf, -np.inf]
+    for start in range(0, len(x), chunk_size):
+        for i, values in enumerate(_read_chunk(x, y, start, chunk_size, transform)):
+            values = values[np.isfinite(values)]
+            if(len(values)):
+                extent[2 * i] = min(extent[2 * i], values.min())
+                extent[2 * i + 1] = max(extent[2 * i + 1], values.max())
+    return tuple(extent)
+
+
+def _read_chunk(x, y, start, chunk_size, transform):
+    """Read a chunk of points as floats, transforming them if a transform is given.
+    Args:
+        x (numpy.ndarray|numpy.memmap): x values.
+        y (numpy.ndarray|numpy.memmap): y values with the same length as x.
+        start (int): Index of first point in the chunk.
+        chunk_size (int): Number of points read per chunk.
+        transform (function): Function mapping an (N, 2) array of points to new coordinates, or None.
+    Returns:
+        (numpy.ndarray), (numpy.ndarray): x values, y values of the chunk.
+    """
+    xc = np.asarray(x[start:start + chunk_size], dtype=float)
+    yc = np.asarray(y[start:start + chunk_size], dtype=float)
+    if(transform is not None):
+        xc, yc = np.asarray(transform(np.column_stack([xc, yc])), dtype=float).T
+    return xc, yc
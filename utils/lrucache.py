@@ -0,0 +1,126 @@
+import collections
+import threading
+
+
+class LRUCache(object):
+    """Thread-safe, bounded, least-recently-used cache with hit and miss counters.
+    Args:
+        maxsize (int): Maximum number of entries. The least recently used entry is discarded when exceeded.
+    """
+
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Get cached value and mark it as recently used.
+        Args:
+            key: Hashable cache key.
+            default: Value returned if key is not cached.
+        Returns:
+            Cached value or default.
+        """
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Cache value, discarding the least recently used entry if the cache is full.
+        Args:
+            key: Hashable cache key.
+            value: Value to cache.
+        Returns:
+            None
+        """
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while(len(self._data) > self.maxsize):
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries and reset counters.
+        Returns:
+            None
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """Get cache statistics.
+        Returns:
+            (dict): Number of hits, misses and entries, the maximum size and the hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'maxsize': self.maxsize,
+                    'hit_rate': self.hits / float(lookups) if lookups else 0.0}
+
+
+# Process-wide caches by name (see register_cache)
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def register_cache(name, maxsize=65536):
+    """Get the process-wide cache with a name, creating it on first use, so that the statistics of every cache can be
+    read and every cache cleared by name (see get_cache_stats and clear_caches).
+    Args:
+        name (str): Cache name.
+        maxsize (int): Maximum number of entries if the cache is created.
+    Returns:
+        (LRUCache): Cache.
+    """
+    with _caches_lock:
+        if(name not in _caches):
+            _caches[name] = LRUCache(maxsize=maxsize)
+        return _caches[name]
+
+
+def get_cache_stats(name=None):
+    """Get statistics of a process-wide cache, or of every cache.
+    Args:
+        name (str): Cache name. Statistics of every cache are returned if None.
+    Returns:
+        (dict): Number of hits, misses and entries, the maximum size and the hit rate, or these statistics for each
+            cache name if name is None.
+    """
+    if(name is None):
+        with _caches_lock:
+            caches = dict(_caches)
+        return {k: cache.get_stats() for k, cache in sorted(caches.items())}
+    return _get_cache(name).get_stats()
+
+
+def clear_caches(name=None):
+    """Empty a process-wide cache, or every cache, and reset the counters, e.g. after installing new fonts.
+    Args:
+        name (str): Cache name. Every cache is cleared if None.
+    Returns:
+        None
+    """
+    if(name is None):
+        with _caches_lock:
+            caches = list(_caches.values())
+    else:
+        caches = [_get_cache(name)]
+    for cache in caches:
+        cache.clear()
+
+
+def _get_cache(name):
+    with _caches_lock:
+        if(name not in _caches):
+            raise ValueError("Cache '{}' not found. Caches are '{}'.".format(name, "', '".join(sorted(_caches))))
+        return _caches[name]
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+from PIL import Image, PngImagePlugin
+
+
+def optimize_png(file_path, compress_level=9, palette='exact', max_colors=256, strip_metadata=True):
+    """Re-encode a PNG file to reduce its size. The file is only replaced if the re-encoded file is smaller.
+    Args:
+        file_path (str): Path of PNG file.
+        compress_level (int): zlib compression level from 0 (none) to 9 (smallest).
+        palette (str|None): 'exact' stores images with at most max_colors distinct colors as a lossless palette image,
+            'quantize' reduces any image to max_colors colors (lossy), None keeps true color.
+        max_colors (int): Maximum number of palette colors (<= 256).
+        strip_metadata (bool): Remove text metadata chunks (e.g. Software) if True.
+    Returns:
+        (dict): Size of file before and after optimization in bytes, the size ratio and time taken in seconds.
+    """
+    start = time.time()
+    bytes_before = os.path.getsize(file_path)
+    image = Image.open(file_path)
+    image.load()
+    pnginfo = None
+    if not(strip_metadata):
+        pnginfo = PngImagePlugin.PngInfo()
+        for k, v in image.text.items():
+            pnginfo.add_text(k, v)
+    save_kwargs = {}
+
+    rgba = np.asarray(image.convert('RGBA'))
+    # Drop alpha channel if the image is fully opaque
+    mode = 'RGBA' if (rgba[..., 3] != 255).any() else 'RGB'
+    image = Image.fromarray(rgba if mode == 'RGBA' else np.ascontiguousarray(rgba[..., :3]))
+    if(palette == 'exact'):
+        paletted = _to_exact_palette(rgba, max_colors)
+        if(paletted):
+            image, save_kwargs = paletted
+    elif(palette == 'quantize'):
+        image = image.quantize(colors=max_colors)
+    elif(palette is not None):
+        raise ValueError("Palette '{}' not recognised. Use 'exact', 'quantize' or None.".format(palette))
+
+    # A unique temporary file in the same directory, so that optimizing the same path twice at once can not mix the
+    # files and the optimized file replaces the original atomically
+    fd, tmp_path = tempfile.mkstemp(suffix='.png', dir=os.path.dirname(os.path.abspath(file_path)))
+    os.close(fd)
+    try:
+        image.save(tmp_path, format='png', optimize=False, compress_level=compress_level, pnginfo=pnginfo,
+                   **save_kwargs)
+        bytes_after = os.path.getsize(tmp_path)
+        if(bytes_after < bytes_before):
+            shutil.copymode(file_path, tmp_path)  # mkstemp makes files only readable by the owner
+            os.replace(tmp_path, file_path)
+        else:
+            bytes_after = bytes_before
+    finally:
+        if(os.path.exists(tmp_path)):
+            os.remove(tmp_path)
+    return {'file': file_path, 'bytes_before': bytes_before, 'bytes_after': bytes_after,
+            'ratio': bytes_after / float(bytes_before), 'seconds': time.time() - start}
+
+
+def _to_exact_palette(rgba, max_colors):
+    """Convert RGBA pixels into a palette image without losing any color, if there are few enough distinct colors.
+    Args:
+        rgba (numpy.ndarray): Pixels with shape (height, width, 4) and dtype uint8.
+        max_colors (int): Maximum number of palette colors.
+    Returns:
+        (PIL.Image.Image, dict)|None: Palette image and keyword arguments for saving its transparency, or None if
+            the image has more than max_colors colors.
+    """
+    packed = np.ascontiguousarray(rgba).view(np.uint32).reshape(rgba.shape[:2])
+    colors, indexes = np.unique(packed, return_inverse=True)
+    if(len(colors) > min(max_colors, 256)):
+        return None
+    colors = colors.view(np.uint8).reshape(-1, 4)
+    image = Image.fromarray(indexes.reshape(rgba.shape[:2]).astype(np.uint8))
+    image.putpalette(colors[:, :3].ravel().tolist())
+    save_kwargs = {}
+    if((colors[:, 3] != 255).any()):
+        save_kwargs['transparency'] = colors[:, 3].tobytes()
+    return image, save_kwargs
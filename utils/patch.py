@@ -0,0 +1,49 @@
+import threading
+
+
+class ScopedPatch(object):
+    """Context manager replacing an attribute of a class while at least one scope is open. The original attribute is
+    restored when the last open scope exits, so scopes can be nested and entered from several threads, and an
+    attribute inherited from a base class is removed again rather than left on the class.
+    Args:
+        owner (type): Class to patch.
+        name (str): Name of attribute.
+        make_replacement (function): Called with the original attribute each time the patch is applied, returning the
+            attribute that replaces it.
+    """
+
+    def __init__(self, owner, name, make_replacement):
+        self.owner = owner
+        self.name = name
+        self.make_replacement = make_replacement
+        self._count = 0
+        self._original = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            if(self._count == 0):
+                # The class's own attribute (None if inherited) is restored as it was, e.g. as a staticmethod
+                self._original = self.owner.__dict__.get(self.name)
+                setattr(self.owner, self.name, self.make_replacement(getattr(self.owner, self.name)))
+            self._count += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self._lock:
+            self._count -= 1
+            if(self._count == 0):
+                if(self._original is None):
+                    delattr(self.owner, self.name)
+                else:
+                    setattr(self.owner, self.name, self._original)
+                    self._original = None
+        return False
+
+    def is_applied(self):
+        """Check if the patch is applied.
+        Returns:
+            (bool): True if at least one scope is open.
+        """
+        with self._lock:
+            return self._count > 0
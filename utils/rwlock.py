@@ -0,0 +1,98 @@
+import contextlib
+import threading
+
+
+class SharedLock(object):
+    """Reentrant lock that can be held shared by any number of threads or exclusively by one thread. Threads waiting
+    for exclusive access block new shared access so that they are not starved. A thread holding exclusive access can
+    acquire shared or exclusive access again, and a thread holding shared access can acquire shared access again, but
+    a thread holding only shared access can not acquire exclusive access as it would wait for itself.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        # Shared access count of each thread holding shared access
+        self._shared = {}
+        self._owner = None
+        self._exclusive = 0
+        self._waiting = 0
+
+    @contextlib.contextmanager
+    def shared(self):
+        """Context manager holding shared access.
+        Returns:
+            None
+        """
+        self.acquire_shared()
+        try:
+            yield
+        finally:
+            self.release_shared()
+
+    @contextlib.contextmanager
+    def exclusive(self):
+        """Context manager holding exclusive access.
+        Returns:
+            None
+        """
+        self.acquire_exclusive()
+        try:
+            yield
+        finally:
+            self.release_exclusive()
+
+    def acquire_shared(self):
+        """Acquire shared access, waiting while another thread holds or waits for exclusive access.
+        Returns:
+            None
+        """
+        thread = threading.get_ident()
+        with self._condition:
+            if(self._owner != thread and thread not in self._shared):
+                while(self._owner is not None or self._waiting):
+                    self._condition.wait()
+            self._shared[thread] = self._shared.get(thread, 0) + 1
+
+    def release_shared(self):
+        """Release shared access acquired by this thread.
+        Returns:
+            None
+        """
+        thread = threading.get_ident()
+        with self._condition:
+            self._shared[thread] -= 1
+            if not(self._shared[thread]):
+                del self._shared[thread]
+                self._condition.notify_all()
+
+    def acquire_exclusive(self):
+        """Acquire exclusive access, waiting until no other thread holds access.
+        Returns:
+            None
+        """
+        thread = threading.get_ident()
+        with self._condition:
+            if(self._owner == thread):
+                self._exclusive += 1
+                return
+            if(thread in self._shared):
+                raise RuntimeError("Exclusive access can not be acquired by a thread holding shared access.")
+            self._waiting += 1
+            try:
+                while(self._owner is not None or self._shared):
+                    self._condition.wait()
+            finally:
+                self._waiting -= 1
+            self._owner = thread
+            self._exclusive = 1
+
+    def release_exclusive(self):
+        """Release exclusive access acquired by this thread.
+        Returns:
+            None
+        """
+        with self._condition:
+            self._exclusive -= 1
+            if not(self._exclusive):
+                self._owner = None
+                self._condition.notify_all()
@@ -0,0 +1,132 @@
+import numbers
+import matplotlib.colors
+import matplotlib.legend
+import matplotlib.lines
+import matplotlib.markers
+
+
+# Kind of value accepted by each property of each property group in the defaults file. Properties can be given as a
+# single value or a list of values that is cycled over the plot objects.
+STYLE_SCHEMA = {
+    'spine_props': {'linewidth': 'number', 'linestyle': 'linestyle', 'linecolor': 'color', 'visible': 'bool'},
+    'major_tick_props': {'size': 'number', 'width': 'number', 'direction': ('in', 'out', 'inout'), 'pad': 'number',
+                         'fontsize': 'number', 'fontcolor': 'color'},
+    'minor_tick_props': {'size': 'number', 'width': 'number', 'direction': ('in', 'out', 'inout'), 'pad': 'number',
+                         'fontsize': 'number', 'fontcolor': 'color'},
+    'label_props': {'fontsize': 'number', 'fontname': 'font', 'fontcolor': 'color'},
+    'line_props': {'linewidth': 'number', 'linestyle': 'linestyle', 'linecolor': 'color'},
+    'marker_props': {'linewidth': 'number', 'linestyle': 'linestyle', 'linecolor': 'color', 'facecolor': 'color',
+                     'symbols': 'marker', 'sizes': 'number'},
+    'text_props': {'fontname': 'font', 'fontsize': 'number', 'fontcolor': 'color'},
+    'legend_props': {'loc': 'legend_loc', 'ncol': 'int', 'frameon': 'bool', 'columnspacing': 'number',
+                     'labelspacing': 'number', 'handlelength': 'number', 'handleheight': 'number',
+                     'handletextpad': 'number', 'numpoints': 'int', 'scatterpoints': 'int', 'bbox_to_anchor': 'bbox'},
+    'large_legend_props': {'min_entries': 'int', 'max_width_fraction': 'number', 'max_ncol': 'int'},
+    'legend_line_props': {'linewidth': 'number', 'linestyle': 'linestyle', 'linecolor': 'color'},
+    'legend_marker_props': {'linewidth': 'number', 'linestyle': 'linestyle', 'linecolor': 'color',
+                            'facecolor': 'color', 'symbols': 'marker', 'sizes': 'number'},
+    'legend_text_props': {'fontname': 'font', 'fontsize': 'number', 'fontcolor': 'color'},
+    'decimate_props': {'method': ('lttb', 'minmax'), 'points_per_pixel': 'number', 'min_points': 'int'},
+    'density_props': {'min_points': 'int', 'pixels_per_bin': 'number', 'norm': ('log', 'linear'),
+                      'chunk_size': 'int'},
+    'png_props': {'compress_level': 'int', 'palette': ('exact', 'quantize', None), 'max_colors': 'int',
+                  'strip_metadata': 'bool'},
+    'preview_props': {'dpi': 'number', 'points_per_pixel': 'number', 'min_points': 'int', 'export_profile': 'name'},
+    'log_scale_props': {'scale': ('linear', 'log', 'symlog', 'logit'), 'base': 'number', 'subs': 'number',
+                        'exponents': 'bool', 'exponents_precision': 'int', 'hide_base': 'bool',
+                        'base_precision': 'int', 'max_major_ticks': 'int', 'max_minor_ticks': 'int'},
+}
+# Kind of value accepted by each setting of the export profiles in 'export_profiles'
+PROFILE_SCHEMA = {'simplify': 'bool', 'simplify_threshold': 'number', 'chunk_size': 'int',
+                  'font_embedding': ('type3', 'truetype'), 'svg_fonts': ('path', 'none'), 'dpi': 'dpi'}
+# Kind of value accepted by top level parameters of the defaults file
+PARAMETER_SCHEMA = {'dpi': 'number', 'fontname': 'font', 'fontname_mathtext': 'font', 'use_mathtext': 'bool',
+                    'use_unicode_minus': 'bool'}
+
+
+def check_value(kind, value):
+    """Check that a property value (or every value in a list of values) is of the kind given.
+    Args:
+        kind (str|tuple): Kind of value from STYLE_SCHEMA, or a tuple of accepted values.
+        value: Property value.
+    Returns:
+        (bool): True if the value is valid.
+    """
+    if(_is_kind(kind, value)):
+        return True
+    # Lists are cycled over plot objects and can be nested (e.g. a list of marker sizes for each collection)
+    if(isinstance(value, (list, tuple)) and value):
+        return all(check_value(kind, v) for v in value)
+    return False
+
+
+def check_props(group, props, schema=None):
+    """Check every property of a property group against the schema and report all errors at once.
+    Args:
+        group (str): Property group name (e.g. 'line_props').
+        props (dict): Properties of the group.
+        schema (dict): Schema of property kinds for each group. Defaults to STYLE_SCHEMA.
+    Returns:
+        (list): Error messages. Empty if the properties are valid.
+    """
+    schema = STYLE_SCHEMA if schema is None else schema
+    errors = []
+    if(group not in schema):
+        return errors
+    for k, v in props.items():
+        kind = schema[group].get(k)
+        if(kind is None):
+            errors.append("Unknown property '{}' in '{}'. Accepted properties are '{}'."
+                          .format(k, group, "', '".join(sorted(schema[group]))))
+        elif(kind != 'font' and not(check_value(kind, v))):
+            errors.append("Invalid value {!r} for '{}' in '{}'. Expected {}."
+                          .format(v, k, group, _describe_kind(kind)))
+    return errors
+
+
+def _is_kind(kind, value):
+    if(isinstance(kind, tuple)):
+        return any(value == k and type(value) == type(k) for k in kind)
+    if(kind == 'number'):
+        return isinstance(value, numbers.Real) and not isinstance(value, bool)
+    elif(kind == 'int'):
+        return isinstance(value, numbers.Integral) and not isinstance(value, bool)
+    elif(kind == 'bool'):
+        return isinstance(value, bool)
+    elif(kind in ['font', 'name']):
+        return isinstance(value, str)
+    elif(kind == 'color'):
+        return not(isinstance(value, list)) and matplotlib.colors.is_color_like(value)
+    elif(kind == 'linestyle'):
+        if(isinstance(value, tuple) and len(value) == 2):
+            # Custom (offset, on-off-dash-sequence) linestyle
+            return isinstance(value[0], numbers.Real) and all(isinstance(v, numbers.Real) for v in value[1])
+        return isinstance(value, str) and (value in matplotlib.lines.Line2D.lineStyles or
+                                           value in ['solid', 'dashed', 'dashdot', 'dotted'])
+    elif(kind == 'marker'):
+        if(isinstance(value, list)):
+            return False
+        try:
+            matplotlib.markers.MarkerStyle(value)
+            return True
+        except (ValueError, TypeError):
+            return False
+    elif(kind == 'legend_loc'):
+        return (_is_kind('int', value) and 0 <= value <= 10) or value in matplotlib.legend.Legend.codes
+    elif(kind == 'dpi'):
+        # Single dpi or dpi for each format
+        values = value.values() if isinstance(value, dict) else [value]
+        return all(_is_kind('number', v) and v > 0 for v in values)
+    elif(kind == 'bbox'):
+        return value in [None, 'None'] or (isinstance(value, (list, tuple)) and len(value) in [2, 4] and
+                                            all(_is_kind('number', v) for v in value))
+    return False
+
+
+def _describe_kind(kind):
+    if(isinstance(kind, tuple)):
+        return 'one of {}'.format(', '.join(repr(k) for k in kind))
+    return {'number': 'a number', 'int': 'an integer', 'bool': 'true or false', 'font': 'a font name', 'name': 'a name',
+            'color': 'a matplotlib color', 'linestyle': "a linestyle ('-', '--', '-.', ':' or (offset, dashes))",
+            'marker': 'a matplotlib marker symbol', 'legend_loc': 'a legend location code (0-10) or name',
+            'bbox': 'None or (x0, y0[, width, height])', 'dpi': 'a dpi or a dict of dpi for each format'}[kind]
@@ -0,0 +1,108 @@
+import numbers
+import numpy as np
+import matplotlib
+import matplotlib.colors
+import matplotlib.legend
+from cycler import cycler, Cycler
+from utils.converters import get_iterable, map_list, values_equal
+
+
+# rcParams set by tick properties for each axis ('x', 'y') and tick type ('major', 'minor')
+TICK_RC = {'size': '{axis}tick.{type}.size', 'width': '{axis}tick.{type}.width', 'pad': '{axis}tick.{type}.pad'}
+# rcParams set by tick properties for each axis that are shared by major and minor ticks
+SHARED_TICK_RC = {'color': '{axis}tick.color', 'direction': '{axis}tick.direction',
+                  'labelsize': '{axis}tick.labelsize', 'labelcolor': '{axis}tick.labelcolor'}
+# rcParams set by each property group when the property has a single value
+GROUP_RC = {'spine_props': {'linewidth': 'axes.linewidth', 'edgecolor': 'axes.edgecolor'},
+            'label_props': {'fontsize': 'axes.labelsize', 'color': 'axes.labelcolor'},
+            'legend_props': {'_loc': 'legend.loc', '_drawFrame': 'legend.frameon',
+                             'columnspacing': 'legend.columnspacing', 'labelspacing': 'legend.labelspacing',
+                             'handlelength': 'legend.handlelength', 'handleheight': 'legend.handleheight',
+                             'handletextpad': 'legend.handletextpad', 'numpoints': 'legend.numpoints',
+                             'scatterpoints': 'legend.scatterpoints'},
+            'legend_text_props': {'fontsize': 'legend.fontsize', 'color': 'legend.labelcolor'}}
+# Line properties that are cycled over lines by the axes property cycle
+CYCLE_PROPS = ['color', 'linewidth', 'linestyle']
+
+
+def compile_style_rc(style):
+    """Compile style property groups into the rcParams that express them, so that figures made with the rcParams
+    already have the style. Only properties an rcParam expresses exactly are compiled, e.g. a tick property given as
+    a list is set for the x and y axes in turn, but a label color given as a list is not compiled as both labels share
+    an rcParam. rcParams shared by major and minor ticks take the major tick value.
+    Args:
+        style (dict): Property groups with 'master' values resolved and property names fixed to matplotlib names.
+    Returns:
+        (dict): rcParams.
+    """
+    rc = {}
+    for group, group_rc in GROUP_RC.items():
+        for k, v in style.get(group, {}).items():
+            single, value = _get_single(v)
+            if(k in group_rc and single and value is not None):
+                if(k == '_loc' and isinstance(value, numbers.Integral)):
+                    value = {code: name for name, code in matplotlib.legend.Legend.codes.items()}[value]
+                rc[group_rc[k]] = value
+    for tick_type in ['major', 'minor']:
+        for k, v in style.get(tick_type + '_tick_props', {}).items():
+            for axis, value in zip(['x', 'y'], map_list(list(get_iterable(v)), 2)):
+                if(k in TICK_RC):
+                    rc[TICK_RC[k].format(axis=axis, type=tick_type)] = value
+                elif(k in SHARED_TICK_RC):
+                    rc.setdefault(SHARED_TICK_RC[k].format(axis=axis), value)
+    prop_cycle = get_prop_cycle(style.get('line_props', {}))
+    if(prop_cycle is not None):
+        rc['axes.prop_cycle'] = prop_cycle
+    # Check every value is accepted by its rcParam
+    try:
+        matplotlib.RcParams(rc)
+    except (KeyError, ValueError) as e:
+        raise ValueError("Style can not be compiled into rcParams: {}".format(e))
+    return rc
+
+
+def get_prop_cycle(line_props):
+    """Get the property cycle that styles lines as the line properties would, in the order lines are plotted.
+    Args:
+        line_props (dict): Line properties with property names fixed to matplotlib names.
+    Returns:
+        (cycler.Cycler): Property cycle, or None if a property can not be cycled.
+    """
+    if(not(line_props) or any(k not in CYCLE_PROPS for k in line_props)):
+        return None
+    values = {k: list(get_iterable(v)) for k, v in line_props.items() if v is not None}
+    # Every property is cycled together, so each list is repeated to a common length
+    length = int(np.lcm.reduce([len(v) for v in values.values()]))
+    return cycler(**{k: map_list(v, length) for k, v in values.items()})
+
+
+def write_style_sheet(rc, file_path):
+    """Write rcParams as a matplotlib style sheet (.mplstyle) that can be used with matplotlib.style.use().
+    Args:
+        rc (dict): rcParams.
+        file_path (str): Path of style sheet.
+    Returns:
+        None
+    """
+    with open(file_path, 'w') as fp:
+        for k in sorted(rc):
+            fp.write('{}: {}\n'.format(k, _format_rc_value(rc[k])))
+
+
+def _get_single(value):
+    values = list(get_iterable(value))
+    if(values and all(values_equal(v, values[0]) for v in values)):
+        return True, values[0]
+    return False, None
+
+
+def _format_rc_value(value):
+    if(isinstance(value, Cycler)):
+        # Quoted hex colors are kept whole, as style sheets only strip comments outside quotes
+        return repr(value)
+    if(isinstance(value, str)):
+        # '#' starts a comment in style sheets, and hex colors are read without it
+        return value[1:] if value.startswith('#') and matplotlib.colors.is_color_like(value) else value
+    if(isinstance(value, (list, tuple))):
+        return ', '.join(_format_rc_value(v) for v in value)
+    return str(value)
@@ -0,0 +1,50 @@
+import math
+import numpy as np
+from matplotlib.ticker import LogLocator
+
+
+class BudgetLogLocator(LogLocator):
+    """Log locator that never returns more than a budget of ticks, however many decades are in view. An axis makes a
+    Tick (a set of line and text artists) for every location returned, so without a budget a wide log axis with minor
+    subs [2, ..., 9] makes hundreds of ticks. Over wide ranges subs are thinned first (keeping the first sub), then
+    decades are skipped.
+    Args:
+        base (float): Logarithmic base.
+        subs (list|str): Multiples of integer powers of the base to place ticks at, or 'auto'/'all' as for LogLocator.
+        max_ticks (int): Maximum number of ticks. No budget is applied if None.
+        **kwargs: Any other keyword arguments passed to LogLocator.
+    """
+
+    def __init__(self, base=10.0, subs=(1.0,), max_ticks=None, **kwargs):
+        super(BudgetLogLocator, self).__init__(base, subs, **kwargs)
+        self.max_ticks = max_ticks
+
+    def tick_values(self, vmin, vmax):
+        subs = getattr(self, '_subs', None)
+        if(self.max_ticks is None or subs is None or isinstance(subs, str) or vmin <= 0 or vmax <= 0):
+            return super(BudgetLogLocator, self).tick_values(vmin, vmax)
+        if(vmax < vmin):
+            vmin, vmax = vmax, vmin
+        base = float(self._base)
+        subs = np.asarray(subs, dtype=float)
+        decades = np.arange(math.floor(math.log(vmin, base)), math.ceil(math.log(vmax, base)) + 1)
+        max_ticks = max(int(self.max_ticks), 1)
+
+        # Thin subs to fit the decades in view, spread evenly through the decade
+        per_decade = max(max_ticks // len(decades), 1)
+        if(len(subs) > per_decade):
+            subs = subs[np.unique(np.round(np.linspace(0, len(subs) - 1, per_decade)).astype(int))]
+        # Skip decades if there are still too many ticks, keeping decades that are multiples of the stride so that
+        # ticks do not jump about as the view changes
+        stride = int(math.ceil(len(decades) * len(subs) / float(max_ticks)))
+        if(stride > 1):
+            decades = decades[decades % stride == 0]
+
+        ticks = (base ** decades[:, None].astype(float) * subs[None, :]).ravel()
+        # Only ticks in view are returned as the axis makes a Tick for every location, visible or not
+        tolerance = 1e-10 * (vmax - vmin)
+        ticks = ticks[(ticks >= vmin - tolerance) & (ticks <= vmax + tolerance)]
+        if(len(ticks) < 2):
+            # Less than a decade in view, so the budget can not be exceeded and LogLocator chooses the ticks
+            return super(BudgetLogLocator, self).tick_values(vmin, vmax)
+        return self.raise_if_exceeds(np.sort(ticks)[:max_ticks])
@@ -0,0 +1,453 @@
+import contextlib
+import math
+import struct
+import zlib
+import numpy as np
+import matplotlib
+from matplotlib import cbook
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg
+from matplotlib.path import Path
+from matplotlib.transforms import Affine2D, Bbox, TransformedPath
+
+
+def _is_band_rendering_supported():
+    """Check that the private parts of matplotlib's Agg renderer that _BandRendererAgg relies on are as expected: the
+    extension renderer in _renderer with the draw methods used, and _update_methods binding draw methods to it.
+    Returns:
+        (bool): True if bands can be rendered with this version of matplotlib.
+    """
+    try:
+        renderer = RendererAgg(1, 1, 72)
+        return (callable(getattr(RendererAgg, '_update_methods', None)) and
+                all(callable(getattr(renderer._renderer, name, None))
+                    for name in ['draw_path', 'draw_markers', 'draw_path_collection', 'draw_quad_mesh',
+                                 'draw_gouraud_triangles', 'draw_image']))
+    except Exception:
+        return False
+
+
+# Whether this version of matplotlib supports tiled rendering (see FigureCanvasTiledAgg)
+TILED_RENDERING_AVAILABLE = _is_band_rendering_supported()
+
+
+class FigureCanvasTiledAgg(FigureCanvasAgg):
+    """Agg canvas that renders png and tiff files in bands of pixel rows and streams each band into the encoder, so
+    peak memory is set by the band size rather than the image size. The figure is drawn once per band, as it would be
+    for a single-pass render, onto a renderer that moves the rows of the band onto its canvas (see _BandRendererAgg).
+    Agg clips strokes and clip paths (e.g. of polar axes) to the canvas, which changes the antialiasing of rows next
+    to the canvas edges, so each band is drawn with extra rows above and below it that are cropped, and the pixels
+    are the same as a single-pass Agg render. Used as a savefig backend (see TILED_BACKEND) with the rows per band
+    passed as the tile_height keyword. Requires TILED_RENDERING_AVAILABLE, as the renderer uses private parts of the
+    Agg renderer.
+    """
+
+    def print_png(self, filename_or_obj, *, metadata=None, tile_height=1024, compress_level=6, **kwargs):
+        """Write the figure to a png file in bands of pixel rows.
+        Args:
+            filename_or_obj (str|file-like): Path or writable binary file object.
+            metadata (dict): png text chunks. Entries set to None are removed.
+            tile_height (int): Number of pixel rows rendered at once (see _iter_bands).
+            compress_level (int): zlib compression level from 0 (none) to 9 (smallest).
+            **kwargs: Other keywords print_figure passes to every print method (e.g. dpi, facecolor, orientation),
+                which are already applied to the figure.
+        Returns:
+            None
+        """
+        width, rows = self._get_image_size('png')
+        metadata = {"Software": "Matplotlib version{}, https://matplotlib.org/".format(matplotlib.__version__),
+                    **(metadata or {})}
+        with cbook.open_file_cm(filename_or_obj, "wb") as file:
+            writer = _PNGStreamWriter(file, width, rows, self.figure.dpi, metadata, compress_level)
+            for band in self._iter_bands(tile_height):
+                writer.write_rows(band)
+            writer.close()
+
+    def print_tif(self, filename_or_obj, *, metadata=None, pil_kwargs=None, tile_height=1024, **kwargs):
+        """Write the figure to an uncompressed tiff file in bands of pixel rows, each band a tiff strip. Only the
+        uncompressed RGBA tiff matplotlib saves by default is written, so pil_kwargs (e.g. compression) can not be
+        given, and metadata is not saved.
+        Args:
+            filename_or_obj (str|file-like): Path or writable binary file object.
+            metadata (dict): Not supported for tiff files. Ignored, as by matplotlib.
+            pil_kwargs (dict): Not supported. Must be None.
+            tile_height (int): Number of pixel rows rendered at once (see _iter_bands).
+            **kwargs: Other keywords print_figure passes to every print method (e.g. dpi, facecolor, orientation),
+                which are already applied to the figure.
+        Returns:
+            None
+        """
+        if(pil_kwargs):
+            raise ValueError("pil_kwargs can not be used with tiled tiff output.")
+        width, rows = self._get_image_size('tiff')
+        with cbook.open_file_cm(filename_or_obj, "wb") as file:
+            writer = _TIFFStreamWriter(file, width, rows, self._get_band_step(tile_height), self.figure.dpi)
+            for band in self._iter_bands(tile_height):
+                writer.write_rows(band)
+
+    print_tiff = print_tif
+
+    def _get_image_size(self, format):
+        width, height = self.figure.bbox.size
+        if(int(width) < 1 or int(height) < 1):
+            raise ValueError("Figure of {:g} x {:g} pixels can not be saved as a {}.".format(width, height, format))
+        if not(TILED_RENDERING_AVAILABLE):
+            raise RuntimeError("Tiled rendering is not available with matplotlib {}.".format(matplotlib.__version__))
+        return int(width), int(height)
+
+    def _get_band_step(self, tile_height):
+        # Agg anchors hatch patterns to the top of the canvas, so bands start on a whole number of hatch pattern
+        # repeats (the dpi in pixels)
+        hatch_size = max(int(self.figure.dpi), 1)
+        return hatch_size * int(math.ceil(max(int(tile_height), 1) / float(hatch_size)))
+
+    def _iter_bands(self, tile_height):
+        """Draw the figure in bands of pixel rows.
+        Args:
+            tile_height (int): Number of pixel rows rendered at once, rounded up to a whole number of hatch pattern
+                repeats (the dpi in pixels) as Agg anchors hatch patterns to the top of the canvas.
+        Returns:
+            (generator): RGBA pixels of each band from the top of the image, as uint8 arrays with shape
+                (rows, width, 4) that are only valid until the next band is drawn.
+        """
+        fig = self.figure
+        width, height = fig.bbox.size
+        rows = int(height)
+        hatch_size = max(int(fig.dpi), 1)
+        step = self._get_band_step(tile_height)
+        renderer = None
+        for first in range(0, rows, step):
+            last = min(first + step, rows)
+            # Rows next to the edges of a renderer can differ from a single-pass render, so each band is drawn with a
+            # hatch pattern repeat of rows above and below it (keeping the hatch anchor) that are cropped
+            top, bottom = max(first - hatch_size, 0), min(last + hatch_size, rows)
+            if(renderer is None or bottom - top != renderer.band[1] - renderer.band[0]):
+                renderer = _BandRendererAgg(width, height, top, bottom, fig.dpi)
+            else:
+                renderer.set_band(top, bottom)
+            fig.draw(renderer)
+            yield np.asarray(renderer.buffer_rgba())[first - top:last - top]
+
+
+class _BandRendererAgg(RendererAgg):
+    """Agg renderer for rows [first, last) of a full image. Artists draw in the display coordinates of the full
+    image, and the renderer moves them onto the band as late as possible so that the geometry Agg rasterizes is the
+    same as in a single-pass render:
+        - Paths are clipped, snapped and simplified against the full image (as Agg would) before moving them, and a
+          transparent hatch stops Agg clipping unfilled paths to the band, which would move the ends of segments
+          that cross the band edges.
+        - Marker positions are transformed to full image pixels before moving them.
+        - Collections, meshes, images and clip regions are shifted by whole pixels.
+        - Text is flipped with the height of the full image less the rows above the band.
+    Args:
+        width (float): Full image width in pixels.
+        height (float): Full image height in pixels.
+        first (int): First row of the full image drawn.
+        last (int): Row of the full image after the last row drawn.
+        dpi (float): Renderer dpi.
+    """
+
+    def __init__(self, width, height, first, last, dpi):
+        super(_BandRendererAgg, self).__init__(width, last - first, dpi)
+        self._full_size = (int(width), int(height))
+        self._full_height = height
+        self.set_band(first, last)
+
+    def set_band(self, first, last):
+        """Clear the renderer and move it to another band of the same number of rows.
+        Args:
+            first (int): First row of the full image drawn.
+            last (int): Row of the full image after the last row drawn.
+        Returns:
+            None
+        """
+        self.clear()
+        self.band = (first, last)
+        # Display coordinates are shifted by offset to move them onto the band before Agg flips them with the band
+        # height. Text is flipped by matplotlib with the float canvas height, and its fractional part is kept.
+        self.offset = last - self._full_size[1]
+        self.height = self._full_height - first
+        self._shift = Affine2D().translate(0.0, self.offset)
+        # Flip from display coordinates to full image rows, which is its own inverse for the band rows
+        self._to_full = Affine2D().scale(1.0, -1.0).translate(0.0, self._full_size[1])
+        self._to_band = Affine2D().scale(1.0, -1.0).translate(0.0, last)
+
+    def _update_methods(self):
+        super(_BandRendererAgg, self)._update_methods()
+        # RendererAgg binds these to the Agg renderer per instance, which would hide the methods below
+        for name in ['draw_gouraud_triangles', 'draw_image', 'draw_markers', 'draw_path_collection',
+                     'draw_quad_mesh']:
+            self.__dict__.pop(name, None)
+
+    def draw_path(self, gc, path, transform, rgbFace=None):
+        nmax = matplotlib.rcParams['agg.path.chunksize']
+        unfilled = rgbFace is None and gc.get_hatch() is None
+        if(len(path.vertices) > nmax > 100 and path.should_simplify and unfilled):
+            # Split long paths into the same chunks as RendererAgg
+            num_chunks = np.ceil(len(path.vertices) / nmax)
+            chunk_size = int(np.ceil(len(path.vertices) / num_chunks))
+            starts = np.arange(0, len(path.vertices), chunk_size)
+            ends = np.append(starts[1:] - 1, len(path.vertices))
+            for start, end in zip(starts, ends):
+                codes = None if path.codes is None else path.codes[start:end].copy()
+                if(codes is not None):
+                    codes[0] = Path.MOVETO
+                chunk = Path(path.vertices[start:end], codes)
+                chunk.simplify_threshold = path.simplify_threshold
+                self._draw_band_path(gc, chunk, transform, rgbFace, unfilled)
+        else:
+            self._draw_band_path(gc, path, transform, rgbFace, unfilled)
+
+    def _draw_band_path(self, gc, path, transform, rgbFace, unfilled):
+        width, height = self._full_size
+        has_clip_path = gc.get_clip_path()[0] is not None
+        snapping_linewidth = self.points_to_pixels(gc.get_linewidth()) if gc.get_rgb()[3] != 0 else 0.0
+        # Agg only clips (and so simplifies) paths that are not filled or hatched. Paths are snapped here unless
+        # they have a clip path, which Agg snaps with the same snap setting.
+        cleaned = path.cleaned(transform + self._to_full, remove_nans=True,
+                               clip=(-1.0, -1.0, width + 1.0, height + 1.0) if unfilled else None,
+                               simplify=path.should_simplify and unfilled, curves=False,
+                               stroke_width=snapping_linewidth, snap=False if has_clip_path else gc.get_snap())
+        cleaned.should_simplify = False
+        band_gc = self._get_band_gc(gc, snap=gc.get_snap() if has_clip_path else False)
+        if(unfilled):
+            band_gc.set_hatch('-')
+            band_gc.set_hatch_color((0.0, 0.0, 0.0, 0.0))
+        RendererAgg.draw_path(self, band_gc, cleaned, self._to_band, rgbFace)
+        band_gc.restore()
+
+    def draw_markers(self, gc, marker_path, marker_trans, path, trans, rgbFace=None):
+        # Agg flips positions with (x + 0.5, height + 0.5 - y) and rounds them to pixels, so positions are
+        # transformed to full image pixels first and then only moved by whole pixels
+        first, last = self.band
+        positions = path.cleaned(trans + Affine2D().scale(1.0, -1.0).translate(0.5, self._full_size[1] + 0.5),
+                                 curves=True)
+        to_band = Affine2D().scale(1.0, -1.0).translate(-0.5, last + 0.5)
+        band_gc = self._get_band_gc(gc)
+        self._renderer.draw_markers(band_gc, marker_path, marker_trans, positions, to_band, rgbFace)
+        band_gc.restore()
+
+    def draw_path_collection(self, gc, master_transform, paths, all_transforms, offsets, offset_trans, facecolors,
+                             edgecolors, linewidths, linestyles, antialiaseds, urls, offset_position, **kwargs):
+        band_gc = self._get_band_gc(gc)
+        if(len(facecolors) == 0 and gc.get_hatch() is None):
+            # Agg clips unfilled paths to the canvas unless they are hatched
+            band_gc.set_hatch('-')
+            band_gc.set_hatch_color((0.0, 0.0, 0.0, 0.0))
+            if('hatchcolors' in kwargs):
+                kwargs['hatchcolors'] = [(0.0, 0.0, 0.0, 0.0)]
+        master_transform, offset_trans = self._shift_collection(master_transform, offsets, offset_trans)
+        self._renderer.draw_path_collection(band_gc, master_transform, paths, all_transforms, offsets, offset_trans,
+                                            facecolors, edgecolors, linewidths, linestyles, antialiaseds, urls,
+                                            offset_position, **kwargs)
+        band_gc.restore()
+
+    def draw_quad_mesh(self, gc, master_transform, mesh_width, mesh_height, coordinates, offsets, offset_trans,
+                       facecolors, antialiased, edgecolors):
+        band_gc = self._get_band_gc(gc)
+        master_transform, offset_trans = self._shift_collection(master_transform, offsets, offset_trans)
+        self._renderer.draw_quad_mesh(band_gc, master_transform, mesh_width, mesh_height, coordinates, offsets,
+                                      offset_trans, facecolors, antialiased, edgecolors)
+        band_gc.restore()
+
+    def draw_gouraud_triangles(self, gc, triangles_array, colors_array, transform):
+        band_gc = self._get_band_gc(gc)
+        self._renderer.draw_gouraud_triangles(band_gc, triangles_array, colors_array, transform + self._shift)
+        band_gc.restore()
+
+    def draw_image(self, gc, x, y, im, *args):
+        band_gc = self._get_band_gc(gc)
+        self._renderer.draw_image(band_gc, x, y + self.offset, im, *args)
+        band_gc.restore()
+
+    def draw_text(self, gc, x, y, s, prop, angle, ismath=False, mtext=None):
+        band_gc = self._get_band_gc(gc)
+        with self._shifted_renderer():
+            super(_BandRendererAgg, self).draw_text(band_gc, x, y, s, prop, angle, ismath, mtext)
+        band_gc.restore()
+
+    def draw_tex(self, gc, x, y, s, prop, angle, **kwargs):
+        band_gc = self._get_band_gc(gc)
+        with self._shifted_renderer():
+            super(_BandRendererAgg, self).draw_tex(band_gc, x, y, s, prop, angle, **kwargs)
+        band_gc.restore()
+
+    def _shift_collection(self, master_transform, offsets, offset_trans):
+        # Paths of a collection are drawn at their transformed offsets, so the shift is added to the offsets unless
+        # there are none
+        if(len(offsets)):
+            return master_transform, offset_trans + self._shift
+        return master_transform + self._shift, offset_trans
+
+    def _get_band_gc(self, gc, snap=None):
+        """Copy a graphics context with its clip rectangle and clip path moved onto the band.
+        Args:
+            gc (matplotlib.backend_bases.GraphicsContextBase): Graphics context.
+            snap (bool): Snap setting of the copy. The setting of gc is kept if None.
+        Returns:
+            (matplotlib.backend_bases.GraphicsContextBase): Graphics context to restore once drawn.
+        """
+        band_gc = self.new_gc()
+        band_gc.copy_properties(gc)
+        if(snap is not None):
+            band_gc.set_snap(snap)
+        clip_rectangle = gc.get_clip_rectangle()
+        if(clip_rectangle is not None):
+            # Bbox.translated reuses the points of a TransformedBbox without updating them, which are stale after
+            # the figure is resized for a tight bbox
+            band_gc.set_clip_rectangle(Bbox(clip_rectangle.get_points() + (0.0, self.offset)))
+        clip_path, clip_transform = gc.get_clip_path()
+        if(clip_path is not None):
+            band_gc.set_clip_path(TransformedPath(clip_path, clip_transform + self._shift))
+        return band_gc
+
+    @contextlib.contextmanager
+    def _shifted_renderer(self):
+        # Text boxes (e.g. mathtext fraction bars) are drawn with the Agg renderer directly in display coordinates
+        renderer = self._renderer
+        self._renderer = _ShiftedAggRenderer(renderer, self._shift)
+        try:
+            yield
+        finally:
+            self._renderer = renderer
+
+
+class _ShiftedAggRenderer(object):
+    """Agg renderer proxy that shifts the display coordinates of paths it draws.
+    Args:
+        renderer (matplotlib.backends._backend_agg.RendererAgg): Agg renderer.
+        shift (matplotlib.transforms.Affine2D): Shift added to path transforms.
+    """
+
+    def __init__(self, renderer, shift):
+        self._renderer = renderer
+        self._shift = shift
+
+    def draw_path(self, gc, path, transform, rgbFace=None):
+        return self._renderer.draw_path(gc, path, transform + self._shift, rgbFace)
+
+    def __getattr__(self, name):
+        return getattr(self._renderer, name)
+
+
+class _PNGStreamWriter(object):
+    """Minimal png encoder for 8-bit RGBA pixels written in row bands.
+    Args:
+        file (file-like): Writable binary file object.
+        width (int): Image width in pixels.
+        height (int): Image height in pixels.
+        dpi (float): Image resolution, saved in the pHYs chunk.
+        metadata (dict): Text chunks. Entries set to None are skipped.
+        compress_level (int): zlib compression level.
+    """
+
+    ROWS_PER_WRITE = 64
+
+    def __init__(self, file, width, height, dpi, metadata, compress_level=6):
+        self._file = file
+        self._compressor = zlib.compressobj(compress_level)
+        file.write(b'\x89PNG\r\n\x1a\n')
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+        pixels_per_metre = int(round(dpi / 0.0254))
+        self._write_chunk(b'pHYs', struct.pack('>IIB', pixels_per_metre, pixels_per_metre, 1))
+        for k, v in metadata.items():
+            if(v is not None):
+                self._write_chunk(b'tEXt', k.encode('latin-1') + b'\x00' + str(v).encode('latin-1', 'replace'))
+
+    def write_rows(self, rgba):
+        """Compress rows of pixels into IDAT chunks.
+        Args:
+            rgba (numpy.ndarray): Pixels with shape (rows, width, 4) and dtype uint8.
+        Returns:
+            None
+        """
+        # Each row starts with its filter type (0, no filter). Rows are filtered a few at a time so that the band is
+        # not copied whole.
+        rows = np.zeros((min(self.ROWS_PER_WRITE, rgba.shape[0]), 1 + rgba.shape[1] * 4), dtype=np.uint8)
+        for start in range(0, rgba.shape[0], len(rows)):
+            band = rgba[start:start + len(rows)]
+            rows[:len(band), 1:] = band.reshape(len(band), -1)
+            data = self._compressor.compress(memoryview(rows[:len(band)]).cast('B'))
+            if(data):
+                self._write_chunk(b'IDAT', data)
+
+    def close(self):
+        """Flush the compressor and end the png.
+        Returns:
+            None
+        """
+        self._write_chunk(b'IDAT', self._compressor.flush())
+        self._write_chunk(b'IEND', b'')
+
+    def _write_chunk(self, chunk_type, data):
+        self._file.write(struct.pack('>I', len(data)) + chunk_type + data +
+                         struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff))
+
+
+class _TIFFStreamWriter(object):
+    """Minimal baseline tiff encoder for uncompressed 8-bit RGBA pixels written in strips of rows. The size of every
+    strip is known up front, so the image file directory is written first and the file does not need to be seekable.
+    Args:
+        file (file-like): Writable binary file object.
+        width (int): Image width in pixels.
+        height (int): Image height in pixels.
+        rows_per_strip (int): Number of rows in every strip but the last.
+        dpi (float): Image resolution.
+    """
+
+    # tiff field types
+    _SHORT, _LONG, _RATIONAL = 3, 4, 5
+
+    def __init__(self, file, width, height, rows_per_strip, dpi):
+        self._file = file
+        strip_sizes = [min(rows_per_strip, height - first) * width * 4 for first in range(0, height, rows_per_strip)]
+        resolution = (int(round(dpi * 10000)), 10000)
+        entries = [(256, self._LONG, [width]), (257, self._LONG, [height]), (258, self._SHORT, [8, 8, 8, 8]),
+                   (259, self._SHORT, [1]), (262, self._SHORT, [2]), (273, self._LONG, [0] * len(strip_sizes)),
+                   (277, self._SHORT, [4]), (278, self._LONG, [rows_per_strip]),
+                   (279, self._LONG, strip_sizes), (282, self._RATIONAL, [resolution]),
+                   (283, self._RATIONAL, [resolution]), (284, self._SHORT, [1]), (296, self._SHORT, [2]),
+                   (338, self._SHORT, [2])]
+        # Values that do not fit in 4 bytes follow the directory, then the strips
+        ifd_size = 2 + 12 * len(entries) + 4
+        values_offset = 8 + ifd_size
+        values = [self._pack_values(t, v) for _, t, v in entries]
+        data_offset = values_offset + sum(len(v) for v in values if len(v) > 4)
+        if(data_offset + sum(strip_sizes) > 0xffffffff):
+            raise ValueError("Image of {} x {} pixels is too large for a tiff file. Save it as a png."
+                             .format(width, height))
+        strip_offsets = list(data_offset + np.concatenate([[0], np.cumsum(strip_sizes)[:-1]]).astype(int))
+        entries[5] = (273, self._LONG, strip_offsets)
+        values[5] = self._pack_values(self._LONG, strip_offsets)
+
+        ifd = [struct.pack('<H', len(entries))]
+        extra = []
+        for (tag, value_type, value), packed in zip(entries, values):
+            count = len(value)
+            if(len(packed) > 4):
+                ifd.append(struct.pack('<HHII', tag, value_type, count, values_offset + len(b''.join(extra))))
+                extra.append(packed)
+            else:
+                ifd.append(struct.pack('<HHI', tag, value_type, count) + packed.ljust(4, b'\x00'))
+        ifd.append(struct.pack('<I', 0))
+        file.write(b'II*\x00' + struct.pack('<I', 8) + b''.join(ifd) + b''.join(extra))
+
+    def write_rows(self, rgba):
+        """Write rows of pixels.
+        Args:
+            rgba (numpy.ndarray): Pixels with shape (rows, width, 4) and dtype uint8.
+        Returns:
+            None
+        """
+        self._file.write(memoryview(np.ascontiguousarray(rgba)).cast('B'))
+
+    def _pack_values(self, value_type, values):
+        if(value_type == self._SHORT):
+            return struct.pack('<{}H'.format(len(values)), *values)
+        if(value_type == self._LONG):
+            return struct.pack('<{}I'.format(len(values)), *values)
+        return b''.join(struct.pack('<II', *v) for v in values)
+
+
+FigureCanvas = FigureCanvasTiledAgg
+# savefig backend name that renders with FigureCanvasTiledAgg
+TILED_BACKEND = 'module://' + __name__